@@ -0,0 +1,109 @@
+import numpy as np
+from typing import List, Sequence, Tuple
+
+
+def pearson_pvalues(correlation: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Two-sided p-values for Pearson correlations.
+
+    Matches ``scipy.stats.pearsonr``: the null distribution of r is a
+    symmetric beta distribution, whose tail reduces to a regularised
+    incomplete beta function of 1 - r^2.
+    """
+    from scipy.special import betainc
+
+    correlation = np.asarray(correlation, dtype=np.float64)
+    counts = np.asarray(counts, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        df = counts - 2
+        p_values = betainc(0.5 * df, 0.5, np.clip(1.0 - correlation ** 2, 0.0, 1.0))
+    # Two points always lie on a line; scipy reports p = 1 for them
+    p_values = np.where(counts == 2, 1.0, p_values)
+    return np.where(np.isnan(correlation), np.nan, p_values)
+
+
+def nan_pearson(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of every column of ``x`` with every column of ``y``.
+
+    Each (i, j) pair uses only the rows where both ``x[:, i]`` and
+    ``y[:, j]`` are not NaN, exactly as if the pair had been masked and
+    passed to ``scipy.stats.pearsonr``, but all pairs are computed at once
+    from masked sums via a handful of matrix products.
+
+    Args:
+        x: Array of shape (n_samples, n_features)
+        y: Array of shape (n_samples, n_targets)
+
+    Returns:
+        Tuple of (correlation, p_values, counts), each of shape
+        (n_features, n_targets). Pairs with fewer than two observations or
+        zero variance are NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    if y.ndim == 1:
+        y = y[:, None]
+
+    mask_x = ~np.isnan(x)
+    mask_y = ~np.isnan(y)
+    weight_x = mask_x.astype(np.float64)
+    weight_y = mask_y.astype(np.float64)
+
+    # Centre on the column means first; the pairwise formula is shift
+    # invariant and this keeps the sums of squares well conditioned
+    with np.errstate(invalid='ignore'):
+        x = np.where(mask_x, x - _nanmean(x, weight_x), 0.0)
+        y = np.where(mask_y, y - _nanmean(y, weight_y), 0.0)
+
+    counts = weight_x.T @ weight_y
+    sum_x = x.T @ weight_y
+    sum_y = weight_x.T @ y
+    sum_xx = (x * x).T @ weight_y
+    sum_yy = weight_x.T @ (y * y)
+    sum_xy = x.T @ y
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sum_xy - sum_x * sum_y / counts
+        var_x = sum_xx - sum_x ** 2 / counts
+        var_y = sum_yy - sum_y ** 2 / counts
+        correlation = cov / np.sqrt(var_x * var_y)
+
+    invalid = (counts < 2) | ~(var_x > 0) | ~(var_y > 0)
+    correlation = np.where(invalid, np.nan, np.clip(correlation, -1.0, 1.0))
+
+    return correlation, pearson_pvalues(correlation, counts), counts.astype(np.int64)
+
+
+def correlated_pairs(correlation: np.ndarray, names: Sequence[str], threshold: float,
+                     absolute: bool = True) -> List[Tuple[str, str, float]]:
+    """
+    Pairs of a square correlation matrix above ``threshold``, strongest first.
+
+    Only the upper triangle is examined, so each pair is reported once and
+    the diagonal never is. NaN correlations never qualify.
+
+    Args:
+        correlation: Symmetric (n x n) correlation matrix
+        names: Labels of the rows and columns
+        threshold: Pairs with correlation (or its absolute value) above this qualify
+        absolute: Compare ``|correlation|`` instead of the signed value
+
+    Returns:
+        List of (name_i, name_j, correlation) tuples
+    """
+    correlation = np.asarray(correlation, dtype=np.float64)
+    rows, columns = np.triu_indices(len(names), k=1)
+    values = correlation[rows, columns]
+    strength = np.abs(values) if absolute else values
+    with np.errstate(invalid='ignore'):
+        selected = np.flatnonzero(strength > threshold)
+    selected = selected[np.argsort(-strength[selected], kind='stable')]
+    return [(names[rows[k]], names[columns[k]], float(values[k])) for k in selected]
+
+
+def _nanmean(values: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    totals = np.where(weights > 0, values, 0.0).sum(axis=0)
+    return totals / np.maximum(weights.sum(axis=0), 1.0)
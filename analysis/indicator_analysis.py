@@ -1,8 +1,7 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
-from sklearn.feature_selection import mutual_info_regression
-from scipy.stats import spearmanr
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple
 import sys
 from pathlib import Path
 
@@ -19,35 +18,146 @@ from config.analysis_config import (
     SIGNAL_PARAMS,
     PERFORMANCE_METRICS
 )
+from analysis.correlation import nan_pearson
+from analysis.mutual_info import binned_mutual_info
+from data.feature_store import forward_return
+
+# Feature importance estimators: sklearn's k-NN mutual information, or the
+# histogram estimate of analysis.mutual_info
+IMPORTANCE_METHODS = ('exact', 'fast')
 
 class IndicatorAnalyzer:
-    """Analyze and evaluate technical indicators for predictive power."""
+    """
+    Analyze and evaluate technical indicators for predictive power.
+
+    Results are cached per method and parameters, so building a report runs
+    each analysis once. The cache is cleared when ``df`` is reassigned and
+    keyed on the target column, feature groups and frame shape/columns;
+    call ``clear_cache`` after modifying the DataFrame values in place.
+    The caller's DataFrame is never modified.
+
+    Columns named ``forward_return_<n>``, as ``FeatureTensor.symbol_frame``
+    produces, are used as the n-bar forward returns instead of recomputing
+    them from ``target_col``.
+
+    Feature importance uses sklearn's k-NN mutual information by default
+    (``importance_method='exact'``). ``'fast'`` switches to the histogram
+    estimator of ``analysis.mutual_info``, optionally on a row sample of
+    ``mi_sample_size`` and with feature groups estimated on ``n_jobs``
+    threads; it is much faster on long histories and ranks features
+    nearly the same (see ``benchmarks/bench_feature_importance.py``).
+    """
     
     def __init__(self, df: pd.DataFrame, target_col: str = 'close',
-                 feature_groups: Dict[str, List[str]] = None):
+                 feature_groups: Dict[str, List[str]] = None,
+                 importance_method: str = 'exact',
+                 mi_sample_size: Optional[int] = None,
+                 n_jobs: int = 1):
+        if importance_method not in IMPORTANCE_METHODS:
+            raise ValueError(f"importance_method must be one of {IMPORTANCE_METHODS}")
         self.df = df
         self.target_col = target_col
         self.feature_groups = feature_groups or FEATURE_GROUPS
+        self.importance_method = importance_method
+        self.mi_sample_size = mi_sample_size
+        self.n_jobs = n_jobs
         self.results = {}
 
-    def calculate_feature_importance(self) -> Dict[str, float]:
-        """Calculate feature importance using mutual information."""
-        feature_importance = {}
-        
+    @property
+    def df(self) -> pd.DataFrame:
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame):
+        self._df = df
+        self.clear_cache()
+
+    @classmethod
+    def from_feature_tensor(cls, tensor, symbol: str, **kwargs) -> 'IndicatorAnalyzer':
+        """
+        Analyzer over one symbol of a ``data.feature_store.FeatureTensor``.
+
+        The symbol's bars are copied out of the tensor by ``symbol_frame``;
+        its stored ``forward_return_<h>`` targets are used by
+        ``analyze_predictive_power``.
+        """
+        return cls(tensor.symbol_frame(symbol), **kwargs)
+
+    def clear_cache(self):
+        """Drop all cached analysis results."""
+        self._cache = {}
+
+    def _cache_key(self, name: str, **params) -> Tuple:
+        return (
+            name,
+            self.target_col,
+            tuple((group, tuple(features)) for group, features in self.feature_groups.items()),
+            self._df.shape,
+            tuple(self._df.columns),
+            tuple(sorted(params.items()))
+        )
+
+    def _cached(self, name: str, compute, **params):
+        """Return a copy of the cached result of ``compute(**params)``."""
+        key = self._cache_key(name, **params)
+        if key not in self._cache:
+            self._cache[key] = compute(**params)
+        return deepcopy(self._cache[key])
+
+    def _valid_features(self) -> Dict[str, List[str]]:
+        """Feature groups restricted to columns present in the DataFrame."""
+        valid = {}
         for group, features in self.feature_groups.items():
-            valid_features = [f for f in features if f in self.df.columns]
-            if not valid_features:
-                continue
-                
-            X = self.df[valid_features].fillna(0)
-            y = self.df[self.target_col]
-            
-            # Calculate mutual information
+            features = [f for f in features if f in self.df.columns]
+            if features:
+                valid[group] = features
+        return valid
+
+    def _feature_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """Unique valid features and their zero-filled values, built once."""
+        key = self._cache_key('feature_matrix')
+        if key not in self._cache:
+            features = list(dict.fromkeys(
+                f for group in self._valid_features().values() for f in group
+            ))
+            self._cache[key] = (features, self.df[features].fillna(0).to_numpy(dtype=float))
+        return self._cache[key]
+
+    def calculate_feature_importance(self, method: Optional[str] = None) -> Dict[str, float]:
+        """
+        Calculate feature importance using mutual information.
+
+        Args:
+            method: ``'exact'`` or ``'fast'``; defaults to ``importance_method``
+        """
+        method = method or self.importance_method
+        if method not in IMPORTANCE_METHODS:
+            raise ValueError(f"method must be one of {IMPORTANCE_METHODS}")
+        return self._cached('feature_importance', self._compute_feature_importance, method=method,
+                            sample_size=self.mi_sample_size if method == 'fast' else None)
+
+    def _compute_feature_importance(self, method: str, sample_size: Optional[int]) -> Dict[str, float]:
+        features, X = self._feature_matrix()
+        if not features:
+            return {}
+        y = self.df[self.target_col]
+        
+        if method == 'fast':
+            # One task per feature group; features shared by groups are estimated once
+            position = {feature: i for i, feature in enumerate(features)}
+            groups, assigned = [], set()
+            for group in self._valid_features().values():
+                columns = [position[f] for f in group if position[f] not in assigned]
+                assigned.update(columns)
+                groups.append(columns)
+            mi_scores = binned_mutual_info(X, y.to_numpy(dtype=float), sample_size=sample_size,
+                                           groups=groups, n_jobs=self.n_jobs)
+        else:
+            from sklearn.feature_selection import mutual_info_regression
+
+            # Mutual information is estimated per feature, so all groups share one call
             mi_scores = mutual_info_regression(X, y)
-            
-            # Store results
-            for feature, score in zip(valid_features, mi_scores):
-                feature_importance[feature] = score
+        feature_importance = dict(zip(features, mi_scores))
                 
         return dict(sorted(feature_importance.items(), 
                          key=lambda x: x[1], reverse=True))
@@ -55,32 +165,39 @@ class IndicatorAnalyzer:
     def analyze_predictive_power(self, 
                                forward_returns: int = 1) -> Dict[str, Dict[str, float]]:
         """Analyze predictive power of indicators for future returns."""
+        return self._cached('predictive_power', self._compute_predictive_power,
+                            forward_returns=forward_returns)
+
+    def _compute_predictive_power(self, forward_returns: int) -> Dict[str, Dict[str, float]]:
+        from scipy.stats import rankdata
+
         results = {}
+        features, X = self._feature_matrix()
+        if not features:
+            return results
         
-        # Calculate forward returns
-        self.df['forward_returns'] = self.df[self.target_col].pct_change(
-            forward_returns).shift(-forward_returns)
+        # Calculate forward returns, unless the feature store already did
+        stored = f'forward_return_{forward_returns}'
+        if stored in self.df.columns:
+            future = self.df[stored].astype(float).fillna(0)
+        else:
+            future = pd.Series(forward_return(self.df[self.target_col].to_numpy(), forward_returns)).fillna(0)
         
-        for group, features in self.feature_groups.items():
-            valid_features = [f for f in features if f in self.df.columns]
-            if not valid_features:
-                continue
-                
-            group_results = {}
-            for feature in valid_features:
-                # Calculate Spearman correlation
-                correlation, p_value = spearmanr(
-                    self.df[feature].fillna(0),
-                    self.df['forward_returns'].fillna(0),
-                    nan_policy='omit'
-                )
-                
-                group_results[feature] = {
-                    'correlation': correlation,
-                    'p_value': p_value
-                }
-                
-            results[group] = group_results
+        # Spearman correlation is the Pearson correlation of ranks: rank
+        # every feature once and correlate them all in a single pass
+        feature_ranks = rankdata(X, axis=0)
+        target_ranks = rankdata(future.to_numpy(dtype=float))
+        correlations, p_values, _ = nan_pearson(feature_ranks, target_ranks)
+        spearman = {
+            feature: {
+                'correlation': correlations[i, 0],
+                'p_value': p_values[i, 0]
+            }
+            for i, feature in enumerate(features)
+        }
+        
+        for group, group_features in self._valid_features().items():
+            results[group] = {feature: dict(spearman[feature]) for feature in group_features}
             
         return results
 
@@ -109,11 +226,12 @@ class IndicatorAnalyzer:
 
     def generate_analysis_report(self) -> Dict:
         """Generate comprehensive analysis report."""
+        feature_importance = self.calculate_feature_importance()
         report = {
-            'feature_importance': self.calculate_feature_importance(),
+            'feature_importance': feature_importance,
             'predictive_power': self.analyze_predictive_power(),
             'top_indicators': self.get_top_indicators(),
-            'correlation_matrix': self.df[list(self.calculate_feature_importance().keys())]
+            'correlation_matrix': self.df[list(feature_importance.keys())]
                                 .corr().to_dict()
         }
         
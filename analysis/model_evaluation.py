@@ -1,7 +1,15 @@
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 from typing import Dict, List, Tuple
 import numpy as np
 import pandas as pd
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from strategy.signals.generator import threshold_signals
 
 def evaluate_predictions(y_true: np.ndarray, 
                        y_pred: np.ndarray, 
@@ -9,6 +17,8 @@ def evaluate_predictions(y_true: np.ndarray,
     """
     Evaluate predictions using multiple metrics.
     """
+    from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
+
     results = {}
     
     # Basic metrics
@@ -36,8 +46,7 @@ def calculate_trading_metrics(predictions: np.ndarray,
     Calculate trading-specific metrics based on predictions.
     """
     # Generate trading signals based on predictions and threshold
-    signals = np.where(predictions > threshold, 1, 
-                      np.where(predictions < -threshold, -1, 0))
+    signals = threshold_signals(predictions, threshold)
     
     # Calculate strategy returns
     strategy_returns = signals[:-1] * actual_returns[1:]
@@ -0,0 +1,114 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+# Upper bound on the automatic bin count
+MAX_BINS = 64
+
+
+def default_bins(n_samples: int) -> int:
+    """Bins per axis: the cube root of the sample count, between 2 and ``MAX_BINS``."""
+    return int(np.clip(np.cbrt(n_samples), 2, MAX_BINS))
+
+
+def quantile_bins(values: np.ndarray, n_bins: int) -> np.ndarray:
+    """
+    Equal-frequency bin codes for every column of ``values``.
+
+    Bin edges are the column quantiles, so tied values (e.g. zero-filled
+    gaps) always share a bin; duplicate edges merge bins.
+
+    Args:
+        values: Array of shape (n_samples,) or (n_samples, n_features)
+
+    Returns:
+        int64 codes in [0, n_bins) with the shape of ``values``
+    """
+    values = np.asarray(values, dtype=np.float64)
+    flat = values.ndim == 1
+    values = values[:, None] if flat else values
+
+    edges = np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1], axis=0)
+    codes = np.empty(values.shape, dtype=np.int64)
+    for j in range(values.shape[1]):
+        codes[:, j] = np.searchsorted(np.unique(edges[:, j]), values[:, j], side='right')
+    return codes[:, 0] if flat else codes
+
+
+def binned_mutual_info(X: np.ndarray, y: np.ndarray,
+                       n_bins: Optional[int] = None,
+                       sample_size: Optional[int] = None,
+                       random_state: int = 0,
+                       groups: Optional[Sequence[Sequence[int]]] = None,
+                       n_jobs: int = 1) -> np.ndarray:
+    """
+    Histogram estimate of the mutual information of each feature with ``y``.
+
+    A fast alternative to ``sklearn.feature_selection.mutual_info_regression``.
+    Features and target are cut into equal-frequency bins and the joint
+    histograms of all features are counted in one ``bincount``, so the cost
+    is O(n log n) per feature instead of k-nearest-neighbour searches. The
+    Miller-Madow correction removes most of the upward bias of the plug-in
+    estimate; results are in nats and clipped at zero, like sklearn's.
+
+    Args:
+        X: Feature matrix of shape (n_samples, n_features), without NaN
+        y: Target of shape (n_samples,)
+        n_bins: Bins per axis; defaults to ``default_bins`` of the rows used
+        sample_size: Estimate from this many randomly chosen rows
+        random_state: Seed of the row sample
+        groups: Column index lists estimated as separate tasks, e.g. one per
+            feature group; defaults to ``n_jobs`` equal chunks
+        n_jobs: Threads used to estimate the groups concurrently
+
+    Returns:
+        Array of shape (n_features,) with the estimated mutual information
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if sample_size is not None and sample_size < len(y):
+        rows = np.sort(np.random.default_rng(random_state).choice(len(y), sample_size, replace=False))
+        X, y = X[rows], y[rows]
+
+    n_samples, n_features = X.shape
+    n_bins = n_bins or default_bins(n_samples)
+    y_codes = quantile_bins(y, n_bins)
+
+    if groups is None:
+        groups = [chunk for chunk in np.array_split(np.arange(n_features), max(n_jobs, 1)) if len(chunk)]
+    groups = [list(group) for group in groups if len(group)]
+
+    def estimate(columns: List[int]) -> np.ndarray:
+        return _histogram_mutual_info(quantile_bins(X[:, columns], n_bins), y_codes, n_bins)
+
+    mutual_info = np.zeros(n_features)
+    if n_jobs > 1 and len(groups) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            estimates = list(executor.map(estimate, groups))
+    else:
+        estimates = [estimate(group) for group in groups]
+    for columns, values in zip(groups, estimates):
+        mutual_info[columns] = values
+    return mutual_info
+
+
+def _histogram_mutual_info(x_codes: np.ndarray, y_codes: np.ndarray, n_bins: int) -> np.ndarray:
+    """Miller-Madow corrected plug-in MI of each column of ``x_codes`` with ``y_codes``."""
+    n_samples, n_features = x_codes.shape
+    cells = n_bins * n_bins
+    # Offset every feature into its own block of cells and count all at once
+    flat = (np.arange(n_features) * cells)[None, :] + x_codes * n_bins + y_codes[:, None]
+    joint = np.bincount(flat.ravel(), minlength=n_features * cells).reshape(n_features, n_bins, n_bins)
+
+    p_xy = joint / n_samples
+    p_x = p_xy.sum(axis=2, keepdims=True)
+    p_y = p_xy.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(joint > 0, p_xy * np.log(p_xy / (p_x * p_y)), 0.0)
+    plug_in = terms.sum(axis=(1, 2))
+
+    occupied_x = np.count_nonzero(p_x[:, :, 0], axis=1)
+    occupied_y = np.count_nonzero(p_y[:, 0, :], axis=1)
+    occupied_xy = np.count_nonzero(joint, axis=(1, 2))
+    bias = (occupied_x + occupied_y - occupied_xy - 1) / (2 * n_samples)
+    return np.maximum(plug_in + bias, 0.0)
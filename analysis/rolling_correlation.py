@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import RISK_PARAMS, TIME_WINDOWS
+from analysis.correlation import correlated_pairs
+
+
+class RollingCorrelationEngine:
+    """
+    Rolling cross-asset return correlations, updated one bar at a time.
+
+    Keeps the last ``window`` return vectors in a ring buffer together with
+    pairwise sums (counts, sums, sums of squares and cross products over
+    the rows where both assets have a return), so a new bar costs a few
+    (symbols x symbols) outer products instead of a full recomputation.
+    Correlations are pairwise-complete, like ``pandas.DataFrame.corr`` on
+    the window. The sums are rebuilt from the buffer once per window to
+    stop floating point drift.
+
+    The correlation matrix is computed lazily and cached until the next
+    update, so risk checks can query it on every rebalance.
+    """
+
+    def __init__(self, symbols: Sequence[str], window: int = TIME_WINDOWS['validation'],
+                 min_periods: Optional[int] = None):
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = min_periods or window
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        n = len(self.symbols)
+        self._buffer = np.full((window, n), np.nan)
+        self._position = 0
+        self._filled = 0
+        self._since_rebuild = 0
+        self._last_prices = None
+        self._reset_sums()
+        self._correlation = None
+
+    def _reset_sums(self):
+        n = len(self.symbols)
+        self._count = np.zeros((n, n))
+        self._sum = np.zeros((n, n))
+        self._sum_sq = np.zeros((n, n))
+        self._sum_cross = np.zeros((n, n))
+
+    def _accumulate(self, returns: np.ndarray, sign: float):
+        present = ~np.isnan(returns)
+        mask = present.astype(np.float64)
+        values = np.where(present, returns, 0.0)
+        # Row i, column j: sums of asset i over the bars where j is also present
+        self._count += sign * np.outer(mask, mask)
+        self._sum += sign * np.outer(values, mask)
+        self._sum_sq += sign * np.outer(values * values, mask)
+        self._sum_cross += sign * np.outer(values, values)
+
+    def update(self, returns) -> 'RollingCorrelationEngine':
+        """
+        Add one bar of returns.
+
+        Args:
+            returns: Array in ``symbols`` order, or mapping of symbol to
+                return; NaN or missing symbols mean no return this bar
+        """
+        returns = self._as_vector(returns)
+        evicted = self._buffer[self._position].copy() if self._filled == self.window else None
+
+        self._buffer[self._position] = returns
+        self._position = (self._position + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+        self._since_rebuild += 1
+        self._correlation = None
+
+        if self._since_rebuild >= self.window:
+            self._rebuild()
+        else:
+            if evicted is not None:
+                self._accumulate(evicted, -1.0)
+            self._accumulate(returns, 1.0)
+        return self
+
+    def update_prices(self, prices) -> 'RollingCorrelationEngine':
+        """Add one bar of prices; returns are taken against the previous bar."""
+        prices = self._as_vector(prices)
+        if self._last_prices is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.update(prices / self._last_prices - 1)
+        # Carry a symbol's last price over bars where it has none
+        self._last_prices = prices if self._last_prices is None else np.where(
+            np.isnan(prices), self._last_prices, prices)
+        return self
+
+    def _rebuild(self):
+        self._reset_sums()
+        for row in self._buffer[:self._filled]:
+            self._accumulate(row, 1.0)
+        self._since_rebuild = 0
+
+    def _as_vector(self, values) -> np.ndarray:
+        if isinstance(values, (dict, pd.Series)):
+            vector = np.full(len(self.symbols), np.nan)
+            for symbol, value in values.items():
+                if symbol in self._index:
+                    vector[self._index[symbol]] = value
+            return vector
+        vector = np.asarray(values, dtype=np.float64)
+        if vector.shape != (len(self.symbols),):
+            raise ValueError(f"Expected {len(self.symbols)} values, got shape {vector.shape}")
+        return vector
+
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, window: int = TIME_WINDOWS['validation'],
+                     min_periods: Optional[int] = None) -> 'RollingCorrelationEngine':
+        """Engine warmed up on the last ``window`` rows of a (time x symbol) returns frame."""
+        engine = cls(list(returns.columns), window, min_periods)
+        for row in returns.to_numpy(dtype=np.float64)[-window:]:
+            engine.update(row)
+        return engine
+
+    def correlation(self) -> np.ndarray:
+        """
+        Current (symbols x symbols) correlation matrix.
+
+        Pairs with fewer than ``min_periods`` common returns or without
+        variance are NaN. The array is shared until the next update; do
+        not modify it.
+        """
+        if self._correlation is None:
+            counts = self._count
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean_i = self._sum / counts
+                mean_j = mean_i.T
+                cov = self._sum_cross - counts * mean_i * mean_j
+                var_i = self._sum_sq - counts * mean_i ** 2
+                var_j = var_i.T
+                correlation = cov / np.sqrt(var_i * var_j)
+            invalid = (counts < max(self.min_periods, 2)) | ~(var_i > 0) | ~(var_j > 0)
+            correlation = np.where(invalid, np.nan, np.clip(correlation, -1.0, 1.0))
+            self._correlation = correlation
+        return self._correlation
+
+    def correlation_frame(self) -> pd.DataFrame:
+        """Current correlation matrix labelled with the symbols."""
+        return pd.DataFrame(self.correlation(), index=self.symbols, columns=self.symbols)
+
+    def pairs_above(self, threshold: float = RISK_PARAMS['max_correlation'],
+                    absolute: bool = False) -> List[Tuple[str, str, float]]:
+        """Every symbol pair whose correlation exceeds ``threshold``, strongest first."""
+        return correlated_pairs(self.correlation(), self.symbols, threshold, absolute)
+
+    def max_correlation_with(self, symbol: str, others: Iterable[str]) -> float:
+        """
+        Highest correlation between ``symbol`` and any of ``others``.
+
+        NaN when no pair has enough common history. Meant for checking a
+        candidate position against current holdings.
+        """
+        columns = [self._index[other] for other in others if other in self._index and other != symbol]
+        if not columns:
+            return np.nan
+        row = self.correlation()[self._index[symbol], columns]
+        return np.nan if np.isnan(row).all() else float(np.nanmax(row))
+
+    def clusters(self, threshold: float = RISK_PARAMS['max_correlation'],
+                 method: str = 'complete') -> Dict[str, int]:
+        """
+        Hierarchical clustering of the symbols on the distance ``1 - correlation``.
+
+        The tree is cut at distance ``1 - threshold``. With the default
+        complete linkage every pair inside a cluster is correlated above
+        ``threshold``. Pairs without a correlation count as uncorrelated.
+
+        Returns:
+            Mapping of symbol to cluster number (starting at 1)
+        """
+        from scipy.cluster.hierarchy import fcluster, linkage
+        from scipy.spatial.distance import squareform
+
+        if len(self.symbols) < 2:
+            return {symbol: 1 for symbol in self.symbols}
+        distance = 1.0 - np.nan_to_num(self.correlation(), nan=0.0)
+        np.fill_diagonal(distance, 0.0)
+        tree = linkage(squareform(np.clip(distance, 0.0, 2.0), checks=False), method=method)
+        labels = fcluster(tree, t=1.0 - threshold, criterion='distance')
+        return dict(zip(self.symbols, labels.tolist()))
@@ -0,0 +1,68 @@
+import logging
+from typing import Dict, Optional, Tuple
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import MODEL_CONFIGS
+from data.sequences import SequenceDataset
+
+logger = logging.getLogger(__name__)
+
+
+def build_lstm(lookback: int, n_features: int, **overrides):
+    """
+    Create a compiled stacked LSTM regressor from ``MODEL_CONFIGS['lstm']``.
+
+    One LSTM layer per entry of ``layers``, all but the last returning
+    sequences, followed by a single linear output. tensorflow is imported
+    here, so it stays an optional dependency (``requirements/ml.txt``).
+    """
+    from tensorflow import keras
+
+    params = {**MODEL_CONFIGS['lstm'], **overrides}
+    layers = params['layers']
+    model = keras.Sequential([keras.Input(shape=(lookback, n_features))])
+    for i, units in enumerate(layers):
+        model.add(keras.layers.LSTM(units,
+                                    activation=params['activation'],
+                                    dropout=params['dropout'],
+                                    recurrent_dropout=params['recurrent_dropout'],
+                                    return_sequences=i < len(layers) - 1))
+    model.add(keras.layers.Dense(1))
+    model.compile(optimizer=params['optimizer'], loss=params['loss'])
+    return model
+
+
+def train_lstm(dataset: SequenceDataset, seed: Optional[int] = None, verbose: int = 0,
+               **overrides) -> Tuple[object, Dict]:
+    """
+    Fit an LSTM on a ``SequenceDataset``, streaming mini-batches.
+
+    The dataset's train and validation subsets take the place of Keras'
+    ``validation_split``, which cannot split a streamed dataset and would
+    not respect time order.
+
+    Args:
+        dataset: Training samples
+        seed: Seed of the per-epoch shuffles
+        verbose: Keras verbosity
+        **overrides: Overrides of ``MODEL_CONFIGS['lstm']``, e.g. ``epochs``
+
+    Returns:
+        Tuple of the fitted model and its per-epoch loss history
+    """
+    params = {**MODEL_CONFIGS['lstm'], **overrides}
+    model = build_lstm(dataset.lookback, dataset.n_features, **params)
+    train = dataset.to_tf_dataset('train', params['batch_size'], shuffle=True, seed=seed)
+    validation = (dataset.to_tf_dataset('validation', params['batch_size'], shuffle=False)
+                  if dataset.size('validation') else None)
+
+    logger.info(f"Training LSTM on {dataset.size('train')} sequences of {dataset.lookback} x "
+                f"{dataset.n_features}, validating on {dataset.size('validation')}")
+    history = model.fit(train, validation_data=validation, epochs=params['epochs'], verbose=verbose)
+    return model, history.history
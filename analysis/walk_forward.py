@@ -0,0 +1,296 @@
+import os
+import time
+import shutil
+import logging
+import tempfile
+import traceback
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import sys
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import INDICATOR_COLUMNS, MODEL_CONFIGS, TIME_WINDOWS
+from analysis.model_evaluation import evaluate_predictions
+from data.feature_store import FeatureStore, FeatureTensor
+
+logger = logging.getLogger(__name__)
+
+# Models trained by the walk-forward pipeline
+TREE_MODELS = ('random_forest', 'xgboost')
+
+# Tensors opened by this process, keyed by (store root, version), so a
+# worker maps the stored tensor once however many folds it trains
+_open_tensors: Dict[Tuple[str, str], FeatureTensor] = {}
+
+
+def walk_forward_windows(n_samples: int,
+                         training: int = TIME_WINDOWS['training'],
+                         validation: int = TIME_WINDOWS['validation'],
+                         test: int = TIME_WINDOWS['test'],
+                         step: Optional[int] = None,
+                         expanding: bool = False,
+                         gap: int = 0) -> List[Dict]:
+    """
+    Split ``n_samples`` ordered rows into walk-forward folds.
+
+    Each fold trains on ``training`` rows, validates on the ``validation``
+    rows after a purge of ``gap`` rows and tests on the ``test`` rows after
+    another ``gap``; the next fold starts ``step`` rows later (defaults to
+    ``test``, so test windows tile the history without overlapping). With
+    targets looking ``h`` bars ahead, a ``gap`` of ``h`` keeps every
+    training target from overlapping the validation period, and every
+    validation target from overlapping the test period.
+
+    Args:
+        n_samples: Number of rows in time order
+        training: Training window length
+        validation: Validation window length
+        test: Test window length
+        step: Rows between consecutive folds
+        expanding: Keep the training window anchored at row 0 and grow it
+        gap: Rows left out between training and validation and between
+            validation and test
+
+    Returns:
+        List of folds with ``fold`` number and ``train``, ``validation`` and
+        ``test`` (start, stop) row ranges
+    """
+    step = step or test
+    folds = []
+    start = 0
+    while start + training + validation + test + 2 * gap <= n_samples:
+        train_stop = start + training
+        validation_start = train_stop + gap
+        test_start = validation_start + validation + gap
+        folds.append({
+            'fold': len(folds),
+            'train': (0 if expanding else start, train_stop),
+            'validation': (validation_start, validation_start + validation),
+            'test': (test_start, test_start + test)
+        })
+        start += step
+    return folds
+
+
+def build_model(name: str, **overrides):
+    """
+    Create an unfitted regressor from ``MODEL_CONFIGS``.
+
+    xgboost is imported only when requested, so it stays an optional
+    dependency.
+    """
+    if name not in TREE_MODELS:
+        raise ValueError(f"Unsupported model {name!r}; expected one of {TREE_MODELS}")
+    params = {**MODEL_CONFIGS[name], **overrides}
+
+    if name == 'random_forest':
+        from sklearn.ensemble import RandomForestRegressor
+        if params.get('max_features') == 'auto':
+            # 'auto' meant every feature for regressors and was removed in scikit-learn 1.3
+            params['max_features'] = 1.0
+        return RandomForestRegressor(**params)
+
+    from xgboost import XGBRegressor
+    return XGBRegressor(**params)
+
+
+def train_fold(tensor: FeatureTensor, symbol: str, fold: Dict, model_name: str,
+               model_params: Optional[Dict] = None, horizon: int = 1) -> Dict:
+    """
+    Fit one model on a fold's valid training rows and score its other windows.
+
+    Returns:
+        Dictionary with ``symbol``, ``model``, ``fold`` and the
+        ``evaluate_predictions`` output for the ``validation`` and ``test``
+        windows, plus the test ``predictions``
+    """
+    j = tensor.symbols.index(symbol)
+    target = tensor.target(horizon)
+
+    def rows(window: str) -> Tuple[np.ndarray, np.ndarray]:
+        bars = slice(*fold[window])
+        # Slicing the memmap gives views of the shared pages; only usable rows are copied
+        X, y = tensor.features[bars, j], target[bars, j]
+        mask = tensor.valid[bars, j] & np.isfinite(y)
+        return X[mask], y[mask]
+
+    model = build_model(model_name, **(model_params or {}))
+    model.fit(*rows('train'))
+
+    scores = {}
+    for window in ('validation', 'test'):
+        X_window, y_window = rows(window)
+        predictions = model.predict(X_window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores[window] = evaluate_predictions(y_window, predictions)
+
+    return {'symbol': symbol, 'model': model_name, 'fold': fold['fold'],
+            'validation': scores['validation'], 'test': scores['test'],
+            'predictions': predictions}
+
+
+def _open_tensor(root: str, version: str) -> FeatureTensor:
+    """Memory-map a stored tensor, reusing this process's maps."""
+    key = (root, version)
+    if key not in _open_tensors:
+        _open_tensors[key] = FeatureStore(Path(root)).load(version)
+    return _open_tensors[key]
+
+
+def _train_fold_task(root: str, version: str, symbol: str, fold: Dict, model_name: str,
+                     model_params: Optional[Dict], horizon: int) -> Dict:
+    """Worker entry point: never raises, so one failure does not stop the run."""
+    start = time.perf_counter()
+    try:
+        tensor = _open_tensor(root, version)
+        result, error = train_fold(tensor, symbol, fold, model_name, model_params, horizon), None
+    except Exception:
+        result, error = None, traceback.format_exc()
+    return {'symbol': symbol, 'model': model_name, 'fold': fold['fold'],
+            'result': result, 'error': error, 'seconds': time.perf_counter() - start}
+
+
+def symbol_folds(tensor: FeatureTensor, symbol: str, horizon: int = 1,
+                 windows: Optional[Dict[str, int]] = None,
+                 step: Optional[int] = None, expanding: bool = False) -> List[Dict]:
+    """
+    Walk-forward folds of one symbol in tensor rows.
+
+    Windows are laid out over the symbol's own bars, ``horizon`` bars apart
+    so no target spans two windows even where the symbol misses dates of
+    the tensor, then mapped to the tensor rows from their first to their
+    last bar. Folds with a window holding no row with every feature and a
+    target are dropped.
+    """
+    windows = {**TIME_WINDOWS, **(windows or {})}
+    j = tensor.symbols.index(symbol)
+    usable = tensor.valid[:, j] & np.isfinite(tensor.target(horizon)[:, j])
+    bars = np.flatnonzero(tensor.present[:, j])
+
+    folds = []
+    for fold in walk_forward_windows(len(bars), windows['training'], windows['validation'],
+                                     windows['test'], step, expanding, gap=horizon):
+        fold = {'fold': fold['fold'], **{
+            window: (int(bars[fold[window][0]]), int(bars[fold[window][1] - 1]) + 1)
+            for window in ('train', 'validation', 'test')
+        }}
+        if all(usable[slice(*fold[window])].any() for window in ('train', 'validation', 'test')):
+            folds.append(fold)
+    return folds
+
+
+def run_walk_forward(frames: Dict[str, pd.DataFrame],
+                     models: Sequence[str] = ('random_forest',),
+                     features: Sequence[str] = INDICATOR_COLUMNS,
+                     target_col: str = 'close',
+                     horizon: int = 1,
+                     windows: Optional[Dict[str, int]] = None,
+                     step: Optional[int] = None,
+                     expanding: bool = False,
+                     model_params: Optional[Dict[str, Dict]] = None,
+                     max_workers: Optional[int] = None,
+                     store: Optional[FeatureStore] = None) -> Dict:
+    """
+    Walk-forward training and evaluation of tree models across symbols.
+
+    Features and forward returns come from the ``FeatureStore`` tensor of
+    ``frames``, built once per data version; each (symbol, fold, model)
+    task then runs in a process pool and receives only the store location,
+    the version and row ranges, and workers memory-map the stored tensor.
+    Folds come from ``symbol_folds``, and rows without features or target
+    are masked inside them.
+
+    Args:
+        frames: Mapping of symbol to DataFrame with a ``date`` column
+        models: Names from ``TREE_MODELS``
+        features: Feature columns
+        target_col: Price column the forward return target is computed from
+        horizon: Bars ahead of the forward return
+        windows: ``training``, ``validation`` and ``test`` lengths; defaults
+            to ``TIME_WINDOWS``
+        step: Rows between folds; defaults to the test window
+        expanding: Grow the training window from the first row
+        model_params: Per-model overrides of ``MODEL_CONFIGS``
+        max_workers: Worker process count; defaults to the number of CPUs
+        store: Feature store holding the tensor; a temporary store that is
+            removed afterwards by default
+
+    Returns:
+        Dictionary with a ``results`` DataFrame (one row per symbol, model,
+        fold and window with the ``evaluate_predictions`` metrics), a
+        ``by_fold`` DataFrame averaging them across symbols, per-task
+        ``predictions`` on the test windows, ``failures``, ``folds`` per
+        symbol and ``elapsed`` seconds
+    """
+    windows = {**TIME_WINDOWS, **(windows or {})}
+    model_params = model_params or {}
+    for name in models:
+        if name not in TREE_MODELS:
+            raise ValueError(f"Unsupported model {name!r}; expected one of {TREE_MODELS}")
+
+    temporary = store is None
+    if temporary:
+        store = FeatureStore(Path(tempfile.mkdtemp(prefix='walk_forward_')))
+    start = time.perf_counter()
+    try:
+        tensor = store.get_or_build(frames, features, [horizon], target_col)
+        folds = {symbol: symbol_folds(tensor, symbol, horizon, windows, step, expanding)
+                 for symbol in tensor.symbols}
+        tasks = [(symbol, fold, name) for symbol, symbol_fold_list in folds.items()
+                 for fold in symbol_fold_list for name in models]
+        logger.info(f"Training {len(tasks)} walk-forward tasks on {len(tensor.feature_names)} features")
+
+        rows, predictions, failures = [], {}, {}
+        with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = [
+                executor.submit(_train_fold_task, str(store.root), tensor.version, symbol, fold, name,
+                                model_params.get(name), horizon)
+                for symbol, fold, name in tasks
+            ]
+            for future in as_completed(futures):
+                try:
+                    outcome = future.result()
+                except Exception:
+                    # The worker process itself died (e.g. out of memory)
+                    logger.error(f"Walk-forward worker failed:\n{traceback.format_exc()}")
+                    continue
+
+                key = (outcome['symbol'], outcome['model'], outcome['fold'])
+                if outcome['error'] is not None:
+                    failures[key] = outcome['error']
+                    logger.error(f"{key} failed:\n{outcome['error']}")
+                    continue
+
+                result = outcome['result']
+                predictions[key] = result['predictions']
+                for window in ('validation', 'test'):
+                    rows.append({'symbol': key[0], 'model': key[1], 'fold': key[2],
+                                 'window': window, **result[window]})
+    finally:
+        if temporary:
+            shutil.rmtree(store.root, ignore_errors=True)
+
+    results = pd.DataFrame(rows)
+    if not results.empty:
+        results = results.sort_values(['model', 'symbol', 'fold', 'window'], ignore_index=True)
+        by_fold = results.drop(columns='symbol').groupby(['model', 'fold', 'window']).mean()
+    else:
+        by_fold = pd.DataFrame()
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Walk-forward finished {len(predictions)}/{len(tasks)} tasks in {elapsed:.2f}s")
+    return {
+        'results': results,
+        'by_fold': by_fold,
+        'predictions': predictions,
+        'failures': failures,
+        'folds': folds,
+        'elapsed': elapsed
+    }
@@ -0,0 +1,170 @@
+import warnings
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Union
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import RISK_PARAMS
+from utils.metrics import calculate_trading_metrics
+from monitoring.metrics import SIGNAL_COUNT
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+class BacktestEngine:
+    """
+    Vectorized backtester for a (time x symbol) signal matrix.
+
+    Signals are target directions in [-1, 1] decided at the close of each
+    bar and held over the next bar. Each position is sized at
+    ``max_position_size`` of equity per unit of signal, and gross exposure is
+    scaled down to ``max_gross_exposure`` when too many positions are open.
+    Portfolios are rebalanced to target weights every bar.
+
+    A position is closed at the close of the first bar where its return
+    since entry breaches ``stop_loss`` or ``take_profit``, and stays flat
+    until the signal changes. Only close prices are used, so exits are not
+    intrabar and realised losses can overshoot the stop. Fees and slippage
+    are charged as a fraction of traded notional.
+    """
+
+    def __init__(self,
+                 stop_loss: Optional[float] = RISK_PARAMS['stop_loss'],
+                 take_profit: Optional[float] = RISK_PARAMS['take_profit'],
+                 max_position_size: float = RISK_PARAMS['max_position_size'],
+                 fee_rate: float = 0.001,
+                 slippage: float = 0.0005,
+                 max_gross_exposure: float = 1.0,
+                 initial_capital: float = 1.0,
+                 risk_free_rate: float = RISK_PARAMS['risk_free_rate']):
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.max_position_size = max_position_size
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.max_gross_exposure = max_gross_exposure
+        self.initial_capital = initial_capital
+        self.risk_free_rate = risk_free_rate
+
+    def run(self, signals: ArrayLike, prices: ArrayLike) -> Dict:
+        """
+        Backtest a signal matrix against close prices.
+
+        Args:
+            signals: Target directions in [-1, 1], shape (time, symbols)
+            prices: Close prices, same shape; NaN where a symbol is not trading
+
+        Returns:
+            Dictionary with ``equity_curve``, portfolio ``returns``,
+            ``positions`` (weights held after each close), per-asset
+            ``asset_returns`` net of costs, ``turnover``, ``costs``,
+            ``trades`` per symbol and ``metrics`` from
+            ``utils.metrics.calculate_trading_metrics``. Outputs are pandas
+            objects when ``prices`` is a DataFrame.
+        """
+        index = prices.index if isinstance(prices, pd.DataFrame) else None
+        columns = prices.columns if isinstance(prices, pd.DataFrame) else None
+
+        prices = np.asarray(prices, dtype=np.float64)
+        signals = np.asarray(signals, dtype=np.float64)
+        if prices.ndim == 1:
+            prices, signals = prices[:, None], signals.reshape(-1, 1)
+        if signals.shape != prices.shape:
+            raise ValueError(f"signals shape {signals.shape} does not match prices {prices.shape}")
+
+        # No position can be opened or held while a symbol has no price
+        tradable = ~np.isnan(prices)
+        signals = np.where(tradable, np.clip(np.nan_to_num(signals), -1.0, 1.0), 0.0)
+        signals = self._apply_exits(signals, prices)
+        self._count_signals(signals)
+
+        weights = signals * self.max_position_size
+        gross = np.abs(weights).sum(axis=1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            scale = np.minimum(1.0, self.max_gross_exposure / gross)
+        weights *= np.where(gross > 0, scale, 0.0)
+
+        asset_returns = np.zeros_like(prices)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            asset_returns[1:] = prices[1:] / prices[:-1] - 1
+        asset_returns = np.nan_to_num(asset_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+        trades = np.diff(weights, axis=0, prepend=0.0)
+        cost_rate = self.fee_rate + self.slippage
+        contributions = np.zeros_like(weights)
+        contributions[1:] = weights[:-1] * asset_returns[1:]
+        contributions -= np.abs(trades) * cost_rate
+
+        portfolio_returns = contributions.sum(axis=1)
+        turnover = np.abs(trades).sum(axis=1)
+        equity_curve = self.initial_capital * np.cumprod(1 + portfolio_returns)
+
+        # Flat or loss-free periods leave some ratios undefined; report them as NaN
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            metrics = calculate_trading_metrics(portfolio_returns[1:], self.risk_free_rate)
+
+        results = {
+            'equity_curve': equity_curve,
+            'returns': portfolio_returns,
+            'positions': weights,
+            'asset_returns': contributions,
+            'turnover': turnover,
+            'costs': turnover * cost_rate,
+            'trades': (trades != 0).sum(axis=0),
+            'metrics': metrics
+        }
+
+        if index is not None:
+            for key in ('equity_curve', 'returns', 'turnover', 'costs'):
+                results[key] = pd.Series(results[key], index=index, name=key)
+            for key in ('positions', 'asset_returns'):
+                results[key] = pd.DataFrame(results[key], index=index, columns=columns)
+            results['trades'] = pd.Series(results['trades'], index=columns, name='trades')
+
+        return results
+
+    @staticmethod
+    def _count_signals(signals: np.ndarray):
+        """Count the bars where a symbol enters a new long or short direction."""
+        direction = np.sign(signals)
+        entries = (direction != 0) & (direction != np.vstack([np.zeros((1, direction.shape[1])), direction[:-1]]))
+        SIGNAL_COUNT.labels('long').inc(int(np.count_nonzero(entries & (direction > 0))))
+        SIGNAL_COUNT.labels('short').inc(int(np.count_nonzero(entries & (direction < 0))))
+
+    def _apply_exits(self, signals: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Zero out each position from the bar its stop loss or take profit is hit."""
+        if self.stop_loss is None and self.take_profit is None:
+            return signals
+
+        n_bars = signals.shape[0]
+        rows = np.arange(n_bars)[:, None]
+
+        # A holding segment starts whenever the target signal changes
+        starts = np.ones_like(signals, dtype=bool)
+        starts[1:] = signals[1:] != signals[:-1]
+        entry_rows = np.maximum.accumulate(np.where(starts, rows, 0), axis=0)
+        entry_prices = np.take_along_axis(prices, entry_rows, axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            trade_returns = np.sign(signals) * (prices / entry_prices - 1)
+
+        hits = np.zeros_like(signals, dtype=bool)
+        if self.stop_loss is not None:
+            hits |= trade_returns <= -self.stop_loss
+        if self.take_profit is not None:
+            hits |= trade_returns >= self.take_profit
+        hits &= signals != 0
+
+        # Exits seen so far in the segment: running count minus the count before its entry
+        hit_count = np.cumsum(hits, axis=0)
+        before_entry = np.take_along_axis(hit_count - hits, entry_rows, axis=0)
+        exited = hit_count > before_entry
+
+        return np.where(exited, 0.0, signals)
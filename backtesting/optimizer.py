@@ -0,0 +1,196 @@
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import SIGNAL_PARAMS
+from strategy.signals.generator import signal_rule, threshold_signals
+
+# Upper bound on the temporary arrays held for one chunk of parameter sets
+DEFAULT_MAX_CHUNK_BYTES = 256 * 1024 ** 2
+
+METRIC_COLUMNS = [
+    'total_return', 'annual_return', 'sharpe_ratio',
+    'win_rate', 'total_trades', 'avg_return_per_trade'
+]
+
+
+def sweep_thresholds(predictions: np.ndarray,
+                     actual_returns: np.ndarray,
+                     thresholds: Sequence[float],
+                     symbols: Optional[List[str]] = None,
+                     by_symbol: bool = True,
+                     max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES) -> pd.DataFrame:
+    """
+    Evaluate ``model_evaluation.calculate_trading_metrics`` for many thresholds at once.
+
+    Signals for every threshold are built in one broadcast over a
+    (params x symbols x time) array, processed in chunks of thresholds so
+    the temporaries stay under ``max_chunk_bytes``.
+
+    Args:
+        predictions: Predicted returns, shape (time,) or (time, symbols)
+        actual_returns: Realised returns, same shape
+        thresholds: Threshold values to evaluate
+        symbols: Optional symbol names for the output table
+        by_symbol: One row per (threshold, symbol) if True, else one row per
+            threshold for the equal-weighted portfolio of all symbols
+        max_chunk_bytes: Memory budget per chunk
+
+    Returns:
+        Tidy DataFrame with a ``threshold`` column (and ``symbol`` when
+        ``by_symbol``) followed by the trading metrics
+    """
+    predictions = _as_panel(predictions)
+    actual_returns = _as_panel(actual_returns)
+    params = pd.DataFrame({'threshold': np.asarray(thresholds, dtype=np.float64)})
+
+    def build_signals(chunk: pd.DataFrame) -> np.ndarray:
+        return threshold_signals(predictions, chunk['threshold'].to_numpy()[:, None, None])
+
+    return _sweep(params, build_signals, actual_returns, symbols, by_symbol, max_chunk_bytes)
+
+
+def sweep_signal_params(momentum: np.ndarray,
+                        volume_ratio: np.ndarray,
+                        confidence: np.ndarray,
+                        actual_returns: np.ndarray,
+                        grid: Dict[str, Sequence[float]],
+                        symbols: Optional[List[str]] = None,
+                        by_symbol: bool = False,
+                        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES) -> pd.DataFrame:
+    """
+    Grid-search ``SIGNAL_PARAMS`` thresholds in one broadcast computation.
+
+    Signals follow ``strategy.signals.generator.signal_rule``: a bar goes
+    long (short) when momentum is above (below) plus/minus
+    ``momentum_threshold``, the volume ratio exceeds ``volume_threshold``
+    and confidence is at least ``min_confidence``. Parameters missing from
+    ``grid`` are held at their ``SIGNAL_PARAMS`` value.
+
+    Args:
+        momentum: Lookback return per bar, shape (time, symbols)
+        volume_ratio: Volume relative to its recent average, same shape
+        confidence: Model confidence in [0, 1], same shape
+        actual_returns: Realised returns, same shape
+        grid: Mapping of parameter name to the values to try
+        symbols: Optional symbol names for the output table
+        by_symbol: One row per (parameter set, symbol) instead of per parameter set
+        max_chunk_bytes: Memory budget per chunk
+
+    Returns:
+        Tidy DataFrame of parameter values followed by the trading metrics
+    """
+    names = ['momentum_threshold', 'volume_threshold', 'min_confidence']
+    unknown = set(grid) - set(names)
+    if unknown:
+        raise ValueError(f"Unsupported signal parameters: {sorted(unknown)}")
+
+    values = [grid.get(name, [SIGNAL_PARAMS[name]]) for name in names]
+    params = pd.DataFrame(list(itertools.product(*values)), columns=names, dtype=np.float64)
+
+    momentum = _as_panel(momentum)
+    volume_ratio = _as_panel(volume_ratio)
+    confidence = _as_panel(confidence)
+    actual_returns = _as_panel(actual_returns)
+
+    def build_signals(chunk: pd.DataFrame) -> np.ndarray:
+        momentum_threshold, volume_threshold, min_confidence = (
+            chunk[name].to_numpy()[:, None, None] for name in names
+        )
+        return signal_rule(momentum, volume_ratio, confidence,
+                           momentum_threshold, volume_threshold, min_confidence)
+
+    return _sweep(params, build_signals, actual_returns, symbols, by_symbol, max_chunk_bytes)
+
+
+def _as_panel(values: np.ndarray) -> np.ndarray:
+    """Return a C-contiguous (symbols x time) float64 panel.
+
+    Time is kept on the last axis so per-series reductions run over
+    contiguous memory.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[:, None] if values.ndim == 1 else values
+    return np.ascontiguousarray(values.T)
+
+
+def _sweep(params: pd.DataFrame, build_signals, actual_returns: np.ndarray,
+           symbols: Optional[List[str]], by_symbol: bool,
+           max_chunk_bytes: int) -> pd.DataFrame:
+    """Evaluate parameter sets in memory-bounded chunks and tidy the results."""
+    n_symbols, n_bars = actual_returns.shape
+    symbols = list(symbols) if symbols is not None else list(range(n_symbols))
+
+    # int8 signals plus a few float64 (time x symbols) temporaries per parameter set
+    bytes_per_param = n_bars * n_symbols * 4 * 8
+    chunk_size = max(1, int(max_chunk_bytes // max(bytes_per_param, 1)))
+
+    tables = []
+    for start in range(0, len(params), chunk_size):
+        chunk = params.iloc[start:start + chunk_size]
+        metrics = _trading_metrics(build_signals(chunk), actual_returns, by_symbol)
+
+        if by_symbol:
+            table = chunk.loc[chunk.index.repeat(n_symbols)].reset_index(drop=True)
+            table['symbol'] = symbols * len(chunk)
+            for name, values in metrics.items():
+                table[name] = values.reshape(-1)
+        else:
+            table = chunk.reset_index(drop=True)
+            for name, values in metrics.items():
+                table[name] = values
+        tables.append(table)
+
+    return pd.concat(tables, ignore_index=True)
+
+
+def _trading_metrics(signals: np.ndarray, actual_returns: np.ndarray,
+                     by_symbol: bool) -> Dict[str, np.ndarray]:
+    """
+    Vectorized ``model_evaluation.calculate_trading_metrics``.
+
+    ``signals`` has shape (params, symbols, time). With ``by_symbol`` the
+    metrics have shape (params, symbols); otherwise returns are averaged
+    across symbols and trade statistics pooled, giving shape (params,).
+    """
+    held = signals[..., :-1]
+    strategy_returns = held * actual_returns[None, :, 1:]
+    active = held != 0
+
+    total_trades = np.count_nonzero(signals, axis=-1)
+    winning_trades = np.count_nonzero((strategy_returns > 0) & active, axis=-1)
+    active_count = np.count_nonzero(active, axis=-1)
+    active_sum = np.where(active, strategy_returns, 0.0).sum(axis=-1)
+
+    if not by_symbol:
+        strategy_returns = strategy_returns.mean(axis=1)
+        total_trades = total_trades.sum(axis=1)
+        winning_trades = winning_trades.sum(axis=1)
+        active_count = active_count.sum(axis=1)
+        active_sum = active_sum.sum(axis=1)
+
+    n_periods = strategy_returns.shape[-1]
+    growth = np.prod(1 + strategy_returns, axis=-1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe_ratio = (strategy_returns.mean(axis=-1) /
+                        strategy_returns.std(axis=-1) * np.sqrt(252))
+        win_rate = np.where(total_trades > 0, winning_trades / total_trades, 0.0)
+        avg_return = np.where(total_trades > 0, active_sum / active_count, 0.0)
+
+    return {
+        'total_return': growth - 1,
+        'annual_return': growth ** (252 / n_periods) - 1,
+        'sharpe_ratio': sharpe_ratio,
+        'win_rate': win_rate,
+        'total_trades': total_trades,
+        'avg_return_per_trade': avg_return
+    }
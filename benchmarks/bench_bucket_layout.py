@@ -0,0 +1,134 @@
+"""
+Benchmark the monthly bucket layout against one document per (symbol, date).
+
+The same daily bars are stored in both layouts, then one symbol-year is
+loaded through ``get_dataframe``. Storage is measured as
+the BSON size of the documents, or ``collStats`` storageSize with ``--uri``. By
+default everything runs against mongomock, which has no network round
+trips or page cache, so the documents-fetched column is the better guide
+to server read cost; pass ``--uri`` to time a real server.
+
+Usage:
+    python benchmarks/bench_bucket_layout.py --symbols 5 --days 1095 --indicators 90
+    python benchmarks/bench_bucket_layout.py --uri mongodb://localhost:27017
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest import mock
+
+import bson
+import mongomock
+import numpy as np
+from mongomock.collection import BulkOperationBuilder
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDBManager
+from data.database.buckets import bucket_collection_name, migrate_to_buckets
+from data.database.operations import DatabaseManager
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+START = datetime(2021, 1, 1)
+
+
+def generate_documents(n_symbols: int, n_days: int, n_indicators: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for s in range(n_symbols):
+        for i in range(n_days):
+            values = rng.standard_normal(n_indicators)
+            doc = {
+                "symbol": f"SYM{s}-USD",
+                "date": START + timedelta(days=i),
+                "close": float(100 + values[0]),
+                "volume": float(1e6 + i)
+            }
+            doc.update({f"indicator_{j}": float(values[j]) for j in range(n_indicators)})
+            yield doc
+
+
+def _patch_mongomock():
+    # mongomock 4.x predates the sort argument newer pymongo passes to bulk replaces
+    add_replace = BulkOperationBuilder.add_replace
+    BulkOperationBuilder.add_replace = (
+        lambda self, *args, sort=None, **kwargs: add_replace(self, *args, **kwargs)
+    )
+
+
+def storage_bytes(db, collection: str, uri: str = None) -> int:
+    if uri:
+        return db.command("collStats", collection)["storageSize"]
+    return sum(len(bson.encode(doc)) for doc in db[collection].find())
+
+
+def run(n_symbols: int = 5, n_days: int = 1_095, n_indicators: int = 90,
+        repeats: int = 5, uri: str = None) -> dict:
+    if uri:
+        manager = MongoDBManager(uri, "bucket_benchmark")
+        manager.client.drop_database("bucket_benchmark")
+    else:
+        _patch_mongomock()
+        with mock.patch.object(mongodb_utils, "MongoClient", mongomock.MongoClient):
+            manager = MongoDBManager("mongodb://localhost:27017/", "bucket_benchmark")
+    bucketed = DatabaseManager(uri or "mongodb://localhost:27017/", "bucket_benchmark",
+                               bucketed_collections=[COLLECTION])
+    db = manager.db
+
+    db[COLLECTION].insert_many(generate_documents(n_symbols, n_days, n_indicators))
+    db[COLLECTION].create_index([("symbol", 1), ("date", 1)], unique=True)
+    start = time.perf_counter()
+    migration = migrate_to_buckets(db, COLLECTION)
+    migrate_seconds = time.perf_counter() - start
+
+    year = {"symbol": "SYM0-USD", "date": {"$gte": START, "$lt": START + timedelta(days=365)}}
+    bucket_query = {"symbol": "SYM0-USD", "start": {"$lt": START + timedelta(days=365)},
+                    "end": {"$gte": START}}
+    layouts = {
+        "documents": (manager, COLLECTION, db[COLLECTION].count_documents(year)),
+        "buckets": (bucketed, bucket_collection_name(COLLECTION),
+                    db[bucket_collection_name(COLLECTION)].count_documents(bucket_query))
+    }
+
+    results = {}
+    for name, (reader, collection, fetched) in layouts.items():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            frame = reader.get_dataframe(COLLECTION, year, {"_id": 0}, [("date", 1)])
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            "read_seconds": min(timings),
+            "documents_fetched": fetched,
+            "storage_bytes": storage_bytes(db, collection, uri),
+            "rows": len(frame)
+        }
+
+    target = uri or "mongomock"
+    print(f"{n_symbols} symbols x {n_days} days x {n_indicators} indicators ({target}); "
+          f"migrated {migration['rows']} rows into {migration['buckets']} buckets in {migrate_seconds:.2f}s")
+    base = results["documents"]
+    for name, stats in results.items():
+        print(f"  {name:10s} read one symbol-year {stats['read_seconds'] * 1e3:8.1f} ms "
+              f"({base['read_seconds'] / stats['read_seconds']:.1f}x)  "
+              f"{stats['documents_fetched']:5d} docs  "
+              f"storage {stats['storage_bytes'] / 1024 ** 2:7.2f} MB "
+              f"({base['storage_bytes'] / stats['storage_bytes']:.2f}x)")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--days", type=int, default=1_095)
+    parser.add_argument("--indicators", type=int, default=90)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--uri", help="MongoDB server to benchmark instead of mongomock")
+    args = parser.parse_args()
+
+    run(args.symbols, args.days, args.indicators, args.repeats, args.uri)
@@ -0,0 +1,147 @@
+"""
+Benchmark bulk upsert ingestion against one write round trip per document.
+
+By default writes go to mongomock, with a fixed sleep added to every write
+call to stand in for the network round trip to a server. mongomock matches
+upsert filters by scanning the whole collection, which makes both upsert
+paths O(n^2) and keeps their gap well below what a server with a
+(symbol, date) index shows; pass ``--uri`` to measure against a real server.
+
+Usage:
+    python benchmarks/bench_ingestion.py --symbols 2 --days 1000 --latency-ms 1
+    python benchmarks/bench_ingestion.py --uri mongodb://localhost:27017 --symbols 50
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import numpy as np
+import pandas as pd
+from mongomock.collection import BulkOperationBuilder
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.database.ingestion import MarketDataIngestor
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+
+
+class LatencyDatabase:
+    """Database wrapper whose collections sleep before every write call."""
+
+    def __init__(self, db, latency: float):
+        self.db = db
+        self.latency = latency
+
+    def __getitem__(self, name):
+        return LatencyCollection(self.db[name], self.latency)
+
+
+class LatencyCollection:
+    def __init__(self, collection, latency: float):
+        self.collection = collection
+        self.latency = latency
+
+    def insert_one(self, document):
+        time.sleep(self.latency)
+        return self.collection.insert_one(document)
+
+    def update_one(self, query, update, upsert=False):
+        time.sleep(self.latency)
+        return self.collection.update_one(query, update, upsert=upsert)
+
+    def bulk_write(self, operations, ordered=True):
+        time.sleep(self.latency)
+        return self.collection.bulk_write(operations, ordered=ordered)
+
+
+def make_frame(n_symbols: int, n_days: int, n_indicators: int = 30, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    start = datetime(2020, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(n_days)]
+    frame = pd.DataFrame({
+        "symbol": np.repeat([f"SYM{i}-USD" for i in range(n_symbols)], n_days),
+        "date": dates * n_symbols,
+        "close": rng.uniform(1, 100, n_symbols * n_days),
+        "volume": rng.uniform(1e3, 1e6, n_symbols * n_days)
+    })
+    for j in range(n_indicators):
+        frame[f"indicator_{j}"] = rng.standard_normal(len(frame))
+    return frame
+
+
+def _patch_mongomock():
+    # mongomock 4.x predates the sort argument newer pymongo passes to bulk updates
+    add_update = BulkOperationBuilder.add_update
+    BulkOperationBuilder.add_update = (
+        lambda self, *args, sort=None, **kwargs: add_update(self, *args, **kwargs)
+    )
+
+
+def run(n_symbols: int = 2, n_days: int = 1_000, latency_ms: float = 1.0,
+        batch_size: int = 1_000, max_in_flight: int = 4, uri: str = None) -> dict:
+    frame = make_frame(n_symbols, n_days)
+    records = frame.to_dict("records")
+
+    if uri:
+        from pymongo import MongoClient
+        client = MongoClient(uri)
+
+        def fresh_db():
+            client.drop_database("ingestion_benchmark")
+            db = client["ingestion_benchmark"]
+            db[COLLECTION].create_index([("symbol", 1), ("date", 1)], unique=True)
+            return db
+    else:
+        _patch_mongomock()
+
+        def fresh_db():
+            return LatencyDatabase(mongomock.MongoClient()["bench"], latency_ms / 1000)
+
+    timings = {}
+
+    db = fresh_db()
+    start = time.perf_counter()
+    for record in records:
+        db[COLLECTION].insert_one(dict(record))
+    timings["insert_one"] = time.perf_counter() - start
+
+    db = fresh_db()
+    start = time.perf_counter()
+    for record in records:
+        key = {"symbol": record["symbol"], "date": record["date"]}
+        db[COLLECTION].update_one(key, {"$set": record}, upsert=True)
+    timings["update_one_upsert"] = time.perf_counter() - start
+
+    db = fresh_db()
+    ingestor = MarketDataIngestor(db, COLLECTION, batch_size, max_in_flight)
+    start = time.perf_counter()
+    result = ingestor.ingest(frame)
+    timings["bulk_upsert"] = time.perf_counter() - start
+
+    target = uri or f"mongomock + {latency_ms}ms latency"
+    print(f"{len(frame)} documents ({target}); "
+          f"{result['inserted']} inserted, {result['errors']} errors")
+    for name, seconds in timings.items():
+        print(f"  {name:18s} {len(frame) / seconds:>10,.0f} docs/s  "
+              f"({seconds / timings['bulk_upsert']:.1f}x bulk time)")
+    return {f"{name}_seconds": seconds for name, seconds in timings.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=2)
+    parser.add_argument("--days", type=int, default=1_000)
+    parser.add_argument("--latency-ms", type=float, default=1.0)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    parser.add_argument("--uri", help="MongoDB server to benchmark instead of mongomock")
+    args = parser.parse_args()
+
+    run(args.symbols, args.days, args.latency_ms, args.batch_size, args.max_in_flight, args.uri)
@@ -0,0 +1,131 @@
+"""
+Benchmark MongoDBManager.get_dataframe against the list-of-dicts path.
+
+Two stand-ins are used: an in-process mongomock client for the end-to-end
+path, and a lazy cursor that decodes documents on demand like a pymongo
+server cursor does. mongomock sorts and copies the whole result set itself,
+so the lazy cursor is the one that isolates the loader's memory profile.
+
+Usage:
+    python benchmarks/bench_mongodb_loader.py --rows 50000 --indicators 90
+"""
+import sys
+import time
+import tracemalloc
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta
+from unittest import mock
+
+import mongomock
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDBManager
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+
+
+def generate_documents(n_rows: int, n_indicators: int, seed: int = 0):
+    """Yield indicator-enriched market data documents one at a time."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2020, 1, 1)
+    for i in range(n_rows):
+        values = rng.standard_normal(n_indicators)
+        doc = {
+            "symbol": "BTC-USD",
+            "date": start + timedelta(hours=i),
+            "close": float(100 + values[0]),
+            "volume": int(1000 + i)
+        }
+        doc.update({f"indicator_{j}": float(values[j]) for j in range(n_indicators)})
+        yield doc
+
+
+class LazyCursor:
+    """Cursor stand-in that builds each document only when it is read."""
+
+    def __init__(self, n_rows: int, n_indicators: int):
+        self.n_rows = n_rows
+        self.n_indicators = n_indicators
+
+    def batch_size(self, size: int) -> "LazyCursor":
+        return self
+
+    def __iter__(self):
+        return generate_documents(self.n_rows, self.n_indicators)
+
+
+def build_manager(n_rows: int, n_indicators: int) -> MongoDBManager:
+    """Create a mongomock-backed manager filled with indicator documents."""
+    with mock.patch.object(mongodb_utils, "MongoClient", mongomock.MongoClient):
+        manager = MongoDBManager("mongodb://localhost:27017/", "benchmark_db")
+
+    manager.db[COLLECTION].insert_many(generate_documents(n_rows, n_indicators))
+    return manager
+
+
+def legacy_get_dataframe(manager: MongoDBManager, query: dict) -> pd.DataFrame:
+    """Previous implementation: materialise every document before framing."""
+    cursor = manager.db[COLLECTION].find(filter=query).sort([("date", 1)])
+    return pd.DataFrame(list(cursor))
+
+
+def measure(func) -> dict:
+    """Return wall time and traced peak memory for a single call."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": elapsed, "peak_mb": peak / 1e6}
+
+
+def run(n_rows: int = 20_000, n_indicators: int = 90, batch_size: int = 5_000) -> dict:
+    manager = build_manager(n_rows, n_indicators)
+    query = {"symbol": "BTC-USD"}
+
+    cursor = LazyCursor(n_rows, n_indicators)
+
+    results = {
+        "cursor_legacy": measure(lambda: pd.DataFrame(list(cursor))),
+        "cursor_columnar": measure(lambda: mongodb_utils.cursor_to_dataframe(cursor, batch_size)),
+        "cursor_chunked": measure(lambda: sum(
+            len(chunk) for chunk in mongodb_utils.iter_dataframes(cursor, batch_size, batch_size)
+        )),
+        "mongomock_legacy": measure(lambda: legacy_get_dataframe(manager, query)),
+        "mongomock_columnar": measure(lambda: manager.get_dataframe(
+            COLLECTION, query=query, sort_by=[("date", 1)], batch_size=batch_size
+        )),
+        "mongomock_chunked": measure(lambda: sum(
+            len(chunk) for chunk in manager.get_dataframe(
+                COLLECTION, query=query, sort_by=[("date", 1)],
+                chunksize=batch_size, batch_size=batch_size
+            )
+        ))
+    }
+
+    for name, stats in results.items():
+        print(f"{name:>20}: {stats['seconds']:.3f}s, peak {stats['peak_mb']:.1f} MB")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--indicators", type=int, default=90)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    args = parser.parse_args()
+
+    run(args.rows, args.indicators, args.batch_size)
@@ -0,0 +1,75 @@
+"""
+Benchmark bar-by-bar portfolio rebalancing across universe sizes.
+
+Each method rebalances over a rolling returns window, once solving every
+bar from scratch and once warm-started from the previous bar's weights
+(the way PortfolioOptimizer is used in a backtest). Times are per rebalance.
+
+Usage:
+    python benchmarks/bench_portfolio.py --assets 50 100 250 500 --bars 50
+    python benchmarks/bench_portfolio.py --methods risk_parity --window 126
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from strategy.portfolio.allocation import ALLOCATION_METHODS, PortfolioOptimizer
+
+
+def make_returns(n_bars: int, n_assets: int, seed: int = 0) -> pd.DataFrame:
+    """Returns driven by one market factor plus noise of varying volatility."""
+    rng = np.random.default_rng(seed)
+    volatility = rng.uniform(0.01, 0.08, n_assets)
+    market = rng.normal(0, 0.02, (n_bars, 1))
+    beta = rng.uniform(0.5, 1.5, n_assets)
+    values = market * beta + rng.standard_normal((n_bars, n_assets)) * volatility
+    return pd.DataFrame(values, columns=[f"SYM{i}-USD" for i in range(n_assets)])
+
+
+def time_rebalances(method: str, returns: pd.DataFrame, window: int, n_bars: int, warm: bool) -> float:
+    optimizer = PortfolioOptimizer(method)
+    expected = returns.mean() if method == 'mean_variance' else None
+    elapsed = 0.0
+    for bar in range(n_bars):
+        if not warm:
+            optimizer = PortfolioOptimizer(method)
+        frame = returns.iloc[bar:bar + window]
+        start = time.perf_counter()
+        optimizer.rebalance(frame, expected)
+        elapsed += time.perf_counter() - start
+    return elapsed / n_bars
+
+
+def run(asset_counts=(50, 100, 250, 500), methods=ALLOCATION_METHODS,
+        window: int = 63, n_bars: int = 50, seed: int = 0) -> dict:
+    results = {}
+    print(f"{'assets':>6}  {'method':<18} {'cold ms':>9} {'warm ms':>9} {'speedup':>8}")
+    for n_assets in asset_counts:
+        returns = make_returns(window + n_bars, n_assets, seed)
+        for method in methods:
+            cold = time_rebalances(method, returns, window, n_bars, warm=False)
+            warm = time_rebalances(method, returns, window, n_bars, warm=True)
+            results[(n_assets, method)] = {"cold_seconds": cold, "warm_seconds": warm}
+            print(f"{n_assets:>6}  {method:<18} {cold * 1e3:9.2f} {warm * 1e3:9.2f} {cold / warm:7.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--assets", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--methods", nargs="+", default=list(ALLOCATION_METHODS), choices=ALLOCATION_METHODS)
+    parser.add_argument("--window", type=int, default=63)
+    parser.add_argument("--bars", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.assets, args.methods, args.window, args.bars, args.seed)
@@ -0,0 +1,101 @@
+"""
+Benchmark streaming LSTM sequence batches against stacking every lookback window.
+
+The stacked baseline copies each (lookback x feature) window into one
+(sample x lookback x feature) array before training, so its memory grows
+with the lookback; SequenceDataset serves shuffled mini-batches gathered
+from strided views of the single feature array. Memory is the traced peak
+of one epoch, on top of the feature tensor itself.
+
+Usage:
+    python benchmarks/bench_sequences.py --bars 2000 --symbols 20 --lookback 30
+    python benchmarks/bench_sequences.py --symbols 100 --skip-stacked
+"""
+import sys
+import time
+import tracemalloc
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import INDICATOR_COLUMNS
+from data.feature_store import FeatureTensor
+from data.sequences import SequenceDataset
+
+
+def make_tensor(n_bars: int, n_symbols: int, seed: int = 0) -> FeatureTensor:
+    """Random-walk closes and standard normal features for every indicator column."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_bars, n_symbols)), axis=0))
+    targets = np.full((n_bars, n_symbols, 1), np.nan, dtype=np.float32)
+    targets[:-1, :, 0] = close[1:] / close[:-1] - 1
+    arrays = {
+        'features': rng.standard_normal((n_bars, n_symbols, len(INDICATOR_COLUMNS)), dtype=np.float32),
+        'targets': targets,
+        'close': close,
+        'volume': np.ones((n_bars, n_symbols)),
+        'present': np.ones((n_bars, n_symbols), dtype=bool)
+    }
+    arrays['valid'] = arrays['present'].copy()
+    dates = np.arange(n_bars).astype('datetime64[D]')
+    return FeatureTensor([f"SYM{i}-USD" for i in range(n_symbols)], dates, INDICATOR_COLUMNS, [1], arrays)
+
+
+def stacked_epoch(dataset: SequenceDataset, batch_size: int, seed: int) -> int:
+    """Previous approach: materialise every window, then slice shuffled batches."""
+    starts, symbols = dataset.samples('train')
+    X = np.stack([dataset.features[s:s + dataset.lookback, j] for s, j in zip(starts, symbols)])
+    X = (X - dataset.mean) / dataset.std
+    y = dataset.targets[starts + dataset.lookback - 1, symbols]
+    order = np.random.default_rng(seed).permutation(len(X))
+    seen = 0
+    for i in range(0, len(order), batch_size):
+        chunk = order[i:i + batch_size]
+        batch = X[chunk], y[chunk]
+        seen += len(batch[1])
+    return seen
+
+
+def measure(func) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'seconds': elapsed, 'peak_mb': peak / 1e6}
+
+
+def run(n_bars: int = 2_000, n_symbols: int = 20, lookback: int = 30, batch_size: int = 32,
+        skip_stacked: bool = False, seed: int = 0) -> dict:
+    dataset = SequenceDataset(make_tensor(n_bars, n_symbols, seed), lookback=lookback)
+    n_samples = dataset.size('train')
+    print(f"{n_samples} training sequences of {lookback} x {dataset.n_features} "
+          f"({dataset.features.nbytes / 1e6:.0f} MB feature tensor)")
+
+    results = {'streamed': measure(lambda: sum(len(y) for _, y in dataset.batches('train', batch_size, seed=seed)))}
+    if not skip_stacked:
+        results['stacked'] = measure(lambda: stacked_epoch(dataset, batch_size, seed))
+
+    for name, stats in results.items():
+        print(f"  {name:<9} {stats['seconds']:7.2f} s/epoch   peak {stats['peak_mb']:8.1f} MB")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2_000)
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--lookback", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--skip-stacked", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    run(args.bars, args.symbols, args.lookback, args.batch_size, args.skip_stacked, args.seed)
@@ -0,0 +1,71 @@
+"""
+Benchmark per-bar streaming indicator updates against recomputing with ta.
+
+Usage:
+    python benchmarks/bench_streaming_indicators.py --history 2000 --bars 200
+"""
+import sys
+import time
+import argparse
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.streaming_indicators import StreamingIndicators
+
+
+def make_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Random-walk OHLCV bars."""
+    rng = np.random.default_rng(seed)
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    spread = np.abs(rng.normal(0, 0.01, (2, n_bars)))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * (1 + spread[0]),
+        'low': close * (1 - spread[1]),
+        'close': close,
+        'volume': rng.uniform(1e3, 1e4, n_bars)
+    })
+
+
+def run(n_history: int = 2_000, n_bars: int = 200, n_recompute: int = 3) -> dict:
+    import ta
+
+    bars = make_bars(n_history + n_bars)
+    indicators = StreamingIndicators()
+    indicators.run(bars.iloc[:n_history])
+
+    live = bars.iloc[n_history:][['high', 'low', 'close', 'volume']].to_numpy()
+    start = time.perf_counter()
+    for bar in live:
+        indicators.update(*bar)
+    streaming = (time.perf_counter() - start) / n_bars
+
+    # The batch path recomputes every indicator over the full history per bar
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for _ in range(n_recompute):
+            ta.add_all_ta_features(bars.copy(), 'open', 'high', 'low', 'close', 'volume')
+    batch = (time.perf_counter() - start) / n_recompute
+
+    print(f"history {n_history} bars: streaming update {streaming * 1e6:.1f}us/bar, "
+          f"ta recompute {batch * 1e3:.1f}ms/bar ({batch / streaming:.0f}x)")
+    return {"streaming_seconds": streaming, "batch_seconds": batch}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--history", type=int, default=2_000)
+    parser.add_argument("--bars", type=int, default=200)
+    parser.add_argument("--recompute", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.history, args.bars, args.recompute)
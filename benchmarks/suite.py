@@ -0,0 +1,243 @@
+"""
+Run the hot-path benchmarks on synthetic data and check them against a baseline.
+
+Every case runs on one deterministic data set from ``benchmarks.synthetic``;
+MongoDB reads go through an in-process mongomock client, so no server is
+needed. A case's time is the best of ``--repeats`` runs after a warm-up
+call. Cases slower than ``baseline * (1 + tolerance)`` are reported as
+regressions and make the script exit with status 1. Baselines are machine
+specific: record them with ``--update-baseline`` on the machine that runs
+the comparison.
+
+Usage:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --update-baseline
+    python benchmarks/suite.py --only get_dataframe trading_metrics --tolerance 0.5
+    python benchmarks/suite.py --symbols 50 --bars 5000 --baseline large.json --update-baseline
+"""
+import sys
+import json
+import time
+import platform
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from unittest import mock
+
+import mongomock
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks.synthetic import generate_market_data
+from config.settings import MARKET_DATA_COLLECTION
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDBManager
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+# Allowed slowdown over the baseline before a case counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+# Case name -> function building the timed callable from the shared context
+CASES: Dict[str, Callable[[Dict], Callable]] = {}
+
+
+def case(name: str):
+    def register(build: Callable[[Dict], Callable]):
+        CASES[name] = build
+        return build
+    return register
+
+
+def build_context(n_symbols: int, n_bars: int, seed: int = 0) -> Dict:
+    """Synthetic data set, a mongomock-backed manager holding it, and derived arrays."""
+    data = generate_market_data(n_symbols, n_bars, seed)
+    with mock.patch.object(mongodb_utils, "MongoClient", mongomock.MongoClient), \
+            mock.patch.object(mongodb_utils, "_clients", {}):
+        manager = MongoDBManager("mongodb://localhost:27017/", "benchmark_db")
+    manager.db[MARKET_DATA_COLLECTION].insert_many(data.to_dict('records'))
+
+    symbols = list(data['symbol'].unique())
+    frame = data[data['symbol'] == symbols[0]].reset_index(drop=True)
+    returns = data.pivot(index='date', columns='symbol', values='close').pct_change().iloc[1:].to_numpy()
+    rng = np.random.default_rng(seed)
+    predictions = returns + rng.normal(0, returns.std(), returns.shape)
+    return {'data': data, 'manager': manager, 'symbols': symbols, 'frame': frame,
+            'returns': returns, 'predictions': predictions}
+
+
+@case("get_dataframe")
+def _get_dataframe(context: Dict) -> Callable:
+    manager, symbols = context['manager'], context['symbols']
+    return lambda: [manager.get_dataframe(MARKET_DATA_COLLECTION, query={'symbol': symbol}, sort_by=[('date', 1)])
+                    for symbol in symbols]
+
+
+@case("indicator_report")
+def _indicator_report(context: Dict) -> Callable:
+    from analysis.indicator_analysis import IndicatorAnalyzer
+
+    return lambda: IndicatorAnalyzer(context['frame']).generate_analysis_report()
+
+
+@case("predictive_power")
+def _predictive_power(context: Dict) -> Callable:
+    from tests.analyze_indicators import analyze_predictive_power_enhanced
+
+    frames = [group for _, group in context['data'].groupby('symbol', sort=False)]
+    return lambda: [analyze_predictive_power_enhanced(frame) for frame in frames]
+
+
+@case("trading_metrics")
+def _trading_metrics(context: Dict) -> Callable:
+    from utils.metrics import calculate_trading_metrics
+
+    returns = context['returns'].T
+    return lambda: [calculate_trading_metrics(series) for series in returns]
+
+
+@case("rolling_metrics")
+def _rolling_metrics(context: Dict) -> Callable:
+    from utils.metrics import calculate_rolling_metrics
+
+    returns = context['returns'].T
+    window = max(len(returns[0]) // 4, 2)
+    return lambda: [calculate_rolling_metrics(series, window) for series in returns]
+
+
+@case("model_evaluation")
+def _model_evaluation(context: Dict) -> Callable:
+    from analysis.model_evaluation import calculate_trading_metrics, evaluate_predictions
+
+    pairs = list(zip(context['predictions'].T, context['returns'].T))
+    return lambda: [(evaluate_predictions(actual, predicted), calculate_trading_metrics(predicted, actual))
+                    for predicted, actual in pairs]
+
+
+def time_case(func: Callable, repeats: int) -> Dict[str, float]:
+    """Best and median wall time of ``repeats`` calls after a warm-up call."""
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'seconds': min(timings), 'median_seconds': float(np.median(timings))}
+
+
+def run(n_symbols: int = 10, n_bars: int = 2000, seed: int = 0, repeats: int = 5,
+        only: Optional[List[str]] = None) -> Dict:
+    """
+    Time the selected cases on one synthetic data set.
+
+    Returns:
+        Dictionary with the data set ``config``, the ``environment`` and
+        per-case ``results``, in the layout of the baseline file
+    """
+    names = list(only or CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown benchmark cases {sorted(unknown)}; choose from {list(CASES)}")
+
+    start = time.perf_counter()
+    context = build_context(n_symbols, n_bars, seed)
+    print(f"{n_symbols} symbols x {n_bars} bars generated in {time.perf_counter() - start:.1f} s")
+
+    results = {}
+    for name in names:
+        results[name] = time_case(CASES[name](context), repeats)
+        print(f"  {name:<18} {results[name]['seconds']:8.4f} s")
+
+    return {
+        'config': {'symbols': n_symbols, 'bars': n_bars, 'seed': seed},
+        'environment': {
+            'recorded': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Dict]:
+    """
+    Compare a run with a baseline, case by case.
+
+    Args:
+        current: Output of ``run``
+        baseline: Output of ``run`` stored earlier
+        tolerance: Allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        Dictionary mapping each case present in both to its baseline and
+        current seconds, their ratio and a ``status`` of ``regression``,
+        ``improvement`` or ``ok``
+    """
+    if current['config'] != baseline['config']:
+        raise ValueError(f"Baseline was recorded with {baseline['config']}, this run used {current['config']}")
+
+    comparison = {}
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        reference = baseline['results'][name]['seconds']
+        ratio = result['seconds'] / reference
+        if ratio > 1 + tolerance:
+            status = 'regression'
+        elif ratio < 1 / (1 + tolerance):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        comparison[name] = {'baseline': reference, 'current': result['seconds'], 'ratio': ratio, 'status': status}
+    return comparison
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write this run's timings to the baseline file instead of comparing")
+    args = parser.parse_args(argv)
+
+    current = run(args.symbols, args.bars, args.seed, args.repeats, args.only)
+
+    if args.update_baseline:
+        # Keep the cases this run skipped
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() and args.only else None
+        if stored is not None and stored['config'] == current['config']:
+            current['results'] = {**stored['results'], **current['results']}
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        return 0
+
+    comparison = compare(current, json.loads(args.baseline.read_text()), args.tolerance)
+    print(f"Against {args.baseline} (tolerance {args.tolerance:.0%}):")
+    for name, row in comparison.items():
+        print(f"  {name:<18} {row['baseline']:8.4f} s -> {row['current']:8.4f} s  "
+              f"{row['ratio']:5.2f}x  {row['status']}")
+    regressions = [name for name, row in comparison.items() if row['status'] == 'regression']
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
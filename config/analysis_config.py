@@ -29,9 +29,28 @@ FEATURE_GROUPS = {
     ]
 }
 
+# Flat indicator column order used by array-backed data structures
+INDICATOR_COLUMNS = [column for group in FEATURE_GROUPS.values() for column in group]
+
+# Indicator Windows (defaults of ta.add_all_ta_features, used to build FEATURE_GROUPS)
+INDICATOR_PARAMS = {
+    "sma_fast": 12, "sma_slow": 26,
+    "ema_fast": 12, "ema_slow": 26,
+    "adx": 14, "vortex": 14, "trix": 15,
+    "rsi": 14, "stoch_rsi": 14,
+    "tsi_slow": 25, "tsi_fast": 13,
+    "uo": [7, 14, 28], "uo_weights": [4.0, 2.0, 1.0],
+    "stoch": 14, "stoch_signal": 3,
+    "wr": 14, "ao_fast": 5, "ao_slow": 34,
+    "bollinger": 20, "bollinger_dev": 2,
+    "keltner": 10, "donchian": 20,
+    "eom": 14, "vwap": 14, "fi": 13, "mfi": 14
+}
+
 # Model Configuration
 MODEL_CONFIGS = {
     "lstm": {
+        "lookback": 30,
         "layers": [64, 32],
         "dropout": 0.2,
         "recurrent_dropout": 0.2,
@@ -8,10 +8,25 @@ load_dotenv()
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Local on-disk cache of market data pulled from MongoDB
+MARKET_DATA_CACHE_DIR = Path(os.getenv('MARKET_DATA_CACHE_DIR', BASE_DIR / 'cache' / 'market_data'))
+
+# Versioned memory-mapped feature tensors built from the market data
+FEATURE_STORE_DIR = Path(os.getenv('FEATURE_STORE_DIR', BASE_DIR / 'cache' / 'features'))
+
 # MongoDB settings
 MONGODB_LOCAL_URI = os.getenv('MONGODB_LOCAL_URI', 'mongodb://localhost:27017')
 MONGODB_ATLAS_URI = os.getenv('MONGODB_ATLAS_URI')
 MONGODB_DATABASE = os.getenv('MONGODB_DATABASE', 'crypto_trading')
+MARKET_DATA_COLLECTION = os.getenv('MARKET_DATA_COLLECTION', 'crypto_time_series_with_technical_indicators')
+
+# Collections stored as per-symbol monthly buckets (comma separated); reads and
+# writes of these names go to the "<name>_monthly" bucket collection instead
+BUCKETED_COLLECTIONS = frozenset(name for name in os.getenv('BUCKETED_COLLECTIONS', '').split(',') if name)
+
+# Local HTTP endpoint serving monitoring metrics for scraping
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
 
 # Data settings
 DATA_START_DATE = '2023-01-07'
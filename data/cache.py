@@ -0,0 +1,279 @@
+import json
+import os
+import re
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import BUCKETED_COLLECTIONS, MARKET_DATA_CACHE_DIR
+from data.database.buckets import read_collection
+from utils.mongodb_utils import cursor_to_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so stale caches are rebuilt
+CACHE_FORMAT_VERSION = 2
+
+# Array kind recorded for columns that are not cached
+SKIPPED_KIND = 'O'
+
+
+class MarketDataCache:
+    """
+    Per-symbol on-disk columnar cache of a MongoDB market data collection.
+
+    Every symbol lives in its own directory holding one ``.npy`` file per
+    column, split into append-only partitions, plus a ``meta.json`` with the
+    column schema and the last cached ``date`` (the watermark). Loading a
+    symbol first fetches only documents newer than the watermark and writes
+    them as a new partition, then memory-maps the partitions from disk.
+
+    The cache is rebuilt from scratch when the set of columns stored in
+    MongoDB changes (e.g. indicators are added or removed), when a column's
+    type changes between fetches or when a different column selection is
+    requested. Rewrites of already cached rows are not detected; call
+    ``invalidate`` after recomputing history.
+
+    String columns are stored as fixed-width unicode arrays; columns holding
+    other Python objects (``_id``, nested documents) are not cached. A
+    column that is entirely null in a fetch (e.g. an indicator during its
+    warm-up) takes the type already cached for it, or float NaN in the
+    first partition.
+
+    Collections named in ``bucketed_collections`` are read from their
+    monthly buckets.
+    """
+
+    def __init__(self, db, collection: str,
+                 cache_dir: Path = MARKET_DATA_CACHE_DIR,
+                 date_field: str = 'date',
+                 max_partitions: int = 16,
+                 bucketed_collections: Iterable[str] = BUCKETED_COLLECTIONS):
+        self.db = db
+        self.collection = collection
+        self.source = read_collection(db, collection, bucketed_collections)
+        self.cache_dir = Path(cache_dir) / collection
+        self.date_field = date_field
+        self.max_partitions = max_partitions
+
+    def load(self, symbol: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Return all cached rows for ``symbol`` after an incremental refresh.
+
+        Args:
+            symbol: Symbol to load
+            columns: Optional list of fields to cache; defaults to all fields
+
+        Returns:
+            DataFrame sorted by date
+        """
+        self.refresh(symbol, columns)
+        arrays = self.load_arrays(symbol)
+        frame = pd.DataFrame(arrays)
+        for column in self._read_meta(symbol).get('string_columns', []):
+            if column in frame:
+                frame[column] = frame[column].where(frame[column] != '', None)
+        return frame
+
+    def load_arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Memory-map the cached columns of ``symbol`` without refreshing."""
+        meta = self._read_meta(symbol)
+        if not meta:
+            return {}
+
+        symbol_dir = self._symbol_dir(symbol)
+        arrays = {}
+        for column in meta['columns']:
+            parts = [
+                np.load(symbol_dir / part / f"{_file_name(column)}.npy", mmap_mode='r')
+                for part in meta['partitions']
+            ]
+            arrays[column] = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return arrays
+
+    def refresh(self, symbol: str, columns: Optional[List[str]] = None) -> int:
+        """
+        Fetch rows newer than the cached watermark and append them.
+
+        Returns:
+            Number of rows added to the cache
+        """
+        meta = self._read_meta(symbol)
+        requested = sorted(columns) if columns else None
+        if meta and (meta.get('version') != CACHE_FORMAT_VERSION
+                     or meta.get('requested') != requested):
+            logger.info(f"Cache settings changed for {symbol}, rebuilding")
+            self.invalidate(symbol)
+            meta = {}
+
+        query = {'symbol': symbol}
+        if meta.get('watermark') is not None:
+            query[self.date_field] = {'$gt': _decode_watermark(meta)}
+
+        projection = {'_id': 0}
+        if columns:
+            projection = dict.fromkeys(set(columns) | {self.date_field}, 1)
+            projection['_id'] = 0
+
+        cursor = self.source.find(query, projection).sort(
+            [(self.date_field, 1)]
+        )
+        new_rows = cursor_to_dataframe(cursor)
+        arrays, kinds = _to_arrays(new_rows, meta.get('kinds', {}))
+
+        if meta and self._schema_changed(symbol, meta, new_rows, kinds, projection):
+            logger.info(f"Columns changed for {symbol}, rebuilding cache")
+            self.invalidate(symbol)
+            return self.refresh(symbol, columns)
+
+        if new_rows.empty:
+            return 0
+
+        self._append(symbol, meta, arrays, kinds, len(new_rows), requested)
+        logger.debug(f"Cached {len(new_rows)} new rows for {symbol}")
+        return len(new_rows)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop the cache for ``symbol``, or for the whole collection."""
+        target = self._symbol_dir(symbol) if symbol else self.cache_dir
+        shutil.rmtree(target, ignore_errors=True)
+
+    def watermark(self, symbol: str):
+        """Return the last cached date for ``symbol``, or None."""
+        meta = self._read_meta(symbol)
+        return _decode_watermark(meta) if meta.get('watermark') is not None else None
+
+    def _schema_changed(self, symbol: str, meta: Dict, new_rows: pd.DataFrame,
+                        kinds: Dict[str, str], projection: Dict) -> bool:
+        if not new_rows.empty:
+            # Partitions are concatenated column by column, so their types must agree too
+            return kinds != meta['kinds']
+
+        # No new rows: probe the latest document to catch backfilled indicators
+        latest = self.source.find_one(
+            {'symbol': symbol}, projection, sort=[(self.date_field, -1)]
+        )
+        return latest is not None and set(latest) != set(meta['kinds'])
+
+    def _append(self, symbol: str, meta: Dict, arrays: Dict[str, np.ndarray],
+                kinds: Dict[str, str], n_rows: int, requested: Optional[List[str]]):
+        symbol_dir = self._symbol_dir(symbol)
+        next_partition = meta.get('next_partition', 0)
+        part = f"part-{next_partition:05d}"
+
+        _write_partition(symbol_dir, part, arrays)
+        partitions = meta.get('partitions', []) + [part]
+
+        dates = arrays.get(self.date_field)
+        meta = {
+            'version': CACHE_FORMAT_VERSION,
+            'symbol': symbol,
+            'collection': self.collection,
+            'requested': requested,
+            'columns': list(arrays),
+            'kinds': kinds,
+            'string_columns': [column for column, kind in kinds.items() if kind == 'U'],
+            'skipped_columns': [column for column, kind in kinds.items() if kind == SKIPPED_KIND],
+            'partitions': partitions,
+            'next_partition': next_partition + 1,
+            'rows': meta.get('rows', 0) + n_rows,
+            **_encode_watermark(dates[-1] if dates is not None and len(dates) else None)
+        }
+        self._write_meta(symbol, meta)
+
+        if len(partitions) > self.max_partitions:
+            self._compact(symbol, meta)
+
+    def _compact(self, symbol: str, meta: Dict):
+        """Merge all partitions of ``symbol`` into one."""
+        arrays = {column: np.asarray(values) for column, values in self.load_arrays(symbol).items()}
+        symbol_dir = self._symbol_dir(symbol)
+        part = f"part-{meta['next_partition']:05d}"
+        _write_partition(symbol_dir, part, arrays)
+
+        old_partitions = meta['partitions']
+        self._write_meta(symbol, {
+            **meta, 'partitions': [part], 'next_partition': meta['next_partition'] + 1
+        })
+        for old in old_partitions:
+            shutil.rmtree(symbol_dir / old, ignore_errors=True)
+
+    def _symbol_dir(self, symbol: str) -> Path:
+        return self.cache_dir / _file_name(symbol)
+
+    def _read_meta(self, symbol: str) -> Dict:
+        path = self._symbol_dir(symbol) / 'meta.json'
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_meta(self, symbol: str, meta: Dict):
+        path = self._symbol_dir(symbol) / 'meta.json'
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _file_name(name: str) -> str:
+    """Make a symbol or column name safe to use as a file name."""
+    return re.sub(r'[^A-Za-z0-9._-]', '_', name)
+
+
+def _to_arrays(rows: pd.DataFrame, cached_kinds: Dict[str, str]):
+    """
+    Convert a frame to mmap-friendly arrays, returning (arrays, kind of every column).
+
+    All-null columns take their kind from ``cached_kinds`` (empty strings or
+    NaN), integers are widened to cached floats; skipped columns get kind
+    ``SKIPPED_KIND``.
+    """
+    arrays, kinds = {}, {}
+    for column in rows.columns:
+        series = rows[column]
+        values = series.to_numpy()
+        cached = cached_kinds.get(column)
+        inferred = pd.api.types.infer_dtype(series, skipna=True) if values.dtype == object else None
+        if inferred == 'empty':
+            values = np.full(len(series), '') if cached == 'U' else np.full(len(series), np.nan)
+        elif inferred == 'string':
+            values = np.asarray(series.fillna(''), dtype=str)
+        elif inferred is not None:
+            kinds[column] = SKIPPED_KIND
+            continue
+        elif cached == 'f' and values.dtype.kind in 'iub':
+            values = values.astype(np.float64)
+        arrays[column] = values
+        kinds[column] = values.dtype.kind
+    return arrays, kinds
+
+
+def _write_partition(symbol_dir: Path, part: str, arrays: Dict[str, np.ndarray]):
+    """Write one partition atomically by renaming a completed temp directory."""
+    tmp_dir = symbol_dir / f".{part}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    for column, values in arrays.items():
+        np.save(tmp_dir / f"{_file_name(column)}.npy", values, allow_pickle=False)
+    os.replace(tmp_dir, symbol_dir / part)
+
+
+def _encode_watermark(value) -> Dict:
+    if value is None:
+        return {'watermark': None, 'watermark_kind': None}
+    if isinstance(value, np.datetime64):
+        return {'watermark': str(value), 'watermark_kind': 'datetime'}
+    if isinstance(value, (np.integer, np.floating)):
+        return {'watermark': value.item(), 'watermark_kind': 'number'}
+    return {'watermark': str(value), 'watermark_kind': 'string'}
+
+
+def _decode_watermark(meta: Dict):
+    if meta['watermark_kind'] == 'datetime':
+        return pd.Timestamp(meta['watermark']).to_pydatetime()
+    return meta['watermark']
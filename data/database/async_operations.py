@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+from pymongo import AsyncMongoClient
+
+from config.settings import MONGODB_LOCAL_URI, MONGODB_DATABASE
+from utils.mongodb_utils import DEFAULT_BATCH_SIZE, ColumnarFrameBuilder
+
+logger = logging.getLogger(__name__)
+
+# Symbol queries allowed in flight at once per manager
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Async clients are bound to the event loop that first uses them, so the
+# shared pool is kept per loop and dropped with it
+_async_clients = weakref.WeakKeyDictionary()
+_async_clients_pid = os.getpid()
+_async_clients_lock = threading.Lock()
+
+
+def get_async_client(uri: str) -> AsyncMongoClient:
+    """
+    Return the shared ``AsyncMongoClient`` for ``uri`` on the running event loop.
+
+    Every manager on the same loop shares one client and its connection
+    pool. Must be called from a coroutine.
+    """
+    global _async_clients_pid
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        if _async_clients_pid != os.getpid():
+            _async_clients.clear()
+            _async_clients_pid = os.getpid()
+        clients = _async_clients.setdefault(loop, {})
+        if uri not in clients:
+            clients[uri] = AsyncMongoClient(uri)
+        return clients[uri]
+
+
+async def close_async_clients():
+    """Close the shared clients of the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        await client.close()
+
+
+class AsyncDatabaseManager:
+    """
+    Asyncio counterpart of ``DatabaseManager`` for concurrent reads.
+
+    All managers on an event loop share one pooled ``AsyncMongoClient`` per
+    URI. Fetching many symbols runs their queries concurrently, at most
+    ``max_concurrency`` at a time, so loading a universe takes roughly as
+    long as its slowest query rather than the sum of all of them.
+    """
+
+    def __init__(self, uri: str = MONGODB_LOCAL_URI, db_name: str = MONGODB_DATABASE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, client=None):
+        self.uri = uri
+        self.db_name = db_name
+        self.max_concurrency = max_concurrency
+        self._client = client
+        self._semaphore = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_async_client(self.uri)
+        return self._client
+
+    @property
+    def db(self):
+        return self.client[self.db_name]
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def get_market_data(self,
+                              collection: str,
+                              symbol: Optional[str] = None,
+                              start_date: Optional[datetime] = None,
+                              end_date: Optional[datetime] = None,
+                              limit: Optional[int] = None) -> List[Dict]:
+        """Retrieve market data with optional filters, like ``DatabaseManager.get_market_data``."""
+        cursor = self.db[collection].find(_market_data_query(symbol, start_date, end_date))
+        if limit:
+            cursor = cursor.limit(limit)
+        async with self.semaphore:
+            return await cursor.to_list()
+
+    async def get_dataframe(self, collection: str, query: Dict = None,
+                            projection: Dict = None, sort_by: List = None,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+        """
+        Retrieve data as a DataFrame, like ``MongoDBManager.get_dataframe``.
+
+        Documents are awaited in ``batch_size`` batches and written straight
+        into typed column buffers.
+        """
+        cursor = self.db[collection].find(query or {}, projection)
+        if sort_by:
+            cursor = cursor.sort(sort_by)
+
+        builder = ColumnarFrameBuilder(batch_size)
+        async with self.semaphore:
+            while True:
+                batch = await cursor.to_list(batch_size)
+                if not batch:
+                    break
+                builder.append(batch)
+                del batch
+        return builder.to_dataframe()
+
+    async def get_symbols_dataframes(self, collection: str, symbols: Iterable[str],
+                                     start_date: Optional[datetime] = None,
+                                     end_date: Optional[datetime] = None,
+                                     projection: Dict = None,
+                                     sort_by: List = None,
+                                     batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch one DataFrame per symbol concurrently.
+
+        Args:
+            collection: Collection name
+            symbols: Symbols to load
+            start_date: Optional inclusive lower bound on ``date``
+            end_date: Optional inclusive upper bound on ``date``
+            projection: Fields to include or exclude
+            sort_by: List of (field, direction) pairs; defaults to date ascending
+            batch_size: Documents awaited per cursor batch
+
+        Returns:
+            Dictionary of symbol to DataFrame, in the order of ``symbols``
+        """
+        symbols = list(symbols)
+        sort_by = sort_by or [('date', 1)]
+        frames = await asyncio.gather(*(
+            self.get_dataframe(collection, _market_data_query(symbol, start_date, end_date),
+                               projection, sort_by, batch_size)
+            for symbol in symbols
+        ))
+        logger.debug(f"Loaded {len(symbols)} symbols from {collection}")
+        return dict(zip(symbols, frames))
+
+
+def load_symbols_dataframes(collection: str, symbols: Iterable[str],
+                            uri: str = MONGODB_LOCAL_URI, db_name: str = MONGODB_DATABASE,
+                            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                            **kwargs) -> Dict[str, pd.DataFrame]:
+    """
+    Synchronous entry point that loads many symbols concurrently.
+
+    Runs ``AsyncDatabaseManager.get_symbols_dataframes`` on a new event loop,
+    for scripts that are not otherwise asynchronous.
+    """
+    async def load():
+        manager = AsyncDatabaseManager(uri, db_name, max_concurrency)
+        try:
+            return await manager.get_symbols_dataframes(collection, symbols, **kwargs)
+        finally:
+            await close_async_clients()
+
+    return asyncio.run(load())
+
+
+def _market_data_query(symbol: Optional[str], start_date: Optional[datetime],
+                       end_date: Optional[datetime]) -> Dict:
+    query = {}
+    if symbol:
+        query['symbol'] = symbol
+    if start_date or end_date:
+        query['date'] = {}
+        if start_date:
+            query['date']['$gte'] = start_date
+        if end_date:
+            query['date']['$lte'] = end_date
+    return query
@@ -0,0 +1,584 @@
+"""
+Monthly bucket layout for market data collections.
+
+Instead of one document per (symbol, date), a bucketed collection holds one
+document per symbol and calendar month with the bars stored column-wise::
+
+    {'_id': 'BTC-USD:2024-01', 'symbol': 'BTC-USD', 'month': datetime(2024, 1, 1),
+     'start': <first date>, 'end': <last date>, 'count': 31,
+     'date': [...], 'fields': {'close': [...], 'volume': [...], ...}}
+
+A year of daily bars is 12 documents instead of 365 and every field name is
+stored once per month rather than once per bar. Hourly bars make buckets of
+about 750 rows, far below the 16 MB document limit.
+
+``BucketedCollection`` exposes the read side of a pymongo collection
+(``find``, ``find_one``, ``distinct``) over the buckets and returns the
+same flat rows, so the ``DatabaseManager`` and ``MongoDBManager`` readers
+(``get_market_data``, ``get_dataframe``, ...) and ``MarketDataCache`` work
+unchanged for collections listed in ``BUCKETED_COLLECTIONS``. ``BucketWriter`` upserts rows into buckets and
+``migrate_to_buckets`` copies an existing collection.
+
+Usage:
+    python -m data.database.buckets --collection crypto_time_series_with_technical_indicators
+"""
+import argparse
+import logging
+import operator
+from datetime import datetime
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from config.settings import BUCKETED_COLLECTIONS, MONGODB_DATABASE, MONGODB_LOCAL_URI
+from data.database.ingestion import MAX_ERROR_DETAILS
+from data.database.models import MarketData, MarketDataBatch
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the collection holding the buckets of a logical collection
+BUCKET_SUFFIX = '_monthly'
+
+# Bucket documents replaced per bulk_write call
+DEFAULT_BUCKETS_PER_WRITE = 100
+
+# Source documents read per batch during a migration
+DEFAULT_MIGRATION_BATCH_SIZE = 5_000
+
+# Indexes of a bucket collection, as IndexModel keyword arguments
+BUCKET_INDEX_SPECS = [
+    # Per-symbol range loads in ascending date order
+    {'keys': [('symbol', ASCENDING), ('start', ASCENDING)], 'name': 'symbol_start'},
+    # Collection-wide range loads in ascending date order
+    {'keys': [('start', ASCENDING)], 'name': 'start'},
+    # Descending date order, e.g. the last bar of a symbol or collection
+    {'keys': [('symbol', ASCENDING), ('end', ASCENDING)], 'name': 'symbol_end'},
+    {'keys': [('end', ASCENDING)], 'name': 'end'}
+]
+
+# Rows unpacked into one frame per step when buckets are streamed without a limit
+FRAME_ROWS = 10_000
+
+# Row fields stored at the top level of a bucket rather than in ``fields``
+_ROW_KEYS = ('symbol', 'date')
+
+_RANGE_OPERATORS = {'$gt', '$gte', '$lt', '$lte'}
+
+_COMPARISONS = {
+    '$eq': operator.eq,
+    '$ne': operator.ne,
+    '$gt': operator.gt,
+    '$gte': operator.ge,
+    '$lt': operator.lt,
+    '$lte': operator.le
+}
+
+BucketInput = Union[pd.DataFrame, MarketDataBatch, Iterable[Union[MarketData, Dict]]]
+
+
+def bucket_collection_name(collection: str) -> str:
+    """Name of the collection holding the buckets of ``collection``."""
+    return f"{collection}{BUCKET_SUFFIX}"
+
+
+def read_collection(db, collection: str, bucketed_collections: Iterable[str] = BUCKETED_COLLECTIONS):
+    """
+    Collection to read ``collection`` from.
+
+    Returns a ``BucketedCollection`` over the bucket collection when
+    ``collection`` is bucketed, otherwise the plain pymongo collection.
+    """
+    if collection in bucketed_collections:
+        return BucketedCollection(db[bucket_collection_name(collection)])
+    return db[collection]
+
+
+def bucket_id(symbol: str, date: datetime) -> str:
+    """Identifier of the bucket holding ``symbol`` on ``date``."""
+    return f"{symbol}:{date.year:04d}-{date.month:02d}"
+
+
+class BucketWriter:
+    """
+    Upsert flat market data rows into monthly bucket documents.
+
+    Rows are grouped by bucket, merged into the stored bucket (a row with an
+    existing date updates that bar's fields, like a ``$set`` upsert) and the
+    buckets are written back with unordered ``ReplaceOne`` upserts, so
+    re-writing overlapping history is idempotent. Writes are not atomic
+    across concurrent writers of the same bucket.
+    """
+
+    def __init__(self, db, collection: str, batch_size: int = DEFAULT_BUCKETS_PER_WRITE):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.db = db
+        self.collection = collection
+        self.batch_size = batch_size
+
+    def write(self, data: BucketInput) -> Dict:
+        """
+        Upsert rows into their buckets.
+
+        Args:
+            data: DataFrame with one row per bar, a ``MarketDataBatch``, or an
+                iterable of ``MarketData`` objects or plain document dicts
+
+        Returns:
+            Dictionary with the number of ``rows`` and ``buckets`` written,
+            ``errors`` and up to ``MAX_ERROR_DETAILS`` ``error_details``
+
+        Raises:
+            ValueError: If ``data`` is a ``MarketDataBatch`` without float64 indicators
+        """
+        if isinstance(data, MarketDataBatch):
+            data.ensure_exact()
+        totals = {'rows': 0, 'buckets': 0, 'errors': 0, 'error_details': []}
+        groups: Dict[str, Dict[datetime, Dict]] = {}
+        for row in _iter_rows(data):
+            if row.get('symbol') is None or row.get('date') is None:
+                totals['errors'] += 1
+                if len(totals['error_details']) < MAX_ERROR_DETAILS:
+                    totals['error_details'].append({'errmsg': "missing symbol or date", 'document': row})
+                continue
+            groups.setdefault(bucket_id(row['symbol'], row['date']), {})[row['date']] = row
+            totals['rows'] += 1
+
+        ids = list(groups)
+        for start in range(0, len(ids), self.batch_size):
+            self._write_buckets({key: groups[key] for key in ids[start:start + self.batch_size]}, totals)
+
+        logger.info(f"Wrote {totals['rows']} rows into {totals['buckets']} buckets of {self.collection}")
+        return totals
+
+    def _write_buckets(self, groups: Dict[str, Dict[datetime, Dict]], totals: Dict):
+        collection = self.db[self.collection]
+        stored = {bucket['_id']: bucket for bucket in collection.find({'_id': {'$in': list(groups)}})}
+
+        operations = []
+        for key, rows in groups.items():
+            merged = _bucket_rows(stored[key]) if key in stored else {}
+            for date, row in rows.items():
+                merged.setdefault(date, {}).update(row)
+            operations.append(ReplaceOne({'_id': key}, _build_bucket(key, merged), upsert=True))
+
+        try:
+            collection.bulk_write(operations, ordered=False)
+            totals['buckets'] += len(operations)
+        except BulkWriteError as bwe:
+            write_errors = bwe.details.get('writeErrors', [])
+            logger.error(f"Bucket write finished with {len(write_errors)} errors")
+            totals['buckets'] += len(operations) - len(write_errors)
+            totals['errors'] += len(write_errors)
+            totals['error_details'].extend(write_errors[:max(MAX_ERROR_DETAILS - len(totals['error_details']), 0)])
+        except PyMongoError as e:
+            logger.error(f"Bucket write of {len(operations)} buckets failed: {e}")
+            totals['errors'] += len(operations)
+            if len(totals['error_details']) < MAX_ERROR_DETAILS:
+                totals['error_details'].append({'errmsg': str(e), 'count': len(operations)})
+
+
+class BucketedCollection:
+    """
+    Read-only view of a bucket collection as flat (symbol, date) rows.
+
+    Filters may use ``symbol`` and ``date`` (equality, ``$in`` and range
+    operators), which select buckets on the server, and any other row field
+    with the same operators, which is applied to the unpacked rows.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    @property
+    def name(self) -> str:
+        return self.collection.name
+
+    def find(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> 'BucketCursor':
+        return BucketCursor(self.collection, filter or {}, projection)
+
+    def find_one(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None,
+                 sort: Optional[List] = None) -> Optional[Dict]:
+        cursor = self.find(filter, projection).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        return next(iter(cursor), None)
+
+    def distinct(self, field: str, filter: Optional[Dict] = None) -> List:
+        """
+        Distinct values of a row field.
+
+        When the filter has no row-level conditions (or only ``date``
+        conditions on a ``date`` lookup) the server unwinds the bucket arrays
+        itself; otherwise the matching rows are streamed bucket by bucket.
+        """
+        bucket_query, row_filter = _split_filter(filter or {})
+        if not row_filter or (field == 'date' and set(row_filter) == {'date'}):
+            values = [value for value in self.collection.distinct(_bucket_path(field), bucket_query)
+                      if value is not None]
+            if row_filter:
+                # Boundary buckets also hold dates outside the requested range
+                keep = _filter_mask(pd.DataFrame({'date': values}), row_filter)
+                values = [value for value, kept in zip(values, keep) if kept]
+            return values
+
+        values = {}
+        for frame in self.find(filter, {field: 1}).iter_frames():
+            if field in frame:
+                values.update(dict.fromkeys(frame[field].dropna().unique().tolist()))
+        return list(values)
+
+
+class BucketCursor:
+    """
+    Cursor-like result of ``BucketedCollection.find``.
+
+    Supports ``sort``, ``limit`` and ``batch_size`` like a pymongo cursor.
+    Buckets are fetched and unpacked one at a time. A sort led by ``date``
+    orders the buckets on the server (by ``start`` ascending or ``end``
+    descending) and merges their rows as they arrive, and reading stops as
+    soon as ``limit`` rows are out, so first/last-row lookups only touch the
+    buckets at one end of the index. Other sorts collect every matching
+    bucket first.
+
+    Iterating yields row dicts; ``to_dataframe`` concatenates the
+    per-bucket frames and is what ``cursor_to_dataframe`` uses. Rows have
+    no ``_id`` and fields missing from a bar come back as NaN.
+    """
+
+    def __init__(self, collection, filter: Dict, projection: Optional[Dict] = None):
+        self.collection = collection
+        self.filter = filter
+        self.projection = {name: value for name, value in (projection or {}).items() if name != '_id'}
+        self._sort: List[Tuple[str, int]] = []
+        self._limit = 0
+        self._batch_size = 0
+
+    def sort(self, key_or_list, direction: int = ASCENDING) -> 'BucketCursor':
+        self._sort = [(key_or_list, direction)] if isinstance(key_or_list, str) else list(key_or_list)
+        return self
+
+    def limit(self, limit: int) -> 'BucketCursor':
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> 'BucketCursor':
+        self._batch_size = batch_size
+        return self
+
+    def __iter__(self) -> Iterator[Dict]:
+        for frame in self.iter_frames():
+            yield from frame.to_dict('records')
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Unpack the matching buckets into a DataFrame of rows."""
+        frames = list(self.iter_frames())
+        if not frames:
+            return pd.DataFrame()
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def iter_frames(self) -> Iterator[pd.DataFrame]:
+        """Yield the matching rows in order, one frame per group of buckets unpacked together."""
+        bucket_query, row_filter = _split_filter(self.filter)
+        cursor = self.collection.find(bucket_query, self._bucket_projection(row_filter))
+        cursor = cursor.sort(self._bucket_order())
+        bucket_limit = self._bucket_limit(bucket_query, row_filter)
+        if bucket_limit:
+            cursor = cursor.limit(bucket_limit)
+        if self._batch_size:
+            cursor = cursor.batch_size(self._batch_size)
+
+        remaining = self._limit
+        try:
+            for group in self._bucket_groups(cursor):
+                frame = _buckets_to_frame(group)
+                if row_filter:
+                    frame = frame[_filter_mask(frame, row_filter)]
+                if self._sort:
+                    frame = self._sort_rows(frame)
+                if self._limit:
+                    frame = frame.iloc[:remaining]
+                    remaining -= len(frame)
+                if len(frame):
+                    yield self._project(frame).reset_index(drop=True)
+                if self._limit and not remaining:
+                    return
+        finally:
+            cursor.close()
+
+    def _bucket_order(self) -> List[Tuple[str, int]]:
+        if self._sort and self._sort[0][0] == 'date':
+            return [('start', ASCENDING)] if self._sort[0][1] == ASCENDING else [('end', DESCENDING)]
+        return [('symbol', ASCENDING), ('start', ASCENDING)]
+
+    def _bucket_limit(self, bucket_query: Dict, row_filter: Dict) -> int:
+        """
+        Buckets that are sure to hold ``limit`` rows, or 0 when that is unknown.
+
+        A single symbol's buckets do not overlap, and any bucket overlapping
+        a date range has its first or last bar inside it unless the range
+        lies within that one bucket, so each bucket read adds a row. That
+        only holds the first rows when buckets come in row order, i.e.
+        without a sort or with a ``date``-led one.
+        """
+        date = row_filter.get('date')
+        if (not self._limit or not isinstance(bucket_query.get('symbol'), str)
+                or (self._sort and self._sort[0][0] != 'date')
+                or set(row_filter) - {'date'}
+                or (date is not None and not (_is_operator_dict(date) and set(date) <= _RANGE_OPERATORS))):
+            return 0
+        return self._limit
+
+    def _bucket_groups(self, buckets: Iterable[Dict]) -> Iterator[List[Dict]]:
+        """
+        Split buckets, in server order, into groups unpacked together.
+
+        A group closes once it holds ``limit`` rows (``FRAME_ROWS`` without a
+        limit) at a point where no later bucket can hold a row sorting
+        before its rows. Buckets arrive by start (by end when descending),
+        so with a ``date``-led sort that is where the next bucket starts
+        after the group's last bar; other sorts need every bucket at once.
+        """
+        if self._sort and self._sort[0][0] != 'date':
+            yield list(buckets)
+            return
+
+        ascending = not self._sort or self._sort[0][1] == ASCENDING
+        target = self._limit or FRAME_ROWS
+        group, rows, edge = [], 0, None
+        for bucket in buckets:
+            if group and rows >= target and (
+                    not self._sort or (bucket['start'] > edge if ascending else bucket['end'] < edge)):
+                yield group
+                group, rows, edge = [], 0, None
+            group.append(bucket)
+            rows += len(bucket['date'])
+            if self._sort:
+                bound = bucket['end'] if ascending else bucket['start']
+                edge = bound if edge is None else (max(edge, bound) if ascending else min(edge, bound))
+        if group:
+            yield group
+
+    def _sort_rows(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.sort_values([name for name, _ in self._sort],
+                                 ascending=[direction == ASCENDING for _, direction in self._sort],
+                                 kind='stable')
+
+    def _bucket_projection(self, row_filter: Dict) -> Optional[Dict]:
+        """Push the row projection down to ``fields.<name>`` of the buckets."""
+        if not self.projection:
+            return None
+        needed = set(row_filter) | {name for name, _ in self._sort}
+        if any(self.projection.values()):
+            names = set(name for name, value in self.projection.items() if value) | needed
+            projection = {'symbol': 1, 'date': 1, 'start': 1, 'end': 1, 'count': 1}
+            projection.update({f"fields.{name}": 1 for name in names if name not in _ROW_KEYS})
+            return projection
+        return {f"fields.{name}": 0 for name in self.projection if name not in needed and name not in _ROW_KEYS}
+
+    def _project(self, frame: pd.DataFrame) -> pd.DataFrame:
+        if not self.projection:
+            return frame
+        if any(self.projection.values()):
+            return frame[[name for name in self.projection if self.projection[name] and name in frame]]
+        return frame.drop(columns=[name for name in self.projection if name in frame])
+
+
+def _split_filter(filter: Dict) -> Tuple[Dict, Dict]:
+    """
+    Translate a row filter into a bucket query plus conditions on the rows.
+
+    ``symbol`` conditions carry over as they are. ``date`` conditions become
+    overlap tests on the bucket ``start``/``end`` and are also checked per
+    row. Everything else is checked per row only.
+    """
+    bucket_query, row_filter = {}, {}
+    for name, condition in filter.items():
+        if name.startswith('$'):
+            raise ValueError(f"Top-level operator {name} is not supported on bucketed collections")
+        if name == 'symbol':
+            bucket_query['symbol'] = condition
+        elif name == 'date':
+            bucket_query.update(_date_bounds(condition))
+            row_filter['date'] = condition
+        else:
+            row_filter[name] = condition
+    return bucket_query, row_filter
+
+
+def _date_bounds(condition) -> Dict:
+    if not _is_operator_dict(condition):
+        return {'start': {'$lte': condition}, 'end': {'$gte': condition}}
+
+    bounds = {}
+    for op, value in condition.items():
+        if op in ('$gt', '$gte'):
+            bounds.setdefault('end', {})[op] = value
+        elif op in ('$lt', '$lte'):
+            bounds.setdefault('start', {})[op] = value
+        elif op == '$eq':
+            bounds.update(_date_bounds(value))
+        elif op == '$in' and value:
+            bounds.setdefault('start', {})['$lte'] = max(value)
+            bounds.setdefault('end', {})['$gte'] = min(value)
+    return bounds
+
+
+def _filter_mask(frame: pd.DataFrame, row_filter: Dict) -> np.ndarray:
+    mask = np.ones(len(frame), dtype=bool)
+    for name, condition in row_filter.items():
+        if name not in frame:
+            # Like MongoDB: only $ne/$nin-style conditions match a missing field
+            mask &= _is_operator_dict(condition) and set(condition) <= {'$ne', '$nin'}
+            continue
+        values = frame[name]
+        conditions = condition.items() if _is_operator_dict(condition) else [('$eq', condition)]
+        for op, operand in conditions:
+            if op in _COMPARISONS:
+                mask &= _COMPARISONS[op](values, operand).to_numpy(dtype=bool)
+            elif op == '$in':
+                mask &= values.isin(list(operand)).to_numpy()
+            elif op == '$nin':
+                mask &= ~values.isin(list(operand)).to_numpy()
+            else:
+                raise ValueError(f"Operator {op} is not supported on bucketed collections")
+    return mask
+
+
+def _is_operator_dict(condition) -> bool:
+    return isinstance(condition, dict) and any(key.startswith('$') for key in condition)
+
+
+def _buckets_to_frame(buckets: List[Dict]) -> pd.DataFrame:
+    """Concatenate the column arrays of buckets into one frame."""
+    names = list(dict.fromkeys(chain.from_iterable(bucket.get('fields', {}) for bucket in buckets)))
+    columns = {
+        'symbol': np.repeat([bucket['symbol'] for bucket in buckets],
+                            [len(bucket['date']) for bucket in buckets]),
+        'date': list(chain.from_iterable(bucket['date'] for bucket in buckets))
+    }
+    for name in names:
+        values = list(chain.from_iterable(
+            bucket['fields'].get(name) or [None] * len(bucket['date']) for bucket in buckets
+        ))
+        # A field none of the bars has reads as NaN, like in groups where it is partly set
+        columns[name] = values if any(value is not None for value in values) else np.full(len(values), np.nan)
+    return pd.DataFrame(columns)
+
+
+def _bucket_path(name: str) -> str:
+    """Path of a row field inside a bucket document."""
+    return name if name in _ROW_KEYS else f"fields.{name}"
+
+
+def _bucket_rows(bucket: Dict) -> Dict[datetime, Dict]:
+    """Unpack a stored bucket into rows keyed by date."""
+    fields = bucket.get('fields', {})
+    rows = {}
+    for i, date in enumerate(bucket['date']):
+        row = {'symbol': bucket['symbol'], 'date': date}
+        row.update((name, values[i]) for name, values in fields.items() if values[i] is not None)
+        rows[date] = row
+    return rows
+
+
+def _build_bucket(key: str, rows: Dict[datetime, Dict]) -> Dict:
+    dates = sorted(rows)
+    first = rows[dates[0]]
+    names = list(dict.fromkeys(
+        name for row in rows.values() for name in row if name not in _ROW_KEYS and name != '_id'
+    ))
+    return {
+        '_id': key,
+        'symbol': first['symbol'],
+        'month': datetime(dates[0].year, dates[0].month, 1),
+        'start': dates[0],
+        'end': dates[-1],
+        'count': len(dates),
+        'date': dates,
+        'fields': {name: [rows[date].get(name) for date in dates] for name in names}
+    }
+
+
+def _iter_rows(data: BucketInput) -> Iterator[Dict]:
+    if isinstance(data, pd.DataFrame):
+        for start in range(0, len(data), DEFAULT_MIGRATION_BATCH_SIZE):
+            yield from data.iloc[start:start + DEFAULT_MIGRATION_BATCH_SIZE].to_dict('records')
+        return
+    if isinstance(data, MarketDataBatch):
+        yield from data.to_documents()
+        return
+    for item in data:
+        yield item.to_dict() if isinstance(item, MarketData) else item
+
+
+def migrate_to_buckets(db, collection: str, symbols: Optional[List[str]] = None,
+                       batch_size: int = DEFAULT_MIGRATION_BATCH_SIZE) -> Dict:
+    """
+    Copy a per-document collection into its bucket collection.
+
+    Symbols are copied one at a time in date order, ``batch_size`` source
+    documents per write, and the row count of each symbol is checked
+    against the source. The source collection is left untouched; add it to
+    ``BUCKETED_COLLECTIONS`` once the copy is verified to switch readers
+    over. Safe to re-run: buckets are replaced, not duplicated.
+
+    Args:
+        db: pymongo Database
+        collection: Source collection with one document per (symbol, date)
+        symbols: Symbols to copy; defaults to every symbol in the source
+        batch_size: Source documents read and written per batch
+
+    Returns:
+        Dictionary with the target ``collection``, ``symbols`` copied,
+        ``rows`` and ``buckets`` written, ``errors`` and the symbols whose
+        row counts do not match the source in ``mismatched``
+    """
+    target = bucket_collection_name(collection)
+    db[target].create_indexes([IndexModel(**spec) for spec in BUCKET_INDEX_SPECS])
+    writer = BucketWriter(db, target)
+    symbols = symbols if symbols is not None else sorted(db[collection].distinct('symbol'))
+
+    report = {'collection': target, 'symbols': 0, 'rows': 0, 'buckets': 0, 'errors': 0, 'mismatched': []}
+    for symbol in symbols:
+        cursor = db[collection].find({'symbol': symbol}, {'_id': 0}).sort([('date', ASCENDING)])
+        documents = iter(cursor.batch_size(batch_size))
+        rows = 0
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                break
+            result = writer.write(batch)
+            rows += result['rows']
+            report['buckets'] += result['buckets']
+            report['errors'] += result['errors']
+
+        stored = sum(bucket['count'] for bucket in db[target].find({'symbol': symbol}, {'count': 1}))
+        if stored != rows:
+            logger.error(f"{symbol}: {rows} source rows but {stored} rows in {target}")
+            report['mismatched'].append(symbol)
+        report['symbols'] += 1
+        report['rows'] += rows
+        logger.info(f"Migrated {rows} rows of {symbol} to {target}")
+
+    return report
+
+
+if __name__ == '__main__':
+    from utils.mongodb_utils import get_client
+
+    parser = argparse.ArgumentParser(description="Copy a market data collection into monthly buckets")
+    parser.add_argument('--collection', required=True)
+    parser.add_argument('--symbols', nargs='*')
+    parser.add_argument('--uri', default=MONGODB_LOCAL_URI)
+    parser.add_argument('--database', default=MONGODB_DATABASE)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_MIGRATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(migrate_to_buckets(get_client(args.uri)[args.database], args.collection,
+                             args.symbols, args.batch_size))
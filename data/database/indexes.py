@@ -0,0 +1,146 @@
+import logging
+from typing import Dict, Iterator, List, Optional
+
+from pymongo import ASCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from config.settings import MARKET_DATA_COLLECTION
+from utils.mongodb_utils import get_date_range
+
+logger = logging.getLogger(__name__)
+
+# Indexes every collection needs, declared as IndexModel keyword arguments
+INDEX_SPECS: Dict[str, List[Dict]] = {
+    MARKET_DATA_COLLECTION: [
+        # Per-symbol range loads and the ingestion upsert key
+        {'keys': [('symbol', ASCENDING), ('date', ASCENDING)], 'name': 'symbol_date', 'unique': True},
+        # Collection-wide first/last date lookups
+        {'keys': [('date', ASCENDING)], 'name': 'date'}
+    ]
+}
+
+
+def ensure_indexes(db, specs: Dict[str, List[Dict]] = INDEX_SPECS) -> Dict[str, Dict]:
+    """
+    Create any declared index that is missing; safe to call on every startup.
+
+    An existing index counts as present when it has the same key pattern and
+    uniqueness, whatever its name. Failures, such as duplicate keys blocking
+    a unique index, are logged and reported rather than raised.
+
+    Args:
+        db: pymongo Database
+        specs: Mapping of collection name to index declarations
+
+    Returns:
+        Per collection, the names of indexes ``created`` and already
+        ``existing``, and ``failed`` index names mapped to the error message
+    """
+    report = {}
+    for collection, declared in specs.items():
+        existing = db[collection].index_information()
+        present = {
+            (tuple((field, direction) for field, direction in info['key']), bool(info.get('unique')))
+            for info in existing.values()
+        }
+
+        created, found, failed = [], [], {}
+        for spec in declared:
+            signature = (tuple(spec['keys']), bool(spec.get('unique')))
+            if signature in present:
+                found.append(spec['name'])
+                continue
+            try:
+                db[collection].create_indexes([IndexModel(**spec)])
+                created.append(spec['name'])
+                logger.info(f"Created index {spec['name']} on {collection}")
+            except OperationFailure as e:
+                failed[spec['name']] = str(e)
+                logger.error(f"Could not create index {spec['name']} on {collection}: {e}")
+
+        report[collection] = {'created': created, 'existing': found, 'failed': failed}
+    return report
+
+
+def explain_query(collection, query: Dict, sort: Optional[List] = None,
+                  projection: Optional[Dict] = None, limit: int = 0) -> Dict:
+    """
+    Run ``explain()`` on a find query and summarise its winning plan.
+
+    Returns:
+        Dictionary with the plan ``stages``, the ``indexes`` used, whether it
+        contains a ``collscan``, and the keys and documents examined when
+        the server reports execution statistics
+    """
+    cursor = collection.find(query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    if limit:
+        cursor = cursor.limit(limit)
+    return summarize_plan(cursor.explain())
+
+
+def summarize_plan(explain: Dict) -> Dict:
+    """Summarise the winning plan of an ``explain`` result."""
+    winning_plan = explain.get('queryPlanner', {}).get('winningPlan', {})
+    stages = list(_plan_stages(winning_plan))
+    stats = explain.get('executionStats', {})
+    return {
+        'stages': [stage['stage'] for stage in stages],
+        'indexes': [stage['indexName'] for stage in stages if 'indexName' in stage],
+        'collscan': any(stage['stage'] == 'COLLSCAN' for stage in stages),
+        'keys_examined': stats.get('totalKeysExamined'),
+        'docs_examined': stats.get('totalDocsExamined')
+    }
+
+
+def _plan_stages(plan) -> Iterator[Dict]:
+    """Yield every stage of a plan tree, including sharded and SBE layouts."""
+    if isinstance(plan, list):
+        for item in plan:
+            yield from _plan_stages(item)
+        return
+    if not isinstance(plan, dict):
+        return
+    if 'stage' in plan:
+        yield plan
+    for child in ('inputStage', 'inputStages', 'queryPlan', 'shards', 'winningPlan'):
+        if child in plan:
+            yield from _plan_stages(plan[child])
+
+
+def check_query_plans(db, collection: str = MARKET_DATA_COLLECTION,
+                      symbol: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Explain the standard market data read paths and flag collection scans.
+
+    Checks a per-symbol date range load sorted by date, the first and last
+    date of one symbol, and the first and last date of the collection.
+
+    Args:
+        db: pymongo Database
+        collection: Market data collection
+        symbol: Symbol to query; defaults to the symbol of any document
+
+    Returns:
+        Plan summaries from ``summarize_plan`` keyed by query name
+    """
+    if symbol is None:
+        sample = db[collection].find_one({}, {'symbol': 1})
+        symbol = sample['symbol'] if sample else ''
+
+    start, end = get_date_range(db[collection], {'symbol': symbol})
+    queries = {
+        'symbol_date_range': ({'symbol': symbol, 'date': {'$gte': start, '$lte': end}}, [('date', 1)], 0),
+        'symbol_first_date': ({'symbol': symbol}, [('date', 1)], 1),
+        'symbol_last_date': ({'symbol': symbol}, [('date', -1)], 1),
+        'first_date': ({}, [('date', 1)], 1),
+        'last_date': ({}, [('date', -1)], 1)
+    }
+
+    reports = {}
+    for name, (query, sort, limit) in queries.items():
+        reports[name] = explain_query(db[collection], query, sort, {'date': 1}, limit)
+        if reports[name]['collscan']:
+            logger.warning(f"Query {name} on {collection} uses a COLLSCAN: {reports[name]['stages']}")
+    return reports
@@ -0,0 +1,172 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import pandas as pd
+from bson.errors import BSONError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from data.database.models import MarketData, MarketDataBatch
+
+logger = logging.getLogger(__name__)
+
+# Documents per bulk_write call
+DEFAULT_INGEST_BATCH_SIZE = 1_000
+
+# Bulk writes allowed in flight at once
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Fields identifying a market data document
+MARKET_DATA_KEY = ('symbol', 'date')
+
+# Write errors kept in the result; the error count is always exact
+MAX_ERROR_DETAILS = 100
+
+MarketDataInput = Union[pd.DataFrame, MarketDataBatch, Iterable[Union[MarketData, Dict]]]
+
+
+class MarketDataIngestor:
+    """
+    Bulk upsert pipeline for market data documents.
+
+    Documents are chunked into unordered ``bulk_write`` batches of
+    ``UpdateOne(upsert=True)`` operations keyed on (symbol, date), so
+    re-ingesting overlapping history updates rows in place instead of
+    duplicating them. Up to ``max_in_flight`` batches are written
+    concurrently from a thread pool; the input is consumed lazily, so
+    memory stays bounded by the batches in flight.
+    """
+
+    def __init__(self, db, collection: str,
+                 batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 key_fields: Sequence[str] = MARKET_DATA_KEY):
+        if batch_size < 1 or max_in_flight < 1:
+            raise ValueError("batch_size and max_in_flight must be positive")
+        self.db = db
+        self.collection = collection
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.key_fields = tuple(key_fields)
+
+    def ingest(self, data: MarketDataInput) -> Dict:
+        """
+        Upsert market data.
+
+        Args:
+            data: DataFrame with one row per document, a ``MarketDataBatch``,
+                or an iterable of ``MarketData`` objects or plain document dicts
+
+        Returns:
+            Dictionary with counts of documents ``inserted`` (new keys),
+            ``updated`` (existing keys matched), ``modified`` (matched and
+            changed) and ``errors``, plus the number of ``batches`` and up to
+            ``MAX_ERROR_DETAILS`` entries of ``error_details``
+
+        Raises:
+            ValueError: If ``data`` is a ``MarketDataBatch`` without float64 indicators
+        """
+        if isinstance(data, MarketDataBatch):
+            data.ensure_exact()
+        totals = {'inserted': 0, 'updated': 0, 'modified': 0, 'errors': 0,
+                  'batches': 0, 'error_details': []}
+        collection = self.db[self.collection]
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            pending = set()
+            for batch in self._iter_batches(data):
+                operations, invalid = self._build_operations(batch)
+                _merge(totals, {'errors': len(invalid), 'error_details': invalid})
+                if not operations:
+                    continue
+
+                if len(pending) >= self.max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _merge(totals, future.result())
+                pending.add(executor.submit(_write_batch, collection, operations))
+
+            for future in pending:
+                _merge(totals, future.result())
+
+        logger.info(
+            f"Ingested into {self.collection}: {totals['inserted']} inserted, "
+            f"{totals['updated']} updated, {totals['errors']} errors "
+            f"in {totals['batches']} batches"
+        )
+        return totals
+
+    def _iter_batches(self, data: MarketDataInput) -> Iterator[List[Dict]]:
+        if isinstance(data, pd.DataFrame):
+            for start in range(0, len(data), self.batch_size):
+                yield data.iloc[start:start + self.batch_size].to_dict('records')
+            return
+        if isinstance(data, MarketDataBatch):
+            for start in range(0, len(data), self.batch_size):
+                yield data[start:start + self.batch_size].to_documents()
+            return
+
+        documents = (item.to_dict() if isinstance(item, MarketData) else item for item in data)
+        while True:
+            batch = list(islice(documents, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _build_operations(self, documents: List[Dict]):
+        operations, invalid = [], []
+        for document in documents:
+            missing = [field for field in self.key_fields if document.get(field) is None]
+            if missing:
+                invalid.append({'errmsg': f"missing key fields {missing}", 'document': document})
+                continue
+            key = {field: document[field] for field in self.key_fields}
+            fields = {name: value for name, value in document.items() if name != '_id'}
+            operations.append((document, UpdateOne(key, {'$set': fields}, upsert=True)))
+        return operations, invalid
+
+
+def _write_batch(collection, operations: List[Tuple[Dict, UpdateOne]]) -> Dict:
+    """
+    Run one unordered bulk write of (document, operation) pairs and translate its outcome into counts.
+
+    A document the driver cannot encode fails the whole batch, so the batch
+    is then split in halves and retried until the offending documents are
+    isolated and reported; upserts are idempotent, so retrying is safe.
+    """
+    try:
+        result = collection.bulk_write([operation for _, operation in operations], ordered=False)
+        return {'inserted': result.upserted_count, 'updated': result.matched_count,
+                'modified': result.modified_count, 'batches': 1}
+    except BulkWriteError as bwe:
+        details = bwe.details
+        write_errors = details.get('writeErrors', [])
+        logger.error(f"Bulk write finished with {len(write_errors)} errors")
+        return {'inserted': details.get('nUpserted', 0), 'updated': details.get('nMatched', 0),
+                'modified': details.get('nModified', 0), 'errors': len(write_errors),
+                'batches': 1, 'error_details': write_errors}
+    except BSONError as e:
+        if len(operations) == 1:
+            return {'errors': 1, 'batches': 1,
+                    'error_details': [{'errmsg': str(e), 'document': operations[0][0]}]}
+        middle = len(operations) // 2
+        counts = {'inserted': 0, 'updated': 0, 'modified': 0, 'errors': 0, 'batches': 0, 'error_details': []}
+        for half in (operations[:middle], operations[middle:]):
+            _merge(counts, _write_batch(collection, half))
+        return {**counts, 'batches': 1}
+    except PyMongoError as e:
+        # Without an acknowledgement the outcome of every operation is unknown
+        logger.error(f"Bulk write of {len(operations)} operations failed: {e}")
+        return {'errors': len(operations), 'batches': 1,
+                'error_details': [{'errmsg': str(e), 'count': len(operations)}]}
+
+
+def _merge(totals: Dict, counts: Dict):
+    for name, value in counts.items():
+        if name == 'error_details':
+            room = MAX_ERROR_DETAILS - len(totals['error_details'])
+            totals['error_details'].extend(value[:max(room, 0)])
+        else:
+            totals[name] += value
@@ -1,6 +1,11 @@
 from datetime import datetime
 from typing import Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
+from config.analysis_config import INDICATOR_COLUMNS
+
 class MarketData:
     """Market data schema definition."""
     
@@ -39,4 +44,247 @@ class MarketData:
             volume=data['volume'],
             technical_indicators=data.get('technical_indicators', {}),
             metadata=data.get('metadata', {})
-        )
\ No newline at end of file
+        )
+
+class MarketDataBatch:
+    """
+    One symbol's market data held as contiguous NumPy arrays.
+
+    Dates, closes and volumes are 1-D arrays and the indicators a single
+    (rows x indicators) matrix in ``INDICATOR_COLUMNS`` order. Indicators
+    are float32 by default (about 7 significant digits, plenty for model
+    features), so a bar costs ~160 bytes instead of ~2 KB for a
+    ``MarketData`` object with its dicts; pass ``indicator_dtype=np.float64``
+    for exact round trips. The writers (``MarketDataIngestor``,
+    ``BucketWriter``) only accept float64 batches, so stored values are
+    never overwritten with rounded ones. Conversions to and from
+    DataFrames and MongoDB documents work column by column; indexing
+    returns a lightweight ``MarketDataRow`` view.
+
+    Documents may use the flat collection layout (indicators as top-level
+    fields) or the nested ``MarketData.to_dict`` layout. Missing indicator
+    values are stored as NaN.
+    """
+
+    __slots__ = ('symbol', 'dates', 'close', 'volume', 'indicators', 'columns', 'metadata')
+
+    def __init__(self,
+                 symbol: str,
+                 dates: np.ndarray,
+                 close: np.ndarray,
+                 volume: np.ndarray,
+                 indicators: Optional[np.ndarray] = None,
+                 columns: Optional[List[str]] = None,
+                 metadata: Optional[Dict] = None,
+                 indicator_dtype=np.float32):
+        self.symbol = symbol
+        self.dates = np.asarray(dates, dtype='datetime64[us]')
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.columns = list(columns if columns is not None else INDICATOR_COLUMNS)
+        if indicators is None:
+            indicators = np.full((len(self.dates), len(self.columns)), np.nan)
+        self.indicators = np.asarray(indicators, dtype=indicator_dtype)
+        self.metadata = metadata or {}
+
+        n_rows = len(self.dates)
+        if len(self.close) != n_rows or len(self.volume) != n_rows:
+            raise ValueError("dates, close and volume must have the same length")
+        if self.indicators.shape != (n_rows, len(self.columns)):
+            raise ValueError(
+                f"indicators shape {self.indicators.shape} does not match "
+                f"({n_rows}, {len(self.columns)})"
+            )
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MarketDataBatch(self.symbol, self.dates[index], self.close[index],
+                                   self.volume[index], self.indicators[index],
+                                   self.columns, self.metadata, self.indicators.dtype)
+        position = range(len(self))[index]
+        return MarketDataRow(self, position)
+
+    def __iter__(self):
+        return (MarketDataRow(self, i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays."""
+        return self.dates.nbytes + self.close.nbytes + self.volume.nbytes + self.indicators.nbytes
+
+    def indicator(self, name: str) -> np.ndarray:
+        """Return one indicator column as a view."""
+        return self.indicators[:, self.columns.index(name)]
+
+    def ensure_exact(self):
+        """
+        Check that the indicators are float64 before the batch is written.
+
+        Raises:
+            ValueError: If the indicators use a narrower dtype, whose rounded
+                values would replace the stored ones
+        """
+        if self.indicators.dtype != np.float64:
+            raise ValueError(
+                f"Batch of {self.symbol} holds {self.indicators.dtype} indicators; "
+                "build it with indicator_dtype=np.float64 to write it"
+            )
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, symbol: Optional[str] = None,
+                       columns: Optional[List[str]] = None,
+                       indicator_dtype=np.float32) -> 'MarketDataBatch':
+        """
+        Build a batch from a frame with ``date``, ``close``, ``volume`` and
+        indicator columns, e.g. from ``MongoDBManager.get_dataframe``.
+
+        Raises:
+            ValueError: If the frame holds more than one symbol
+        """
+        if symbol is None:
+            symbols = df['symbol'].unique() if 'symbol' in df else []
+            if len(symbols) > 1:
+                raise ValueError(f"Expected one symbol, found {len(symbols)}")
+            symbol = symbols[0] if len(symbols) else None
+
+        columns = list(columns if columns is not None else INDICATOR_COLUMNS)
+        indicators = (
+            df.reindex(columns=columns).to_numpy(dtype=np.float64, na_value=np.nan)
+            if columns else np.empty((len(df), 0))
+        )
+        return cls(
+            symbol=symbol,
+            dates=pd.to_datetime(df['date']).to_numpy(dtype='datetime64[us]'),
+            close=df['close'].to_numpy(dtype=np.float64, na_value=np.nan),
+            volume=df['volume'].to_numpy(dtype=np.float64, na_value=np.nan),
+            indicators=indicators,
+            columns=columns,
+            indicator_dtype=indicator_dtype
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return a flat frame with ``symbol``, ``date``, ``close``, ``volume`` and the indicators."""
+        base = pd.DataFrame({
+            'symbol': pd.Series([self.symbol] * len(self), dtype=object),
+            'date': self.dates,
+            'close': self.close,
+            'volume': self.volume
+        })
+        indicators = pd.DataFrame(self.indicators, columns=self.columns)
+        return pd.concat([base, indicators], axis=1)
+
+    @classmethod
+    def from_documents(cls, documents: List[Dict], symbol: Optional[str] = None,
+                       columns: Optional[List[str]] = None,
+                       indicator_dtype=np.float32) -> 'MarketDataBatch':
+        """Build a batch from MongoDB documents (flat or nested layout) of one symbol."""
+        columns = list(columns if columns is not None else INDICATOR_COLUMNS)
+        n_rows = len(documents)
+        if symbol is None and n_rows:
+            symbol = documents[0].get('symbol')
+
+        nested = bool(n_rows) and 'technical_indicators' in documents[0]
+        sources = [doc['technical_indicators'] for doc in documents] if nested else documents
+
+        indicators = np.empty((n_rows, len(columns)), dtype=indicator_dtype)
+        for j, column in enumerate(columns):
+            indicators[:, j] = _float_column(sources, column, n_rows)
+
+        return cls(
+            symbol=symbol,
+            dates=np.array([doc['date'] for doc in documents], dtype='datetime64[us]'),
+            close=_float_column(documents, 'close', n_rows),
+            volume=_float_column(documents, 'volume', n_rows),
+            indicators=indicators,
+            columns=columns,
+            indicator_dtype=indicator_dtype
+        )
+
+    def to_documents(self, nested: bool = False) -> List[Dict]:
+        """
+        Return one MongoDB document per row.
+
+        Args:
+            nested: Use the ``MarketData.to_dict`` layout with a
+                ``technical_indicators`` sub-document instead of flat fields
+        """
+        dates = self.dates.astype(object).tolist()
+        close = self.close.tolist()
+        volume = self.volume.tolist()
+        indicators = self.indicators.tolist()
+        columns = self.columns
+
+        if nested:
+            return [
+                {'symbol': self.symbol, 'date': date, 'close': c, 'volume': v,
+                 'technical_indicators': dict(zip(columns, values)), 'metadata': dict(self.metadata)}
+                for date, c, v, values in zip(dates, close, volume, indicators)
+            ]
+        return [
+            {'symbol': self.symbol, 'date': date, 'close': c, 'volume': v, **dict(zip(columns, values))}
+            for date, c, v, values in zip(dates, close, volume, indicators)
+        ]
+
+    @classmethod
+    def from_market_data(cls, records: List[MarketData],
+                         columns: Optional[List[str]] = None,
+                         indicator_dtype=np.float32) -> 'MarketDataBatch':
+        """Pack ``MarketData`` objects of one symbol into a batch."""
+        return cls.from_documents([record.to_dict() for record in records], columns=columns,
+                                  indicator_dtype=indicator_dtype)
+
+
+class MarketDataRow:
+    """Read-only view of one row of a ``MarketDataBatch``."""
+
+    __slots__ = ('batch', 'index')
+
+    def __init__(self, batch: MarketDataBatch, index: int):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def symbol(self) -> str:
+        return self.batch.symbol
+
+    @property
+    def date(self) -> datetime:
+        return self.batch.dates[self.index].astype(datetime)
+
+    @property
+    def close(self) -> float:
+        return float(self.batch.close[self.index])
+
+    @property
+    def volume(self) -> float:
+        return float(self.batch.volume[self.index])
+
+    @property
+    def technical_indicators(self) -> Dict[str, float]:
+        return dict(zip(self.batch.columns, self.batch.indicators[self.index].tolist()))
+
+    @property
+    def metadata(self) -> Dict:
+        return self.batch.metadata
+
+    def __getitem__(self, column: str) -> float:
+        return float(self.batch.indicators[self.index, self.batch.columns.index(column)])
+
+    def to_market_data(self) -> MarketData:
+        """Materialise the row as a ``MarketData`` object."""
+        return MarketData(self.symbol, self.date, self.close, self.volume,
+                          self.technical_indicators, dict(self.batch.metadata))
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary for MongoDB storage, like ``MarketData.to_dict``."""
+        return self.to_market_data().to_dict()
+
+
+def _float_column(documents: List[Dict], field: str, n_rows: int) -> np.ndarray:
+    """Gather one numeric field across documents; missing or None values become NaN."""
+    values = (doc.get(field) for doc in documents)
+    return np.fromiter((np.nan if value is None else value for value in values),
+                       dtype=np.float64, count=n_rows)
@@ -1,27 +1,85 @@
-from typing import List, Dict, Optional
-from pymongo import MongoClient
+from typing import List, Dict, Optional, Sequence, Tuple
 from datetime import datetime
-from config.settings import MONGODB_LOCAL_URI, MONGODB_DATABASE
+from pathlib import Path
+from config.settings import (
+    MONGODB_LOCAL_URI, MONGODB_DATABASE, MARKET_DATA_CACHE_DIR, MARKET_DATA_COLLECTION,
+    BUCKETED_COLLECTIONS
+)
+from utils.mongodb_utils import DEFAULT_BATCH_SIZE, get_client, get_date_range, read_dataframe
+from monitoring.metrics import QUERY_LATENCY, ROWS_LOADED
+from data.cache import MarketDataCache
+from data.database.buckets import BUCKET_INDEX_SPECS, BucketWriter, bucket_collection_name, read_collection
+from data.database.indexes import INDEX_SPECS, check_query_plans, ensure_indexes
+from data.database.ingestion import (
+    DEFAULT_INGEST_BATCH_SIZE, DEFAULT_MAX_IN_FLIGHT, MarketDataIngestor, MarketDataInput
+)
 
 class DatabaseManager:
-    """Handle database operations for the trading system."""
+    """
+    Handle database operations for the trading system.
+
+    Collections named in ``bucketed_collections`` are stored as monthly
+    buckets (see ``data.database.buckets``); market data reads and upserts
+    of those names are routed to the bucket collection transparently.
+    """
     
-    def __init__(self, uri: str = MONGODB_LOCAL_URI, db_name: str = MONGODB_DATABASE):
-        self.client = MongoClient(uri)
+    def __init__(self, uri: str = MONGODB_LOCAL_URI, db_name: str = MONGODB_DATABASE,
+                 cache_dir: Path = MARKET_DATA_CACHE_DIR,
+                 bucketed_collections: Sequence[str] = BUCKETED_COLLECTIONS):
+        self.client = get_client(uri)
         self.db = self.client[db_name]
+        self.cache_dir = cache_dir
+        self.bucketed_collections = frozenset(bucketed_collections)
+        self._caches: Dict[str, MarketDataCache] = {}
         
     def insert_market_data(self, collection: str, data: Dict) -> str:
         """Insert market data into specified collection."""
         result = self.db[collection].insert_one(data)
         return str(result.inserted_id)
+
+    def upsert_market_data(self, collection: str, data: MarketDataInput,
+                           batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+                           max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> Dict:
+        """
+        Bulk upsert market data keyed on (symbol, date).
+
+        Args:
+            collection: Collection name
+            data: DataFrame, or iterable of ``MarketData`` objects or dicts
+            batch_size: Documents per unordered bulk write
+            max_in_flight: Bulk writes allowed to run concurrently
+
+        Returns:
+            Inserted/updated/modified/error counts from ``MarketDataIngestor.ingest``,
+            or row/bucket/error counts from ``BucketWriter.write`` for a
+            bucketed collection
+        """
+        if collection in self.bucketed_collections:
+            return BucketWriter(self.db, bucket_collection_name(collection)).write(data)
+        ingestor = MarketDataIngestor(self.db, collection, batch_size, max_in_flight)
+        return ingestor.ingest(data)
         
     def get_market_data(self, 
                        collection: str,
                        symbol: Optional[str] = None,
                        start_date: Optional[datetime] = None,
                        end_date: Optional[datetime] = None,
-                       limit: Optional[int] = None) -> List[Dict]:
-        """Retrieve market data with optional filters."""
+                       limit: Optional[int] = None,
+                       use_cache: bool = False) -> List[Dict]:
+        """
+        Retrieve market data with optional filters.
+
+        With ``use_cache`` and a ``symbol``, rows are served from the local
+        columnar cache, which only fetches documents newer than its last
+        cached date from MongoDB. Cached rows omit ``_id``.
+        """
+        if use_cache and symbol:
+            with QUERY_LATENCY.labels(collection).time():
+                rows = self._get_cached_market_data(collection, symbol, start_date,
+                                                    end_date, limit)
+            ROWS_LOADED.labels(collection).inc(len(rows))
+            return rows
+
         query = {}
         if symbol:
             query['symbol'] = symbol
@@ -32,11 +90,80 @@ class DatabaseManager:
             if end_date:
                 query['date']['$lte'] = end_date
                 
-        cursor = self.db[collection].find(query)
+        cursor = read_collection(self.db, collection, self.bucketed_collections).find(query)
         if limit:
             cursor = cursor.limit(limit)
-            
-        return list(cursor)
+
+        with QUERY_LATENCY.labels(collection).time():
+            rows = list(cursor)
+        ROWS_LOADED.labels(collection).inc(len(rows))
+        return rows
+
+    def get_dataframe(self, collection: str, query: Dict = None,
+                      projection: Dict = None, sort_by: List = None,
+                      chunksize: Optional[int] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Retrieve data as a DataFrame, like ``MongoDBManager.get_dataframe``.
+
+        Bucketed collections are read bucket by bucket, so ``chunksize``
+        streams them too.
+        """
+        return read_dataframe(read_collection(self.db, collection, self.bucketed_collections), collection,
+                              query, projection, sort_by, chunksize, batch_size)
+
+    def get_distinct_values(self, collection: str, field: str, query: Dict = None) -> List:
+        """Get distinct values for a field."""
+        return read_collection(self.db, collection, self.bucketed_collections).distinct(field, query)
+
+    def ensure_indexes(self, specs: Dict[str, List[Dict]] = INDEX_SPECS) -> Dict[str, Dict]:
+        """Create missing indexes declared in ``INDEX_SPECS``; safe to call at every startup."""
+        specs = {name: declared for name, declared in specs.items() if name not in self.bucketed_collections}
+        specs.update({bucket_collection_name(name): BUCKET_INDEX_SPECS for name in self.bucketed_collections})
+        return ensure_indexes(self.db, specs)
+
+    def check_query_plans(self, collection: str = MARKET_DATA_COLLECTION,
+                          symbol: Optional[str] = None) -> Dict[str, Dict]:
+        """Explain the standard market data queries and flag collection scans."""
+        return check_query_plans(self.db, collection, symbol)
+
+    def get_date_range(self, collection: str, symbol: Optional[str] = None) -> Tuple:
+        """
+        First and last date in a collection, or for one symbol.
+
+        Reads both ends of the (symbol, date) or date index instead of
+        grouping over every document.
+        """
+        return get_date_range(read_collection(self.db, collection, self.bucketed_collections),
+                              {'symbol': symbol} if symbol else None)
+
+    def get_cache(self, collection: str) -> MarketDataCache:
+        """Return the local market data cache for a collection."""
+        if collection not in self._caches:
+            self._caches[collection] = MarketDataCache(self.db, collection, self.cache_dir,
+                                                       bucketed_collections=self.bucketed_collections)
+        return self._caches[collection]
+
+    def _get_cached_market_data(self, collection: str, symbol: str,
+                                start_date: Optional[datetime],
+                                end_date: Optional[datetime],
+                                limit: Optional[int]) -> List[Dict]:
+        data = self.get_cache(collection).load(symbol)
+        if data.empty:
+            return []
+
+        mask = None
+        if start_date:
+            mask = data['date'] >= start_date
+        if end_date:
+            end_mask = data['date'] <= end_date
+            mask = end_mask if mask is None else mask & end_mask
+        if mask is not None:
+            data = data[mask]
+        if limit:
+            data = data.head(limit)
+
+        return data.to_dict('records')
         
     def update_market_data(self, collection: str, query: Dict, update: Dict) -> int:
         """Update market data documents matching query."""
@@ -0,0 +1,282 @@
+import json
+import os
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import FEATURE_GROUPS, INDICATOR_COLUMNS
+from config.settings import FEATURE_STORE_DIR, TECHNICAL_FEATURES
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes so stale tensors are rebuilt
+FEATURE_STORE_FORMAT_VERSION = 2
+
+# Forward return horizons (bars) stored as targets
+DEFAULT_HORIZONS = (1, 3, 5, 10)
+
+# Configured features: every FEATURE_GROUPS column, then any extra TECHNICAL_FEATURES
+DEFAULT_FEATURES = list(dict.fromkeys(INDICATOR_COLUMNS + TECHNICAL_FEATURES))
+
+# Arrays of a tensor, saved as one .npy file each
+_ARRAYS = ('features', 'targets', 'close', 'volume', 'present', 'valid')
+
+
+class FeatureTensor:
+    """
+    Aligned feature, target and mask arrays for many symbols.
+
+    Attributes:
+        features: float32 (time x symbol x feature) indicator values, NaN
+            where the bar or the indicator is missing
+        targets: float32 (time x symbol x horizon) forward returns
+            ``close[t + h] / close[t] - 1`` over each symbol's own bars, as
+            ``pct_change(h).shift(-h)`` gives; NaN for the last ``h`` bars
+        close: float64 (time x symbol) close prices
+        volume: float64 (time x symbol) volumes, NaN when the frames have none
+        present: bool (time x symbol), True where the symbol has a bar
+        valid: bool (time x symbol), True where the bar has every feature
+
+    Tensors loaded from a ``FeatureStore`` are read-only memory maps.
+    ``feature``, ``target`` and ``price_frame`` return views of them;
+    ``symbol_frame`` copies one symbol's bars into a new DataFrame.
+    """
+
+    def __init__(self, symbols: List[str], dates: np.ndarray, feature_names: List[str],
+                 horizons: List[int], arrays: Dict[str, np.ndarray], version: Optional[str] = None):
+        self.symbols = list(symbols)
+        self.dates = np.asarray(dates, dtype='datetime64[us]')
+        self.feature_names = list(feature_names)
+        self.horizons = [int(h) for h in horizons]
+        self.version = version
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @property
+    def shape(self):
+        return self.features.shape
+
+    def feature(self, name: str) -> np.ndarray:
+        """(time x symbol) view of one feature."""
+        return self.features[:, :, self.feature_names.index(name)]
+
+    def group(self, group: str) -> np.ndarray:
+        """(time x symbol x feature) values of one ``FEATURE_GROUPS`` group."""
+        indices = [self.feature_names.index(name) for name in FEATURE_GROUPS[group]
+                   if name in self.feature_names]
+        # Contiguous groups come back as views, others as a copy
+        if indices and indices == list(range(indices[0], indices[-1] + 1)):
+            return self.features[:, :, indices[0]:indices[-1] + 1]
+        return self.features[:, :, indices]
+
+    def target(self, horizon: int) -> np.ndarray:
+        """(time x symbol) view of the forward returns over ``horizon`` bars."""
+        return self.targets[:, :, self.horizons.index(horizon)]
+
+    def price_frame(self, name: str = 'close') -> pd.DataFrame:
+        """(date x symbol) DataFrame over the ``close`` or ``volume`` array, without copying it."""
+        if name not in ('close', 'volume'):
+            raise ValueError("name must be 'close' or 'volume'")
+        return pd.DataFrame(getattr(self, name), index=pd.DatetimeIndex(self.dates, name='date'),
+                            columns=pd.Index(self.symbols, name='symbol'), copy=False)
+
+    def symbol_frame(self, symbol: str, valid_only: bool = False) -> pd.DataFrame:
+        """
+        Copy of one symbol's bars with date, close, features and targets.
+
+        Targets are named ``forward_return_<h>``. ``valid_only`` keeps only
+        bars with every feature.
+        """
+        j = self.symbols.index(symbol)
+        rows = self.valid[:, j] if valid_only else self.present[:, j]
+        frame = pd.DataFrame(self.features[rows, j], columns=self.feature_names)
+        frame.insert(0, 'date', self.dates[rows])
+        frame.insert(1, 'close', self.close[rows, j])
+        for k, horizon in enumerate(self.horizons):
+            frame[f'forward_return_{horizon}'] = self.targets[rows, j, k]
+        return frame
+
+
+def forward_return(close: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    ``close[t + horizon] / close[t] - 1`` over consecutive bars, NaN for the last ``horizon``.
+
+    The target definition of every tensor; equal to pandas'
+    ``pct_change(horizon).shift(-horizon)``.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    forward = np.full(len(close), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        forward[:max(len(close) - horizon, 0)] = close[horizon:] / close[:len(close) - horizon] - 1
+    return forward
+
+
+def data_version(frames: Dict[str, pd.DataFrame], features: Sequence[str],
+                 horizons: Sequence[int], target_col: str = 'close') -> str:
+    """
+    Content hash identifying the inputs of a feature tensor.
+
+    Covers every symbol's dates, prices, volumes and feature values as well
+    as the feature list and horizons, so any change to the data yields a
+    new version.
+    """
+    digest = hashlib.sha1()
+    digest.update(json.dumps([FEATURE_STORE_FORMAT_VERSION, list(features), [int(h) for h in horizons],
+                              target_col]).encode())
+    for symbol in sorted(frames):
+        frame = frames[symbol]
+        columns = ['date', target_col] + [f for f in ['volume', *features] if f in frame.columns]
+        digest.update(symbol.encode())
+        digest.update(pd.util.hash_pandas_object(frame[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def build_feature_tensor(frames: Dict[str, pd.DataFrame],
+                         features: Sequence[str] = DEFAULT_FEATURES,
+                         horizons: Sequence[int] = DEFAULT_HORIZONS,
+                         target_col: str = 'close') -> FeatureTensor:
+    """
+    Align per-symbol frames on the union of their dates.
+
+    Args:
+        frames: Mapping of symbol to DataFrame with a ``date`` column
+        features: Feature columns; those missing from every frame are dropped
+        horizons: Forward return horizons in bars
+        target_col: Price column of the targets
+
+    Returns:
+        In-memory FeatureTensor
+    """
+    symbols = sorted(frames)
+    feature_names = [f for f in features if any(f in frames[s].columns for s in symbols)]
+    horizons = [int(h) for h in horizons]
+    ordered = {symbol: frames[symbol].sort_values('date') for symbol in symbols}
+    dates = np.unique(np.concatenate([
+        frame['date'].to_numpy(dtype='datetime64[us]') for frame in ordered.values()
+    ])) if symbols else np.empty(0, dtype='datetime64[us]')
+
+    n_dates, n_symbols = len(dates), len(symbols)
+    arrays = {
+        'features': np.full((n_dates, n_symbols, len(feature_names)), np.nan, dtype=np.float32),
+        'targets': np.full((n_dates, n_symbols, len(horizons)), np.nan, dtype=np.float32),
+        'close': np.full((n_dates, n_symbols), np.nan),
+        'volume': np.full((n_dates, n_symbols), np.nan),
+        'present': np.zeros((n_dates, n_symbols), dtype=bool)
+    }
+    for j, symbol in enumerate(symbols):
+        frame = ordered[symbol]
+        rows = np.searchsorted(dates, frame['date'].to_numpy(dtype='datetime64[us]'))
+        close = frame[target_col].to_numpy(dtype=np.float64)
+        arrays['present'][rows, j] = True
+        arrays['close'][rows, j] = close
+        if 'volume' in frame.columns:
+            arrays['volume'][rows, j] = frame['volume'].to_numpy(dtype=np.float64)
+        arrays['features'][rows, j] = frame.reindex(columns=feature_names).to_numpy(dtype=np.float32)
+        for k, horizon in enumerate(horizons):
+            arrays['targets'][rows, j, k] = forward_return(close, horizon)
+    arrays['valid'] = arrays['present'] & ~np.isnan(arrays['features']).any(axis=2)
+
+    return FeatureTensor(symbols, dates, feature_names, horizons, arrays)
+
+
+class FeatureStore:
+    """
+    Versioned on-disk store of feature tensors.
+
+    Each tensor lives in ``<root>/<version>/`` as one ``.npy`` file per array
+    plus a ``meta.json``; the version is the ``data_version`` hash of its
+    inputs, so a tensor is built once per data version and afterwards only
+    memory-mapped. Loaded tensors are read-only and shared through the page
+    cache by every process that opens them.
+    """
+
+    def __init__(self, root: Path = FEATURE_STORE_DIR):
+        self.root = Path(root)
+
+    def get_or_build(self, frames: Dict[str, pd.DataFrame],
+                     features: Sequence[str] = DEFAULT_FEATURES,
+                     horizons: Sequence[int] = DEFAULT_HORIZONS,
+                     target_col: str = 'close') -> FeatureTensor:
+        """Load the tensor of this data version, building and saving it first if needed."""
+        version = data_version(frames, features, horizons, target_col)
+        if (self.root / version / 'meta.json').exists():
+            # Mark the version as recently used so ``prune`` keeps it
+            os.utime(self.root / version)
+            return self.load(version)
+
+        tensor = build_feature_tensor(frames, features, horizons, target_col)
+        self.save(tensor, version)
+        logger.info(f"Built feature tensor {version} with shape {tensor.shape}")
+        return self.load(version)
+
+    def save(self, tensor: FeatureTensor, version: str):
+        """Write a tensor atomically by renaming a completed temp directory."""
+        tmp_dir = self.root / f".{version}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        for name in _ARRAYS:
+            np.save(tmp_dir / f"{name}.npy", getattr(tensor, name), allow_pickle=False)
+        np.save(tmp_dir / 'dates.npy', tensor.dates.astype(np.int64), allow_pickle=False)
+        with open(tmp_dir / 'meta.json', 'w') as f:
+            json.dump({
+                'format': FEATURE_STORE_FORMAT_VERSION,
+                'version': version,
+                'symbols': tensor.symbols,
+                'features': tensor.feature_names,
+                'horizons': tensor.horizons
+            }, f, indent=2)
+
+        target = self.root / version
+        if target.exists():
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        os.replace(tmp_dir, target)
+
+    def load(self, version: str) -> FeatureTensor:
+        """Memory-map a stored tensor."""
+        directory = self.root / version
+        with open(directory / 'meta.json') as f:
+            meta = json.load(f)
+        if meta.get('format') != FEATURE_STORE_FORMAT_VERSION:
+            raise ValueError(f"Feature tensor {version} has an outdated format; rebuild it")
+
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode='r') for name in _ARRAYS}
+        dates = np.load(directory / 'dates.npy').astype('datetime64[us]')
+        return FeatureTensor(meta['symbols'], dates, meta['features'], meta['horizons'],
+                             arrays, version)
+
+    def versions(self, symbols: Optional[Sequence[str]] = None) -> List[str]:
+        """Stored versions, least recently built or reused first; only those of ``symbols`` if given."""
+        if not self.root.exists():
+            return []
+        stored = [path for path in self.root.iterdir() if (path / 'meta.json').exists()]
+        if symbols is not None:
+            stored = [path for path in stored if _stored_symbols(path) == sorted(symbols)]
+        return [path.name for path in sorted(stored, key=lambda path: path.stat().st_mtime)]
+
+    def prune(self, keep: int = 1, symbols: Optional[Sequence[str]] = None):
+        """
+        Delete all but the ``keep`` most recently built or reused versions.
+
+        With ``symbols``, only versions of that symbol set are considered, so
+        callers building tensors of different symbols can prune their own.
+        """
+        versions = self.versions(symbols)
+        for version in versions[:-keep] if keep else versions:
+            shutil.rmtree(self.root / version, ignore_errors=True)
+
+
+def _stored_symbols(directory: Path) -> List[str]:
+    with open(directory / 'meta.json') as f:
+        return json.load(f)['symbols']
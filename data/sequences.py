@@ -0,0 +1,221 @@
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import MODEL_CONFIGS
+from data.feature_store import DEFAULT_FEATURES, FeatureTensor, build_feature_tensor
+
+LSTM_CONFIG = MODEL_CONFIGS['lstm']
+
+# Dates per pass when scanning the feature array for masks and moments
+SCAN_CHUNK_ROWS = 4_096
+
+SUBSETS = ('train', 'validation')
+
+
+def window_view(features: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Read-only (window x symbol x lookback x feature) view of a (time x symbol x feature) array.
+
+    Entry ``[w, s]`` is ``features[w:w + lookback, s]``; no values are
+    copied, whatever the lookback.
+    """
+    return sliding_window_view(features, lookback, axis=0).transpose(0, 1, 3, 2)
+
+
+class SequenceDataset:
+    """
+    Lookback windows of a ``FeatureTensor`` as LSTM training samples.
+
+    A sample is one symbol's ``lookback`` consecutive bars of features,
+    ending at bar t, with the forward return over ``horizon`` bars from t
+    as target. Windows are strided views of the tensor's float32 feature
+    array (``window_view``), so only the mini-batch being served is ever
+    copied; memory-mapped tensors from a ``FeatureStore`` stay on disk and
+    in the page cache.
+
+    Samples are split in time: those ending in the last
+    ``validation_split`` of the dates validate, the rest train, minus the
+    last ``horizon`` training samples, whose targets overlap the validation
+    period. Windows containing a missing bar or a non-finite feature are
+    skipped. Features are standardised with the training mean and standard
+    deviation as each batch is gathered.
+    """
+
+    def __init__(self, tensor: FeatureTensor,
+                 lookback: int = LSTM_CONFIG['lookback'],
+                 horizon: int = 1,
+                 features: Optional[Sequence[str]] = None,
+                 validation_split: float = LSTM_CONFIG['validation_split'],
+                 standardize: bool = True):
+        if lookback < 1:
+            raise ValueError("lookback must be at least 1")
+        if not 0 <= validation_split < 1:
+            raise ValueError("validation_split must be in [0, 1)")
+        self.tensor = tensor
+        self.lookback = lookback
+        self.horizon = horizon
+        self.feature_names = list(features or tensor.feature_names)
+        indices = [tensor.feature_names.index(name) for name in self.feature_names]
+        # Contiguous selections (including all features) stay views of the tensor
+        if indices == list(range(indices[0], indices[-1] + 1)):
+            self.features = tensor.features[:, :, indices[0]:indices[-1] + 1]
+        else:
+            self.features = np.ascontiguousarray(tensor.features[:, :, indices], dtype=np.float32)
+        self.targets = tensor.target(horizon)
+        self.windows = window_view(self.features, lookback)
+
+        n_dates = self.features.shape[0]
+        self.split_date = int(round(n_dates * (1 - validation_split)))
+        valid = self._scan()
+        self._index = self._sample_index(valid)
+        self.mean, self.std = (self._moments(valid) if standardize else (None, None))
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], features: Sequence[str] = DEFAULT_FEATURES,
+                    horizon: int = 1, **kwargs) -> 'SequenceDataset':
+        """Dataset over per-symbol frames, aligned with ``build_feature_tensor``."""
+        tensor = build_feature_tensor(frames, features, horizons=[horizon])
+        return cls(tensor, horizon=horizon, **kwargs)
+
+    @property
+    def n_features(self) -> int:
+        return self.features.shape[2]
+
+    def __len__(self) -> int:
+        return sum(len(windows) for windows, _ in self._index.values())
+
+    def size(self, subset: str = 'train') -> int:
+        return len(self._index[subset][0])
+
+    def samples(self, subset: str = 'train') -> Tuple[np.ndarray, np.ndarray]:
+        """(window start, symbol) index arrays of a subset's samples, in time order."""
+        if subset not in SUBSETS:
+            raise ValueError(f"subset must be one of {SUBSETS}")
+        return self._index[subset]
+
+    def _scan(self) -> np.ndarray:
+        """(time x symbol) mask of bars that exist and have every feature finite."""
+        valid = self.tensor.present.copy()
+        for start in range(0, len(valid), SCAN_CHUNK_ROWS):
+            stop = start + SCAN_CHUNK_ROWS
+            valid[start:stop] &= np.isfinite(self.features[start:stop]).all(axis=2)
+        return valid
+
+    def _sample_index(self, valid: np.ndarray) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        # Invalid bars inside each window from a running count
+        invalid = np.concatenate([np.zeros((1, valid.shape[1]), dtype=np.int64),
+                                  np.cumsum(~valid, axis=0)])
+        gaps = invalid[self.lookback:] - invalid[:-self.lookback]
+        ok = (gaps == 0) & np.isfinite(self.targets[self.lookback - 1:])
+        starts, symbols = np.nonzero(ok)
+        ends = starts + self.lookback - 1
+
+        train = ends + self.horizon < self.split_date
+        validation = ends >= self.split_date
+        return {'train': (starts[train], symbols[train]),
+                'validation': (starts[validation], symbols[validation])}
+
+    def _moments(self, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-feature mean and standard deviation over the valid bars before the split."""
+        total = np.zeros(self.n_features)
+        total_sq = np.zeros(self.n_features)
+        count = 0
+        for start in range(0, self.split_date, SCAN_CHUNK_ROWS):
+            stop = min(start + SCAN_CHUNK_ROWS, self.split_date)
+            rows = self.features[start:stop][valid[start:stop]].astype(np.float64)
+            total += rows.sum(axis=0)
+            total_sq += (rows * rows).sum(axis=0)
+            count += len(rows)
+        if count == 0:
+            return np.zeros(self.n_features, dtype=np.float32), np.ones(self.n_features, dtype=np.float32)
+        mean = total / count
+        std = np.sqrt(np.maximum(total_sq / count - mean * mean, 0.0))
+        return mean.astype(np.float32), np.where(std > 0, std, 1.0).astype(np.float32)
+
+    def gather(self, starts: np.ndarray, symbols: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Copy the given samples into a batch.
+
+        Returns:
+            float32 features of shape (batch, lookback, feature), standardised
+            when the dataset is, and float32 targets of shape (batch,)
+        """
+        X = self.windows[starts, symbols]
+        if self.mean is not None:
+            X -= self.mean
+            X /= self.std
+        return X, self.targets[starts + self.lookback - 1, symbols].astype(np.float32)
+
+    def batches(self, subset: str = 'train',
+                batch_size: int = LSTM_CONFIG['batch_size'],
+                shuffle: bool = True,
+                seed: Optional[int] = None,
+                prefetch: int = 2) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        One pass over a subset in mini-batches.
+
+        Args:
+            subset: ``train`` or ``validation``
+            batch_size: Samples per batch; the last batch may be smaller
+            shuffle: Visit samples in random order
+            seed: Seed of the shuffle
+            prefetch: Batches gathered ahead on a background thread; 0
+                gathers each batch when it is requested
+
+        Yields:
+            (features, targets) pairs as returned by ``gather``
+        """
+        starts, symbols = self.samples(subset)
+        order = np.random.default_rng(seed).permutation(len(starts)) if shuffle else np.arange(len(starts))
+        chunks = (order[i:i + batch_size] for i in range(0, len(order), batch_size))
+        if prefetch < 1:
+            for chunk in chunks:
+                yield self.gather(starts[chunk], symbols[chunk])
+            return
+
+        # At most ``prefetch`` gathered batches wait besides the one being used
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(self.gather, starts[chunk], symbols[chunk]))
+                if len(pending) > prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def to_tf_dataset(self, subset: str = 'train',
+                      batch_size: int = LSTM_CONFIG['batch_size'],
+                      shuffle: bool = True,
+                      seed: Optional[int] = None):
+        """
+        ``tf.data.Dataset`` streaming ``batches`` with prefetching.
+
+        Each pass over the dataset (each Keras epoch) reshuffles, with seed
+        ``seed + epoch`` when a seed is given. tensorflow is imported here,
+        so it stays an optional dependency.
+        """
+        import tensorflow as tf
+
+        epochs = itertools.count()
+        signature = (tf.TensorSpec((None, self.lookback, self.n_features), tf.float32),
+                     tf.TensorSpec((None,), tf.float32))
+
+        def generate():
+            epoch_seed = None if seed is None else seed + next(epochs)
+            return self.batches(subset, batch_size, shuffle, epoch_seed, prefetch=0)
+
+        dataset = tf.data.Dataset.from_generator(generate, output_signature=signature)
+        return dataset.prefetch(tf.data.AUTOTUNE)
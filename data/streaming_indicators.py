@@ -0,0 +1,538 @@
+import math
+from collections import deque
+from time import perf_counter
+from typing import Dict, Optional
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import INDICATOR_COLUMNS, INDICATOR_PARAMS
+from monitoring.metrics import INDICATOR_UPDATE_TIME
+
+NAN = float('nan')
+
+
+class _Component:
+    """Indicator building block whose state can be dumped to plain Python types."""
+
+    def state(self) -> Dict:
+        return {name: _dump(value) for name, value in vars(self).items()}
+
+    def load(self, state: Dict):
+        for name, value in state.items():
+            setattr(self, name, _load(getattr(self, name), value))
+
+
+def _dump(value):
+    if isinstance(value, _Component):
+        return value.state()
+    if isinstance(value, deque):
+        return [list(item) if isinstance(item, tuple) else item for item in value]
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _dump(item) for key, item in value.items()}
+    return value
+
+
+def _load(current, value):
+    if isinstance(current, _Component):
+        current.load(value)
+        return current
+    if isinstance(current, list) and len(current) == len(value):
+        return [_load(item, item_state) for item, item_state in zip(current, value)]
+    if isinstance(current, deque):
+        return deque((tuple(item) if isinstance(item, list) else item for item in value),
+                     maxlen=current.maxlen)
+    return value
+
+
+class _Ema(_Component):
+    """Exponential moving average matching ``pd.Series.ewm(adjust=False).mean()``."""
+
+    def __init__(self, span: Optional[int] = None, alpha: Optional[float] = None,
+                 min_periods: int = 0):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.min_periods = min_periods
+        self.mean = NAN
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= max(self.min_periods, 1)
+
+    @property
+    def value(self) -> float:
+        return self.mean if self.ready else NAN
+
+    def update(self, x: float) -> float:
+        if x != x:
+            return self.value
+        self.count += 1
+        if self.count == 1:
+            self.mean = x
+        else:
+            old_weight = 1.0 - self.alpha
+            self.mean = (old_weight * self.mean + self.alpha * x) / (old_weight + self.alpha)
+        return self.value
+
+
+class _RollingWindow(_Component):
+    """
+    Rolling sum, mean and population variance over the last ``window`` values.
+
+    Sums are kept relative to a reference value and re-accumulated from the
+    window every ``window`` updates, so rounding error does not build up
+    over a long-running stream. NaN inputs occupy a slot but are skipped, as
+    in ``pd.Series.rolling``.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.shift = 0.0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.valid = 0
+        self.since_resum = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.valid >= max(self.min_periods, 1)
+
+    def push(self, x: float):
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if old == old:
+                self.total -= old - self.shift
+                self.total_sq -= (old - self.shift) ** 2
+                self.valid -= 1
+        self.values.append(x)
+        if x == x:
+            self.total += x - self.shift
+            self.total_sq += (x - self.shift) ** 2
+            self.valid += 1
+
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self._resum()
+
+    def _resum(self):
+        finite = [x for x in self.values if x == x]
+        self.shift = finite[-1] if finite else 0.0
+        self.total = math.fsum(x - self.shift for x in finite)
+        self.total_sq = math.fsum((x - self.shift) ** 2 for x in finite)
+        self.since_resum = 0
+
+    def sum(self) -> float:
+        return self.total + self.valid * self.shift if self.ready else NAN
+
+    def mean(self) -> float:
+        return self.total / self.valid + self.shift if self.ready else NAN
+
+    def std(self) -> float:
+        if not self.ready:
+            return NAN
+        mean = self.total / self.valid
+        return math.sqrt(max(self.total_sq / self.valid - mean * mean, 0.0))
+
+
+class _RollingExtreme(_Component):
+    """Rolling max (or min) over a full window using a monotonic deque."""
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.maximum = maximum
+        self.candidates = deque()
+        self.index = -1
+        self.last_nan = -1
+        self.count = 0
+
+    def push(self, x: float) -> float:
+        self.index += 1
+        self.count += 1
+        if x != x:
+            self.last_nan = self.index
+        else:
+            sign = 1.0 if self.maximum else -1.0
+            while self.candidates and sign * self.candidates[-1][1] <= sign * x:
+                self.candidates.pop()
+            self.candidates.append((self.index, x))
+        while self.candidates and self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+        return self.value
+
+    @property
+    def value(self) -> float:
+        full = self.count >= self.window and self.index - self.last_nan >= self.window
+        return self.candidates[0][1] if full and self.candidates else NAN
+
+
+class _Adx(_Component):
+    """
+    ADX reproducing ``ta.trend.ADXIndicator.adx``.
+
+    True range and directional movement are Wilder-smoothed from their sum
+    over the first ``window`` bars; ADX starts as the mean of the first
+    ``window`` DX values and is then Wilder-smoothed.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.bars = 0
+        self.true_range = 0.0
+        self.plus_dm = 0.0
+        self.minus_dm = 0.0
+        self.dx_count = 0
+        self.dx_total = 0.0
+        self.adx = NAN
+
+    def update(self, true_range: float, plus_dm: float, minus_dm: float) -> float:
+        window = self.window
+        self.bars += 1
+        if self.bars <= window:
+            self.true_range += true_range
+            self.plus_dm += plus_dm
+            self.minus_dm += minus_dm
+            if self.bars < window:
+                return NAN
+        else:
+            self.true_range = self.true_range - self.true_range / window + true_range
+            self.plus_dm = self.plus_dm - self.plus_dm / window + plus_dm
+            self.minus_dm = self.minus_dm - self.minus_dm / window + minus_dm
+
+        if self.true_range != 0:
+            plus_di = 100 * (self.plus_dm / self.true_range)
+            minus_di = 100 * (self.minus_dm / self.true_range)
+        else:
+            plus_di = minus_di = 0.0
+        if plus_di + minus_di != 0:
+            dx = 100 * abs((plus_di - minus_di) / (plus_di + minus_di))
+        else:
+            dx = 0.0
+
+        self.dx_count += 1
+        if self.dx_count < window:
+            self.dx_total += dx
+        elif self.dx_count == window:
+            self.adx = (self.dx_total + dx) / window
+        else:
+            self.adx = (self.adx * (window - 1) + dx) / float(window)
+        return self.adx
+
+
+class StreamingIndicators(_Component):
+    """
+    Incremental computation of the ``FEATURE_GROUPS`` indicator columns.
+
+    Each call to ``update`` consumes one OHLCV bar and returns the latest
+    value of every indicator in O(1) amortised time (rolling extremes keep
+    a monotonic deque of at most ``window`` entries). Values agree with the
+    batch output of ``ta.add_all_ta_features`` with the default windows in
+    ``INDICATOR_PARAMS``, except that ADX is NaN during its warm-up where
+    ``ta`` reports zeros.
+
+    The full state can be captured with ``snapshot`` and resumed with
+    ``restore``; snapshots contain only plain Python types and finite
+    numbers (NaN is stored as None, infinities as ``'inf'``/``'-inf'``),
+    so they can be stored as strict JSON or in MongoDB.
+    """
+
+    def __init__(self, params: Optional[Dict] = None):
+        self.params = {**INDICATOR_PARAMS, **(params or {})}
+        p = self.params
+
+        self.bars = 0
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+        self.prev_volume = NAN
+        self.prev_typical = NAN
+        self.prev_trix = NAN
+        self.adi = 0.0
+        self.vpt = NAN
+        self.nvi = 1000.0
+
+        # Trend
+        self.sma_fast = _RollingWindow(p['sma_fast'])
+        self.sma_slow = _RollingWindow(p['sma_slow'])
+        self.ema_fast = _Ema(span=p['ema_fast'], min_periods=p['ema_fast'])
+        self.ema_slow = _Ema(span=p['ema_slow'], min_periods=p['ema_slow'])
+        self.adx = _Adx(p['adx'])
+        self.vortex_tr = _RollingWindow(p['vortex'])
+        self.vortex_pos = _RollingWindow(p['vortex'])
+        self.vortex_neg = _RollingWindow(p['vortex'])
+        self.trix = [_Ema(span=p['trix'], min_periods=p['trix']) for _ in range(3)]
+
+        # Momentum
+        self.rsi_up = _Ema(alpha=1.0 / p['rsi'], min_periods=p['rsi'])
+        self.rsi_down = _Ema(alpha=1.0 / p['rsi'], min_periods=p['rsi'])
+        self.rsi_max = _RollingExtreme(p['stoch_rsi'], maximum=True)
+        self.rsi_min = _RollingExtreme(p['stoch_rsi'], maximum=False)
+        self.tsi_slow = _Ema(span=p['tsi_slow'], min_periods=p['tsi_slow'])
+        self.tsi_slow_abs = _Ema(span=p['tsi_slow'], min_periods=p['tsi_slow'])
+        self.tsi_fast = _Ema(span=p['tsi_fast'], min_periods=p['tsi_fast'])
+        self.tsi_fast_abs = _Ema(span=p['tsi_fast'], min_periods=p['tsi_fast'])
+        self.uo_pressure = [_RollingWindow(window) for window in p['uo']]
+        self.uo_range = [_RollingWindow(window) for window in p['uo']]
+        self.stoch_high = _RollingExtreme(p['stoch'], maximum=True)
+        self.stoch_low = _RollingExtreme(p['stoch'], maximum=False)
+        self.stoch_signal = _RollingWindow(p['stoch_signal'])
+        self.wr_high = _RollingExtreme(p['wr'], maximum=True)
+        self.wr_low = _RollingExtreme(p['wr'], maximum=False)
+        self.ao_fast = _RollingWindow(p['ao_fast'])
+        self.ao_slow = _RollingWindow(p['ao_slow'])
+
+        # Volatility
+        self.bollinger = _RollingWindow(p['bollinger'])
+        self.keltner_mid = _RollingWindow(p['keltner'])
+        self.keltner_high = _RollingWindow(p['keltner'], min_periods=0)
+        self.keltner_low = _RollingWindow(p['keltner'], min_periods=0)
+        self.donchian_high = _RollingExtreme(p['donchian'], maximum=True)
+        self.donchian_low = _RollingExtreme(p['donchian'], maximum=False)
+
+        # Volume
+        self.eom = _RollingWindow(p['eom'])
+        self.vwap_pv = _RollingWindow(p['vwap'])
+        self.vwap_volume = _RollingWindow(p['vwap'])
+        self.fi = _Ema(span=p['fi'], min_periods=p['fi'])
+        self.mfi_positive = _RollingWindow(p['mfi'])
+        self.mfi_negative = _RollingWindow(p['mfi'])
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """
+        Consume one bar and return the updated indicators.
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+            volume: Bar volume
+
+        Returns:
+            Dictionary mapping each ``FEATURE_GROUPS`` column to its value;
+            NaN while the indicator is warming up
+        """
+        start = perf_counter()
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        p = self.params
+        first = self.bars == 0
+        prev_high, prev_low = self.prev_high, self.prev_low
+        prev_close, prev_volume = self.prev_close, self.prev_volume
+        out = {}
+
+        # Quantities that need the previous bar are NaN on the first one
+        if first:
+            diff = true_range = pressure = plus_dm = minus_dm = NAN
+            vortex_pos = vortex_neg = eom = change = NAN
+        else:
+            diff = close - prev_close
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            pressure = close - min(low, prev_close)
+            up_move = high - prev_high
+            down_move = prev_low - low
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+            vortex_pos = abs(high - prev_low)
+            vortex_neg = abs(low - prev_high)
+            eom = _ratio((high - prev_high + low - prev_low) * (high - low), 2 * volume) * 100000000
+            change = _ratio(close, prev_close) - 1
+
+        # Trend
+        self.sma_fast.push(close)
+        self.sma_slow.push(close)
+        out['trend_sma_fast'] = self.sma_fast.mean()
+        out['trend_sma_slow'] = self.sma_slow.mean()
+        out['trend_ema_fast'] = self.ema_fast.update(close)
+        out['trend_ema_slow'] = self.ema_slow.update(close)
+        out['trend_adx'] = NAN if first else self.adx.update(
+            max(high, prev_close) - min(low, prev_close), plus_dm, minus_dm
+        )
+
+        if not first:
+            self.vortex_tr.push(true_range)
+            self.vortex_pos.push(vortex_pos)
+            self.vortex_neg.push(vortex_neg)
+        vortex_range = self.vortex_tr.sum()
+        out['trend_vortex_ind_pos'] = _ratio(self.vortex_pos.sum(), vortex_range)
+        out['trend_vortex_ind_neg'] = _ratio(self.vortex_neg.sum(), vortex_range)
+
+        value = close
+        for ema in self.trix:
+            value = ema.update(value)
+        out['trend_trix'] = _ratio(value - self.prev_trix, self.prev_trix) * 100
+        self.prev_trix = value
+
+        # Momentum; like ta, the undefined first change counts as neither up nor down
+        up = self.rsi_up.update(diff if diff > 0 else 0.0)
+        down = self.rsi_down.update(-diff if diff < 0 else 0.0)
+        rsi = 100.0 if down == 0 else 100 - (100 / (1 + _ratio(up, down)))
+        out['momentum_rsi'] = rsi
+
+        if rsi == rsi:
+            rsi_high = self.rsi_max.push(rsi)
+            rsi_low = self.rsi_min.push(rsi)
+            out['momentum_stoch_rsi'] = _ratio(rsi - rsi_low, rsi_high - rsi_low)
+        else:
+            out['momentum_stoch_rsi'] = NAN
+
+        slow = self.tsi_slow.update(diff)
+        slow_abs = self.tsi_slow_abs.update(abs(diff))
+        fast = self.tsi_fast.update(slow)
+        fast_abs = self.tsi_fast_abs.update(slow_abs)
+        out['momentum_tsi'] = _ratio(fast, fast_abs) * 100
+
+        if not first:
+            for pressure_window, range_window in zip(self.uo_pressure, self.uo_range):
+                pressure_window.push(pressure)
+                range_window.push(true_range)
+        averages = [_ratio(pw.sum(), rw.sum()) for pw, rw in zip(self.uo_pressure, self.uo_range)]
+        weights = p['uo_weights']
+        out['momentum_uo'] = (
+            100.0 * sum(w * a for w, a in zip(weights, averages)) / sum(weights)
+        )
+
+        stoch_high = self.stoch_high.push(high)
+        stoch_low = self.stoch_low.push(low)
+        stoch = _ratio(100 * (close - stoch_low), stoch_high - stoch_low)
+        out['momentum_stoch'] = stoch
+        self.stoch_signal.push(stoch)
+        out['momentum_stoch_signal'] = self.stoch_signal.mean()
+
+        wr_high = self.wr_high.push(high)
+        wr_low = self.wr_low.push(low)
+        out['momentum_wr'] = _ratio(-100 * (wr_high - close), wr_high - wr_low)
+
+        median = 0.5 * (high + low)
+        self.ao_fast.push(median)
+        self.ao_slow.push(median)
+        out['momentum_ao'] = self.ao_fast.mean() - self.ao_slow.mean()
+
+        # Volatility
+        self.bollinger.push(close)
+        middle = self.bollinger.mean()
+        deviation = p['bollinger_dev'] * self.bollinger.std()
+        upper, lower = middle + deviation, middle - deviation
+        out['volatility_bbm'] = middle
+        out['volatility_bbh'] = upper
+        out['volatility_bbl'] = lower
+        out['volatility_bbw'] = _ratio(upper - lower, middle) * 100
+
+        self.keltner_mid.push((high + low + close) / 3.0)
+        self.keltner_high.push(((4 * high) - (2 * low) + close) / 3.0)
+        self.keltner_low.push(((-2 * high) + (4 * low) + close) / 3.0)
+        out['volatility_kcc'] = self.keltner_mid.mean()
+        out['volatility_kch'] = self.keltner_high.mean()
+        out['volatility_kcl'] = self.keltner_low.mean()
+
+        donchian_high = self.donchian_high.push(high)
+        donchian_low = self.donchian_low.push(low)
+        out['volatility_dcl'] = donchian_low
+        out['volatility_dch'] = donchian_high
+        out['volatility_dcm'] = ((donchian_high - donchian_low) / 2.0) + donchian_low
+
+        # Volume
+        if not first:
+            self.eom.push(eom)
+        out['volume_em'] = eom
+        out['volume_sma_em'] = self.eom.mean()
+
+        typical = (high + low + close) / 3.0
+        self.vwap_pv.push(typical * volume)
+        self.vwap_volume.push(volume)
+        out['volume_vwap'] = _ratio(self.vwap_pv.sum(), self.vwap_volume.sum())
+
+        if not first and prev_volume > volume:
+            self.nvi *= 1.0 + change
+        out['volume_nvi'] = self.nvi
+
+        if not first:
+            self.vpt = change * volume if self.vpt != self.vpt else self.vpt + change * volume
+        out['volume_vpt'] = self.vpt
+
+        out['volume_fi'] = self.fi.update(diff * volume)
+
+        direction = 0 if first else (typical > self.prev_typical) - (typical < self.prev_typical)
+        money_flow = typical * volume * direction
+        self.mfi_positive.push(money_flow if money_flow >= 0.0 else 0.0)
+        self.mfi_negative.push(-money_flow if money_flow < 0.0 else 0.0)
+        out['volume_mfi'] = 100 - (100 / (1 + _ratio(self.mfi_positive.sum(), self.mfi_negative.sum())))
+
+        clv = _ratio((close - low) - (high - close), high - low)
+        self.adi += (0.0 if clv != clv else clv) * volume
+        out['volume_adi'] = self.adi
+
+        self.bars += 1
+        self.prev_high, self.prev_low = high, low
+        self.prev_close, self.prev_volume = close, volume
+        self.prev_typical = typical
+
+        INDICATOR_UPDATE_TIME.observe(perf_counter() - start)
+        return {column: out[column] for column in INDICATOR_COLUMNS}
+
+    def run(self, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Feed a frame of historical bars through ``update``.
+
+        Args:
+            bars: DataFrame with ``high``, ``low``, ``close`` and ``volume`` columns
+
+        Returns:
+            DataFrame of indicator values aligned with ``bars``
+        """
+        columns = [bars[name].to_numpy(dtype=np.float64) for name in ('high', 'low', 'close', 'volume')]
+        rows = [self.update(*bar) for bar in zip(*columns)]
+        return pd.DataFrame(rows, index=bars.index, columns=INDICATOR_COLUMNS)
+
+    def snapshot(self) -> Dict:
+        """Return the full indicator state as plain Python types without non-finite floats."""
+        return _encode_floats(self.state())
+
+    @classmethod
+    def restore(cls, snapshot: Dict) -> 'StreamingIndicators':
+        """Rebuild an instance from a ``snapshot``."""
+        snapshot = _decode_floats(snapshot)
+        indicators = cls(snapshot['params'])
+        indicators.load(snapshot)
+        return indicators
+
+
+def _encode_floats(value):
+    """Replace NaN with None and infinities with ``'inf'``/``'-inf'``, recursively."""
+    if isinstance(value, dict):
+        return {key: _encode_floats(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode_floats(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None if value != value else ('inf' if value > 0 else '-inf')
+    return value
+
+
+def _decode_floats(value):
+    """Inverse of ``_encode_floats``; the state holds no other None or string values."""
+    if isinstance(value, dict):
+        return {key: _decode_floats(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_floats(item) for item in value]
+    if value is None:
+        return NAN
+    if value in ('inf', '-inf'):
+        return float(value)
+    return value
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """Divide like pandas: x / 0 is +-inf and 0 / 0 (or NaN) is NaN."""
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
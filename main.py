@@ -1,10 +1,182 @@
-from .data.database.operations import DatabaseManager
-from config.settings import MONGODB_LOCAL_URI, MONGODB_DATABASE
+"""
+Command line entry point for the trading system.
 
-def main():
+Heavy libraries (pandas, pymongo, sklearn, scipy) are imported inside the
+command that needs them, so ``--help`` and short cron jobs start quickly.
+
+Usage:
+    python -m main indexes --check
+    python -m main ingest prices.csv --collection crypto_time_series_with_technical_indicators
+    python -m main analyze --symbols BTC-USD ETH-USD --importance fast
+    python -m main backtest --symbols BTC-USD ETH-USD --start 2024-01-01
+"""
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.settings import FEATURE_STORE_DIR, MARKET_DATA_COLLECTION, MONGODB_DATABASE, MONGODB_LOCAL_URI
+
+# Where ``analyze`` writes its reports
+ANALYSIS_OUTPUT_DIR = Path("analysis_output")
+
+
+def _database(args):
+    from data.database.operations import DatabaseManager
+
+    return DatabaseManager(args.uri, args.database)
+
+
+def _load_frame(manager, collection: str, symbol: str, start: Optional[datetime],
+                end: Optional[datetime], use_cache: bool):
+    import pandas as pd
+
+    rows = manager.get_market_data(collection, symbol=symbol, start_date=start, end_date=end,
+                                   use_cache=use_cache)
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    return frame.drop(columns=['_id'], errors='ignore').sort_values('date').reset_index(drop=True)
+
+
+def _load_tensor(args):
+    """
+    Feature store tensor of the requested symbols that have data, or None.
+
+    Older tensors of the same symbols are pruned, so new bars replace the
+    stored tensor instead of adding one per data version.
+    """
+    from data.feature_store import FeatureStore
+
+    manager = _database(args)
+    frames = {symbol: _load_frame(manager, args.collection, symbol, args.start, args.end, args.cache)
+              for symbol in args.symbols}
+    frames = {symbol: frame for symbol, frame in frames.items() if not frame.empty}
+    if not frames:
+        return None
+    store = FeatureStore(Path(args.feature_store))
+    tensor = store.get_or_build(frames)
+    store.prune(keep=1, symbols=tensor.symbols)
+    return tensor
+
+
+def run_indexes(args) -> int:
+    """Create missing indexes and optionally explain the standard queries."""
+    manager = _database(args)
+    for collection, report in manager.ensure_indexes().items():
+        print(f"{collection}: created {report['created']}, existing {report['existing']}, "
+              f"failed {sorted(report['failed'])}")
+    if args.check:
+        for query, summary in manager.check_query_plans(args.collection).items():
+            print(f"{query}: {summary}")
+    return 0
+
+
+def run_ingest(args) -> int:
+    """Upsert a CSV or Parquet file of market data keyed on (symbol, date)."""
+    import pandas as pd
+    from data.database.ingestion import DEFAULT_INGEST_BATCH_SIZE
+
+    path = Path(args.path)
+    frame = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path, parse_dates=['date'])
+    result = _database(args).upsert_market_data(args.collection, frame,
+                                                batch_size=args.batch_size or DEFAULT_INGEST_BATCH_SIZE)
+    print(f"{path}: {len(frame)} rows -> {args.collection}: {result}")
+    return 1 if result.get('errors') else 0
+
+
+def run_analyze(args) -> int:
+    """Rank indicators by mutual information with the target, one report per symbol."""
+    import pandas as pd
+    from analysis.indicator_analysis import IndicatorAnalyzer
+
+    tensor = _load_tensor(args)
+    output_dir = Path(args.output_dir)
+    for symbol in args.symbols:
+        if tensor is None or symbol not in tensor.symbols:
+            print(f"{symbol}: no data")
+            continue
+        analyzer = IndicatorAnalyzer.from_feature_tensor(tensor, symbol, importance_method=args.importance,
+                                                         n_jobs=args.jobs)
+        importance = analyzer.calculate_feature_importance()
+        output_dir.mkdir(parents=True, exist_ok=True)
+        path = output_dir / f"{symbol}_feature_importance.csv"
+        pd.DataFrame(list(importance.items()), columns=['Indicator', 'Mutual Information']).to_csv(path, index=False)
+        top = ', '.join(analyzer.get_top_indicators(n_top=args.top))
+        print(f"{symbol}: {len(analyzer.df)} rows, top indicators: {top or 'none significant'}; report {path}")
+    return 0
+
+
+def run_backtest(args) -> int:
+    """Backtest the SIGNAL_PARAMS rules on stored close prices and volumes."""
+    from backtesting.engine import BacktestEngine
+    from strategy.signals.generator import SignalEngine
+
+    tensor = _load_tensor(args)
+    if tensor is None:
+        print("No market data for the requested symbols")
+        return 1
+
+    close, volume = tensor.price_frame('close'), tensor.price_frame('volume')
+    signals = SignalEngine(close.columns).generate(close, volume)['signals']
+    results = BacktestEngine().run(signals, close)
+
+    print(f"{len(close)} bars x {close.shape[1]} symbols, trades per symbol: {results['trades'].to_dict()}")
+    for name, value in results['metrics'].items():
+        print(f"  {name:<20} {value: .4f}")
+    return 0
+
+
+def _date(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m main', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--uri', default=MONGODB_LOCAL_URI, help="MongoDB connection string")
+    parser.add_argument('--database', default=MONGODB_DATABASE)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_command(name: str, handler, help: str) -> argparse.ArgumentParser:
+        command = commands.add_parser(name, help=help, description=help)
+        command.add_argument('--collection', default=MARKET_DATA_COLLECTION)
+        command.set_defaults(handler=handler)
+        return command
+
+    indexes = add_command('indexes', run_indexes, run_indexes.__doc__)
+    indexes.add_argument('--check', action='store_true', help="Explain the standard queries and flag scans")
+
+    ingest = add_command('ingest', run_ingest, run_ingest.__doc__)
+    ingest.add_argument('path', help="CSV (with a date column) or Parquet file")
+    ingest.add_argument('--batch-size', type=int, default=None, help="Documents per bulk write")
+
+    for name, handler in (('analyze', run_analyze), ('backtest', run_backtest)):
+        command = add_command(name, handler, handler.__doc__)
+        command.add_argument('--symbols', nargs='+', required=True)
+        command.add_argument('--start', type=_date, default=None)
+        command.add_argument('--end', type=_date, default=None)
+        command.add_argument('--cache', action='store_true', help="Read through the local market data cache")
+        command.add_argument('--feature-store', default=str(FEATURE_STORE_DIR),
+                             help="Directory of the feature tensors built from the loaded data")
+        if name == 'analyze':
+            command.add_argument('--importance', choices=('exact', 'fast'), default='fast')
+            command.add_argument('--jobs', type=int, default=1)
+            command.add_argument('--top', type=int, default=10)
+            command.add_argument('--output-dir', default=str(ANALYSIS_OUTPUT_DIR))
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Main entry point for the trading system."""
-    # Initialize database connection
-    db_manager = DatabaseManager(MONGODB_LOCAL_URI, MONGODB_DATABASE)
-        
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,280 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Default histogram bucket upper bounds in seconds, from 10 microseconds to 10 seconds
+DEFAULT_BUCKETS = (
+    1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class _Metric:
+    """
+    Named metric with optional labels.
+
+    Each distinct combination of label values gets its own child holding
+    the values; ``labels`` returns that child, creating it on first use.
+    A metric without label names is its own single child.
+    """
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self
+
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Child metric for one combination of label values."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> '_Metric':
+        child = type(self).__new__(type(self))
+        child._lock = threading.Lock()
+        child._reset()
+        return child
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        """(suffix, labels, value) of every child."""
+        for key, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, key))
+            for suffix, extra, value in child._child_samples():
+                yield suffix, {**labels, **extra}, value
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. rows loaded or signals emitted."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self._reset()
+        super().__init__(name, documentation, labelnames)
+
+    def _reset(self):
+        self._value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def _child_samples(self):
+        yield '_total', {}, self._value
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. open positions or queue depth."""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self._reset()
+        super().__init__(name, documentation, labelnames)
+
+    def _reset(self):
+        self._value = 0.0
+
+    def set(self, value: float):
+        self._value = float(value)
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    def _child_samples(self):
+        yield '', {}, self._value
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values over fixed buckets, e.g. latencies.
+
+    Only per-bucket counts, the sum and the count are kept, so observing
+    is O(log buckets) and memory does not grow with the observations.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._reset()
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> 'Histogram':
+        child = type(self).__new__(type(self))
+        child._lock = threading.Lock()
+        child._buckets = self._buckets
+        child._reset()
+        return child
+
+    def _reset(self):
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float):
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the wall time spent inside the ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it."""
+        if self._count == 0:
+            return math.nan
+        rank, cumulative = q * self._count, 0
+        for bound, count in zip(self._buckets + (math.inf,), self._counts):
+            cumulative += count
+            if cumulative >= rank:
+                return bound
+        return math.inf
+
+    def _child_samples(self):
+        with self._lock:
+            counts, total, count = list(self._counts), self._sum, self._count
+        cumulative = 0
+        for bound, bucket_count in zip(self._buckets + (math.inf,), counts):
+            cumulative += bucket_count
+            yield '_bucket', {'le': '+Inf' if bound == math.inf else repr(float(bound))}, cumulative
+        yield '_sum', {}, total
+        yield '_count', {}, count
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics, exported in the Prometheus text format.
+
+    Registering a name again returns the existing metric, so modules can
+    declare the metrics they update at import time.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for name, metric in sorted(self._metrics.items()):
+            # Counter samples end in _total and parsers match metadata by sample name
+            family = f"{name}_total" if metric.kind == 'counter' else name
+            lines.append(f"# HELP {family} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {family} {metric.kind}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, float]:
+        """Flat mapping of every sample, keyed like the exposition lines."""
+        return {
+            f"{name}{suffix}{_format_labels(labels)}": value
+            for name, metric in self._metrics.items()
+            for suffix, labels, value in metric.samples()
+        }
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join('{}="{}"'.format(key, _escape(value).replace('"', '\\"')) for key, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return 'NaN'
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Registry scraped by monitoring.server
+REGISTRY = MetricsRegistry()
+
+# Metrics updated by the data, indicator and backtesting layers
+QUERY_LATENCY = REGISTRY.histogram('db_query_seconds', 'Time to run a market data query and load its rows',
+                                   ('collection',))
+ROWS_LOADED = REGISTRY.counter('db_rows_loaded', 'Market data rows loaded from MongoDB', ('collection',))
+INDICATOR_UPDATE_TIME = REGISTRY.histogram('indicator_update_seconds', 'Time to update streaming indicators by one bar',
+                                           buckets=(1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3))
+SIGNAL_COUNT = REGISTRY.counter('signals', 'Trading signals entered by the backtester', ('direction',))
@@ -0,0 +1,309 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Union
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import RISK_PARAMS
+from config.settings import MAX_POSITION_SIZE, MIN_CASH_POSITION
+
+# Portfolio construction methods supported by PortfolioOptimizer
+ALLOCATION_METHODS = ('inverse_volatility', 'risk_parity', 'mean_variance')
+
+# Bars per year used to annualise volatility
+PERIODS_PER_YEAR = 252
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+def shrinkage_covariance(returns: ArrayLike) -> np.ndarray:
+    """
+    Ledoit-Wolf covariance of a (time x asset) returns window.
+
+    Shrinks the sample covariance towards a scaled identity, which keeps the
+    estimate well conditioned when there are about as many assets as bars.
+    Missing returns are treated as the asset's mean return, so they add
+    no covariance.
+    """
+    from sklearn.covariance import ledoit_wolf
+
+    returns = np.asarray(returns, dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        means = np.nanmean(returns, axis=0)
+    centred = np.nan_to_num(returns - np.nan_to_num(means), nan=0.0)
+    covariance, _ = ledoit_wolf(centred, assume_centered=True)
+    return covariance
+
+
+def cap_weights(weights: np.ndarray, max_weight: float, budget: float, tol: float = 1e-12) -> np.ndarray:
+    """
+    Scale non-negative weights to ``budget`` without exceeding ``max_weight``.
+
+    Finds the scale ``s`` with ``sum(min(s * w, max_weight)) == budget``, so
+    capped assets hand their excess to the others in proportion to their
+    weight. When every asset with weight is capped before the budget is
+    reached, the remainder stays in cash.
+    """
+    weights = np.maximum(np.nan_to_num(weights), 0.0)
+    total = weights.sum()
+    if total <= 0:
+        return weights
+    if max_weight * np.count_nonzero(weights) <= budget:
+        return np.where(weights > 0, max_weight, 0.0)
+
+    low, high = 0.0, budget / total
+    while np.minimum(high * weights, max_weight).sum() < budget:
+        high *= 2
+    for _ in range(100):
+        middle = 0.5 * (low + high)
+        if np.minimum(middle * weights, max_weight).sum() < budget:
+            low = middle
+        else:
+            high = middle
+        if high - low <= tol * high:
+            break
+    return np.minimum(high * weights, max_weight)
+
+
+def project_capped_simplex(values: np.ndarray, max_weight: float, budget: float,
+                           tol: float = 1e-12) -> np.ndarray:
+    """
+    Euclidean projection onto ``{w : 0 <= w <= max_weight, sum(w) <= budget}``.
+
+    The projection is ``clip(values - tau, 0, max_weight)`` for the smallest
+    ``tau >= 0`` that meets the budget, found by bisection.
+    """
+    clipped = np.clip(values, 0.0, max_weight)
+    if clipped.sum() <= budget:
+        return clipped
+
+    low, high = 0.0, float(np.max(values))
+    for _ in range(100):
+        middle = 0.5 * (low + high)
+        if np.clip(values - middle, 0.0, max_weight).sum() > budget:
+            low = middle
+        else:
+            high = middle
+        if high - low <= tol * max(high, 1.0):
+            break
+    return np.clip(values - high, 0.0, max_weight)
+
+
+def risk_parity_weights(covariance: np.ndarray, initial: Optional[np.ndarray] = None,
+                        risk_budgets: Optional[np.ndarray] = None,
+                        max_iter: int = 50, tol: float = 1e-10) -> np.ndarray:
+    """
+    Long-only weights whose risk contributions match ``risk_budgets``.
+
+    Minimises the convex ``0.5 y'Cy - sum(b log y)`` with damped Newton
+    steps; its minimiser normalised to sum to one is the risk budgeting
+    portfolio. Warm-starting from the previous weights saves most of the
+    Newton steps when the covariance changes little.
+
+    Returns:
+        Weights summing to one
+    """
+    n = covariance.shape[0]
+    budgets = np.full(n, 1.0 / n) if risk_budgets is None else risk_budgets / risk_budgets.sum()
+    if initial is None or not np.all(initial > 0):
+        y = 1.0 / np.sqrt(np.maximum(np.diag(covariance), 1e-16))
+    else:
+        y = np.asarray(initial, dtype=np.float64).copy()
+    # Start on the scale of the optimum, where y'Cy = sum(b)
+    y *= 1.0 / np.sqrt(max(y @ covariance @ y, 1e-300))
+
+    def objective(y):
+        return 0.5 * y @ covariance @ y - budgets @ np.log(y)
+
+    value = objective(y)
+    for _ in range(max_iter):
+        gradient = covariance @ y - budgets / y
+        hessian = covariance + np.diag(budgets / y ** 2)
+        step = np.linalg.solve(hessian, gradient)
+        decrement = gradient @ step
+        if decrement / 2 <= tol:
+            break
+        # Stay strictly positive, then backtrack until the objective falls
+        shrinking = step > 0
+        t = min(1.0, 0.99 * np.min(y[shrinking] / step[shrinking])) if shrinking.any() else 1.0
+        while t > 1e-12:
+            candidate = y - t * step
+            candidate_value = objective(candidate)
+            if candidate_value <= value - 0.25 * t * decrement:
+                break
+            t *= 0.5
+        y, value = candidate, candidate_value
+    return y / y.sum()
+
+
+def mean_variance_weights(covariance: np.ndarray, expected_returns: np.ndarray,
+                          risk_aversion: float, max_weight: float, budget: float,
+                          initial: Optional[np.ndarray] = None,
+                          max_iter: int = 500, tol: float = 1e-9) -> np.ndarray:
+    """
+    Long-only mean-variance weights with a per-asset cap and a budget.
+
+    Maximises ``mu'w - risk_aversion / 2 * w'Cw`` subject to
+    ``0 <= w <= max_weight`` and ``sum(w) <= budget`` with accelerated
+    projected gradient (FISTA with adaptive restart). Each iteration costs
+    one matrix-vector product and a projection, and warm-starting from the
+    previous rebalance leaves only the change to solve for.
+    """
+    n = covariance.shape[0]
+    # Lipschitz constant of the gradient: largest eigenvalue by power iteration
+    vector = np.ones(n) / np.sqrt(n)
+    for _ in range(30):
+        product = covariance @ vector
+        norm = np.linalg.norm(product)
+        if norm == 0:
+            break
+        vector = product / norm
+    lipschitz = max(risk_aversion * norm * 1.01, 1e-12)
+
+    w = project_capped_simplex(np.zeros(n) if initial is None else initial, max_weight, budget)
+    z, momentum = w.copy(), 1.0
+    for _ in range(max_iter):
+        gradient = risk_aversion * (covariance @ z) - expected_returns
+        w_next = project_capped_simplex(z - gradient / lipschitz, max_weight, budget)
+        if gradient @ (w_next - w) > 0:
+            # Momentum is pushing uphill: restart it (O'Donoghue and Candes)
+            momentum = 1.0
+        momentum_next = 0.5 * (1 + np.sqrt(1 + 4 * momentum ** 2))
+        z = w_next + ((momentum - 1) / momentum_next) * (w_next - w)
+        converged = np.max(np.abs(w_next - w)) <= tol
+        w, momentum = w_next, momentum_next
+        if converged:
+            break
+    return w
+
+
+class PortfolioOptimizer:
+    """
+    Constrained long-only portfolio construction, rebalanced bar by bar.
+
+    Methods:
+        inverse_volatility: weights proportional to 1 / asset volatility
+        risk_parity: equal risk contributions
+        mean_variance: maximise expected return minus a variance penalty
+
+    Every method works on a Ledoit-Wolf shrinkage covariance of the returns
+    window, keeps each weight at most ``max_weight`` and invests at most
+    ``budget`` (one minus the minimum cash position). With
+    ``target_volatility`` set, the portfolio is then scaled down whenever
+    its annualised volatility would exceed the target; it is never
+    levered above the budget.
+
+    The weights of each rebalance are kept per symbol and used to
+    warm-start the next one, so consecutive bars, whose covariance barely
+    changes, converge in a few iterations even when the universe changes.
+    """
+
+    def __init__(self,
+                 method: str = 'risk_parity',
+                 max_weight: float = MAX_POSITION_SIZE,
+                 budget: float = 1.0 - MIN_CASH_POSITION,
+                 target_volatility: Optional[float] = RISK_PARAMS['target_volatility'],
+                 risk_aversion: float = 10.0,
+                 periods_per_year: int = PERIODS_PER_YEAR):
+        if method not in ALLOCATION_METHODS:
+            raise ValueError(f"method must be one of {ALLOCATION_METHODS}")
+        self.method = method
+        self.max_weight = max_weight
+        self.budget = budget
+        self.target_volatility = target_volatility
+        self.risk_aversion = risk_aversion
+        self.periods_per_year = periods_per_year
+        self.weights = pd.Series(dtype=np.float64)
+        # Solver output of the last rebalance, before caps and the volatility
+        # overlay, used as the next warm start
+        self._solution = pd.Series(dtype=np.float64)
+
+    def rebalance(self, returns: pd.DataFrame,
+                  expected_returns: Optional[pd.Series] = None) -> pd.Series:
+        """
+        Target weights for the next bar.
+
+        Args:
+            returns: (time x symbol) window of per-bar returns; symbols with
+                fewer than two returns in the window get no weight
+            expected_returns: Per-bar expected return per symbol (e.g. model
+                predictions), required for ``mean_variance``
+
+        Returns:
+            Weights indexed by symbol; the rest of the capital is cash
+        """
+        if self.method == 'mean_variance' and expected_returns is None:
+            raise ValueError("mean_variance needs expected_returns")
+
+        usable = returns.columns[returns.notna().sum().to_numpy() >= 2]
+        weights = pd.Series(0.0, index=returns.columns)
+        if len(usable) == 0:
+            self.weights = weights
+            return weights
+
+        covariance = shrinkage_covariance(returns[usable])
+        solution = self._solve(covariance, usable, expected_returns)
+
+        if self.target_volatility is not None:
+            volatility = np.sqrt(max(solution @ covariance @ solution, 0.0) * self.periods_per_year)
+            if volatility > self.target_volatility:
+                solution = solution * (self.target_volatility / volatility)
+
+        weights[usable] = solution
+        self.weights = weights
+        return weights
+
+    def _solve(self, covariance: np.ndarray, symbols: pd.Index,
+               expected_returns: Optional[pd.Series]) -> np.ndarray:
+        inverse_volatility = 1.0 / np.sqrt(np.maximum(np.diag(covariance), 1e-16))
+        if self.method == 'inverse_volatility':
+            return cap_weights(inverse_volatility, self.max_weight, self.budget)
+
+        previous = self._solution.reindex(symbols).to_numpy()
+        if self.method == 'risk_parity':
+            # Symbols new to the universe start from their inverse volatility share
+            fallback = inverse_volatility / inverse_volatility.sum()
+            initial = np.where(np.isnan(previous) | ~(previous > 0), fallback, previous)
+            raw = risk_parity_weights(covariance, initial)
+            self._solution = pd.Series(raw, index=symbols)
+            return cap_weights(raw, self.max_weight, self.budget)
+
+        mu = expected_returns.reindex(symbols).fillna(0.0).to_numpy(dtype=np.float64)
+        solution = mean_variance_weights(covariance, mu, self.risk_aversion, self.max_weight,
+                                         self.budget, np.nan_to_num(previous))
+        self._solution = pd.Series(solution, index=symbols)
+        return solution
+
+    def risk_contributions(self, returns: pd.DataFrame,
+                           weights: Optional[pd.Series] = None) -> pd.Series:
+        """Share of portfolio variance contributed by each symbol."""
+        weights = self.weights if weights is None else weights
+        usable = weights.index[weights > 0]
+        if len(usable) == 0:
+            return pd.Series(0.0, index=weights.index)
+        covariance = shrinkage_covariance(returns[usable])
+        w = weights[usable].to_numpy()
+        contributions = w * (covariance @ w)
+        result = pd.Series(0.0, index=weights.index)
+        result[usable] = contributions / contributions.sum()
+        return result
+
+    def summary(self, returns: pd.DataFrame) -> Dict[str, float]:
+        """Invested fraction, cash, largest weight and annualised volatility of the current weights."""
+        usable = self.weights.index[self.weights > 0]
+        volatility = 0.0
+        if len(usable):
+            w = self.weights[usable].to_numpy()
+            volatility = float(np.sqrt(w @ shrinkage_covariance(returns[usable]) @ w * self.periods_per_year))
+        invested = float(self.weights.sum())
+        return {
+            'invested': invested,
+            'cash': 1.0 - invested,
+            'max_weight': float(self.weights.max()) if len(self.weights) else 0.0,
+            'volatility': volatility
+        }
@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils.metrics import VAR_CONFIDENCE, historical_tail_risk, tail_size
+
+# Value at risk estimators supported by RiskEngine
+RISK_METHODS = ('historical', 'parametric', 'monte_carlo')
+
+# Monte Carlo scenarios drawn per estimate
+DEFAULT_SIMULATIONS = 100_000
+
+# Simulated returns held in memory at once per worker
+DEFAULT_CHUNK_BYTES = 64 * 2 ** 20
+
+WeightsLike = Union[pd.Series, pd.DataFrame]
+
+
+def sample_moments(returns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean returns and pairwise-complete sample covariance of a (time x asset) window.
+
+    Missing returns are treated as the asset's mean; each covariance is
+    normalised by the number of bars where both assets have a return.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    present = (~np.isnan(returns)).astype(np.float64)
+    with np.errstate(invalid='ignore'):
+        means = np.nanmean(returns, axis=0)
+    centred = np.nan_to_num(returns - means)
+    counts = present.T @ present
+    with np.errstate(invalid='ignore', divide='ignore'):
+        covariance = (centred.T @ centred) / (counts - 1)
+    return means, np.where(counts > 1, covariance, 0.0)
+
+
+def parametric_tail_risk(means: np.ndarray, std: np.ndarray,
+                         confidence: float = VAR_CONFIDENCE) -> Tuple[np.ndarray, np.ndarray]:
+    """Gaussian value at risk and expected shortfall, as returns (negative for a loss)."""
+    from scipy.stats import norm
+
+    alpha = 1 - confidence
+    z = norm.ppf(alpha)
+    return means + std * z, means - std * norm.pdf(z) / alpha
+
+
+def covariance_factor(covariance: np.ndarray, tol: float = 1e-12) -> np.ndarray:
+    """
+    Matrix ``F`` with ``F @ F.T == covariance``, for drawing correlated scenarios.
+
+    Uses the eigendecomposition rather than Cholesky, so singular estimates
+    (more assets than bars) and slightly indefinite pairwise covariances
+    work; components with non-positive variance are dropped.
+    """
+    values, vectors = np.linalg.eigh(covariance)
+    keep = values > tol * max(values.max(), 0.0) if len(values) else values > 0
+    return vectors[:, keep] * np.sqrt(values[keep])
+
+
+def _simulate_tail(factor: np.ndarray, means: np.ndarray, weights: np.ndarray,
+                   chunk_sizes: Sequence[int], seeds: Sequence[np.random.SeedSequence],
+                   k: int, degrees_of_freedom: Optional[float]) -> np.ndarray:
+    """
+    Worst ``k`` simulated returns of every asset and portfolio.
+
+    Scenarios are drawn chunk by chunk, each chunk from its own seed, and
+    only the running tail is kept, so memory is bounded by one chunk.
+    """
+    n_columns = len(means) + len(weights)
+    tail = np.full((0, n_columns), np.nan)
+    for size, seed in zip(chunk_sizes, seeds):
+        rng = np.random.default_rng(seed)
+        shocks = rng.standard_normal((size, factor.shape[1])) @ factor.T
+        if degrees_of_freedom is not None:
+            # Multivariate Student-t, rescaled to keep the covariance
+            mixing = np.sqrt((degrees_of_freedom - 2) / rng.chisquare(degrees_of_freedom, size))
+            shocks *= mixing[:, None]
+        assets = shocks + means
+        scenarios = np.hstack([assets, assets @ weights.T])
+        merged = np.vstack([tail, scenarios])
+        tail = np.partition(merged, k - 1, axis=0)[:k] if len(merged) > k else merged
+    return tail
+
+
+class RiskEngine:
+    """
+    Value at risk and expected shortfall for every asset and portfolio at once.
+
+    Methods:
+        historical: empirical tail of the returns window
+        parametric: Gaussian with the sample mean and covariance
+        monte_carlo: simulated Gaussian (or Student-t) scenarios with the
+            sample mean and covariance
+
+    Assets are columns of one (time x asset) matrix and portfolios are rows
+    of one weights matrix, so each method is a handful of matrix operations
+    whatever the universe size. VaR and expected shortfall are one-bar
+    returns, negative for a loss, like ``utils.metrics``.
+
+    Monte Carlo scenarios are drawn in chunks of at most ``chunk_bytes`` and
+    reduced to their worst ``(1 - confidence)`` tail as they go. Every chunk
+    has its own seed spawned from ``seed``, so results are reproducible and
+    do not depend on ``n_jobs``, which splits the chunks across processes.
+    """
+
+    def __init__(self,
+                 confidence: float = VAR_CONFIDENCE,
+                 n_simulations: int = DEFAULT_SIMULATIONS,
+                 degrees_of_freedom: Optional[float] = None,
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                 n_jobs: int = 1,
+                 seed: int = 0):
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be between 0 and 1")
+        if degrees_of_freedom is not None and degrees_of_freedom <= 2:
+            raise ValueError("degrees_of_freedom must be above 2 for a finite covariance")
+        self.confidence = confidence
+        self.n_simulations = n_simulations
+        self.degrees_of_freedom = degrees_of_freedom
+        self.chunk_bytes = chunk_bytes
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+    def compute(self, returns: pd.DataFrame, weights: Optional[WeightsLike] = None,
+                methods: Iterable[str] = RISK_METHODS) -> pd.DataFrame:
+        """
+        Risk of every asset in ``returns`` and every portfolio in ``weights``.
+
+        Args:
+            returns: (time x symbol) window of per-bar returns; NaN where a
+                symbol has no return
+            weights: Series of weights by symbol for one portfolio, or a
+                (portfolio x symbol) DataFrame; missing symbols weigh zero
+            methods: Subset of ``RISK_METHODS``
+
+        Returns:
+            DataFrame indexed by symbol then portfolio name, with a
+            ``<method>_var`` and a ``<method>_es`` column per method
+        """
+        methods = list(methods)
+        unknown = set(methods) - set(RISK_METHODS)
+        if unknown:
+            raise ValueError(f"Unknown risk methods {sorted(unknown)}; expected {RISK_METHODS}")
+
+        portfolios = self._weights_frame(weights, returns.columns)
+        values = returns.to_numpy(dtype=np.float64)
+        weight_matrix = portfolios.to_numpy(dtype=np.float64)
+        index = list(returns.columns) + list(portfolios.index)
+        result = pd.DataFrame(index=index, dtype=np.float64)
+
+        needs_moments = {'parametric', 'monte_carlo'} & set(methods)
+        if needs_moments:
+            means, covariance = sample_moments(values)
+
+        for method in methods:
+            if method == 'historical':
+                # A symbol without a return this bar contributes nothing to the portfolio
+                portfolio_returns = np.nan_to_num(values) @ weight_matrix.T
+                var, es = historical_tail_risk(np.hstack([values, portfolio_returns]), self.confidence)
+            elif method == 'parametric':
+                variances = np.concatenate([
+                    np.diag(covariance),
+                    np.einsum('pi,ij,pj->p', weight_matrix, covariance, weight_matrix)
+                ])
+                std = np.sqrt(np.maximum(variances, 0.0))
+                var, es = parametric_tail_risk(np.concatenate([means, weight_matrix @ np.nan_to_num(means)]), std,
+                                               self.confidence)
+            else:
+                var, es = self.monte_carlo(means, covariance, weight_matrix)
+            result[f'{method}_var'] = var
+            result[f'{method}_es'] = es
+        return result
+
+    def monte_carlo(self, means: np.ndarray, covariance: np.ndarray,
+                    weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simulated VaR and expected shortfall of the assets, then the portfolios.
+
+        Args:
+            means: Mean return per asset, shape (assets,)
+            covariance: Return covariance, shape (assets, assets)
+            weights: Portfolio weights, shape (portfolios, assets)
+
+        Returns:
+            Tuple (var, expected_shortfall) of arrays of shape (assets + portfolios,)
+        """
+        means = np.nan_to_num(np.asarray(means, dtype=np.float64))
+        weights = np.zeros((0, len(means))) if weights is None else np.atleast_2d(weights)
+        factor = covariance_factor(np.nan_to_num(covariance))
+        n_columns = len(means) + len(weights)
+
+        k = int(tail_size(self.n_simulations, self.confidence))
+        row_bytes = 8 * (n_columns + factor.shape[1])
+        chunk_size = max(self.chunk_bytes // max(row_bytes, 1), 1)
+        chunk_sizes = self._chunk_sizes(chunk_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunk_sizes))
+
+        tasks = [
+            (sizes.tolist(), [seeds[i] for i in indices])
+            for indices, sizes in zip(np.array_split(np.arange(len(chunk_sizes)), self.n_jobs),
+                                      np.array_split(np.asarray(chunk_sizes), self.n_jobs))
+            if len(indices)
+        ]
+        if self.n_jobs > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = [executor.submit(_simulate_tail, factor, means, weights, sizes, task_seeds, k,
+                                           self.degrees_of_freedom)
+                           for sizes, task_seeds in tasks]
+                tails = [future.result() for future in futures]
+        else:
+            tails = [_simulate_tail(factor, means, weights, sizes, task_seeds, k, self.degrees_of_freedom)
+                     for sizes, task_seeds in tasks]
+
+        tail = np.partition(np.vstack(tails), k - 1, axis=0)[:k]
+        return tail.max(axis=0), tail.mean(axis=0)
+
+    def _chunk_sizes(self, chunk_size: int) -> List[int]:
+        full, remainder = divmod(self.n_simulations, chunk_size)
+        return [chunk_size] * full + ([remainder] if remainder else [])
+
+    @staticmethod
+    def _weights_frame(weights: Optional[WeightsLike], symbols: pd.Index) -> pd.DataFrame:
+        if weights is None:
+            return pd.DataFrame(columns=symbols, dtype=np.float64)
+        if isinstance(weights, pd.Series):
+            weights = weights.to_frame(weights.name or 'portfolio').T
+        return weights.reindex(columns=symbols).fillna(0.0)
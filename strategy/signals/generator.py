@@ -0,0 +1,211 @@
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Union
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import SIGNAL_PARAMS
+
+# The short volatility window is ``lookback_periods`` divided by this
+SHORT_VOLATILITY_DIVISOR = 4
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+def threshold_signals(predictions: np.ndarray, threshold) -> np.ndarray:
+    """
+    Direction of each predicted return: 1 above ``threshold``, -1 below ``-threshold``, else 0.
+
+    ``threshold`` may be an array broadcasting against ``predictions``, e.g.
+    one threshold per leading axis entry in a parameter sweep.
+    """
+    return np.where(predictions > threshold, np.int8(1),
+                    np.where(predictions < -threshold, np.int8(-1), np.int8(0)))
+
+
+def signal_rule(momentum: np.ndarray,
+                volume_ratio: np.ndarray,
+                confidence,
+                momentum_threshold,
+                volume_threshold,
+                min_confidence,
+                volatility_ratio: Optional[np.ndarray] = None,
+                volatility_threshold=None) -> np.ndarray:
+    """
+    ``SIGNAL_PARAMS`` entry rule as int8 directions.
+
+    A bar goes long (short) when momentum is above (below) plus/minus
+    ``momentum_threshold``, the volume ratio exceeds ``volume_threshold``
+    and confidence is at least ``min_confidence``. With a volatility ratio,
+    bars whose short-term volatility has expanded beyond
+    ``volatility_threshold`` times its lookback level stay flat. NaN inputs
+    never signal. Thresholds may be arrays broadcasting against the
+    inputs, so one call evaluates a whole parameter grid.
+    """
+    with np.errstate(invalid='ignore'):
+        active = ((np.abs(momentum) > momentum_threshold) &
+                  (volume_ratio > volume_threshold) &
+                  (confidence >= min_confidence))
+        if volatility_ratio is not None:
+            active &= ~(volatility_ratio > volatility_threshold)
+    return np.where(active, np.sign(np.nan_to_num(momentum)), 0).astype(np.int8)
+
+
+def _ordered_mean(values: List[np.ndarray]) -> np.ndarray:
+    total = values[0].copy()
+    for value in values[1:]:
+        total += value
+    return total / len(values)
+
+
+def _ordered_std(values: List[np.ndarray]) -> np.ndarray:
+    mean = _ordered_mean(values)
+    total = (values[0] - mean) * (values[0] - mean)
+    for value in values[1:]:
+        total += (value - mean) * (value - mean)
+    return np.sqrt(total / (len(values) - 1))
+
+
+def signal_features(closes: List[np.ndarray], volumes: List[np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Momentum, volatility ratio and volume ratio at the last bar of a window.
+
+    Window sums are accumulated bar by bar in time order, so the batch
+    mode (arrays of many bars) and the live mode (arrays of one bar) give
+    bit-identical features.
+
+    Args:
+        closes: ``lookback + 1`` close arrays, oldest first
+        volumes: ``lookback + 1`` volume arrays, oldest first
+
+    Returns:
+        ``momentum`` (return over the lookback), ``volatility_ratio``
+        (standard deviation of the last ``lookback // 4`` returns over that
+        of the whole lookback) and ``volume_ratio`` (last volume over the
+        mean of the ``lookback`` volumes before it)
+    """
+    lookback = len(closes) - 1
+    short = max(2, lookback // SHORT_VOLATILITY_DIVISOR)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns = [closes[i] / closes[i - 1] - 1 for i in range(1, lookback + 1)]
+        return {
+            'momentum': closes[-1] / closes[0] - 1,
+            'volatility_ratio': _ordered_std(returns[-short:]) / _ordered_std(returns),
+            'volume_ratio': volumes[-1] / _ordered_mean(volumes[:-1])
+        }
+
+
+class SignalEngine:
+    """
+    Entry signals from ``SIGNAL_PARAMS`` and model confidence over a (time x symbol) panel.
+
+    ``generate`` evaluates a whole history at once; ``update`` consumes one
+    bar at a time for live trading and keeps only the last
+    ``lookback_periods + 1`` bars. Both share ``signal_features`` and
+    ``signal_rule``, so feeding the history bar by bar through ``update``
+    reproduces ``generate`` exactly.
+
+    Signals are int8 directions (1 long, -1 short, 0 flat) and come with a
+    float32 confidence score: the model confidence on signalling bars, 0
+    elsewhere. Without model confidence every bar has confidence 1, so only
+    the rules decide.
+    """
+
+    def __init__(self, symbols: Sequence[str], params: Optional[Dict] = None):
+        self.symbols = list(symbols)
+        self.params = {**SIGNAL_PARAMS, **(params or {})}
+        self.lookback = int(self.params['lookback_periods'])
+        if self.lookback < 2:
+            raise ValueError("lookback_periods must be at least 2")
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._closes = deque(maxlen=self.lookback + 1)
+        self._volumes = deque(maxlen=self.lookback + 1)
+
+    def _decide(self, features: Dict[str, np.ndarray], confidence: np.ndarray):
+        p = self.params
+        signals = signal_rule(features['momentum'], features['volume_ratio'], confidence,
+                              p['momentum_threshold'], p['volume_threshold'], p['min_confidence'],
+                              features['volatility_ratio'], p['volatility_threshold'])
+        scores = np.where(signals != 0, confidence, 0.0).astype(np.float32)
+        return signals, scores
+
+    def generate(self, close: ArrayLike, volume: ArrayLike,
+                 confidence: Optional[ArrayLike] = None) -> Dict:
+        """
+        Signals for every bar of a history.
+
+        Args:
+            close: Close prices, shape (time, symbols); NaN where a symbol
+                has no bar
+            volume: Volumes, same shape
+            confidence: Model confidence in [0, 1], same shape
+
+        Returns:
+            Dictionary with int8 ``signals`` and float32 ``confidence``,
+            DataFrames when ``close`` is one. The first ``lookback_periods``
+            bars are flat.
+        """
+        index = close.index if isinstance(close, pd.DataFrame) else None
+        columns = close.columns if isinstance(close, pd.DataFrame) else None
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        confidence = np.ones_like(close) if confidence is None else np.asarray(confidence, dtype=np.float64)
+
+        n_bars = close.shape[0]
+        signals = np.zeros(close.shape, dtype=np.int8)
+        scores = np.zeros(close.shape, dtype=np.float32)
+        if n_bars > self.lookback:
+            # Window slices: entry i holds bar t - lookback + i for every t at once
+            span = n_bars - self.lookback
+            closes = [close[i:i + span] for i in range(self.lookback + 1)]
+            volumes = [volume[i:i + span] for i in range(self.lookback + 1)]
+            signals[self.lookback:], scores[self.lookback:] = self._decide(
+                signal_features(closes, volumes), confidence[self.lookback:])
+
+        if index is not None:
+            return {'signals': pd.DataFrame(signals, index=index, columns=columns),
+                    'confidence': pd.DataFrame(scores, index=index, columns=columns)}
+        return {'signals': signals, 'confidence': scores}
+
+    def update(self, close, volume, confidence=None) -> Dict[str, np.ndarray]:
+        """
+        Consume one bar and return its signals.
+
+        Args:
+            close: Closes in ``symbols`` order, or mapping of symbol to close;
+                NaN or missing symbols have no bar
+            volume: Volumes, same form
+            confidence: Model confidence, same form
+
+        Returns:
+            Dictionary with int8 ``signals`` and float32 ``confidence`` in
+            ``symbols`` order; flat until ``lookback_periods + 1`` bars are seen
+        """
+        self._closes.append(self._as_vector(close))
+        self._volumes.append(self._as_vector(volume))
+        confidence = np.ones(len(self.symbols)) if confidence is None else self._as_vector(confidence)
+
+        if len(self._closes) <= self.lookback:
+            return {'signals': np.zeros(len(self.symbols), dtype=np.int8),
+                    'confidence': np.zeros(len(self.symbols), dtype=np.float32)}
+        signals, scores = self._decide(signal_features(list(self._closes), list(self._volumes)), confidence)
+        return {'signals': signals, 'confidence': scores}
+
+    def _as_vector(self, values) -> np.ndarray:
+        if isinstance(values, (dict, pd.Series)):
+            vector = np.full(len(self.symbols), np.nan)
+            for symbol, value in values.items():
+                if symbol in self._index:
+                    vector[self._index[symbol]] = value
+            return vector
+        # Copied, since the window keeps it after the caller's array changes
+        vector = np.array(values, dtype=np.float64)
+        if vector.shape != (len(self.symbols),):
+            raise ValueError(f"Expected {len(self.symbols)} values, got shape {vector.shape}")
+        return vector
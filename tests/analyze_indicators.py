@@ -1,12 +1,15 @@
+import os
 import sys
+import time
+import argparse
+import traceback
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
 import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
-from scipy.stats import pearsonr
-import matplotlib.pyplot as plt
-import seaborn as sns
 
 # Add project root to path
 project_root = str(Path(__file__).resolve().parent.parent)
@@ -15,80 +18,98 @@ if project_root not in sys.path:
 
 from utils.mongodb_utils import MongoDBManager
 from utils.logger import setup_logger
+from data.cache import MarketDataCache
+from data.feature_store import forward_return
+from analysis.correlation import correlated_pairs, nan_pearson
+from config.analysis_config import RISK_PARAMS
 
 # Setup logging
 logger = setup_logger('enhanced_indicator_analysis')
 
+# MongoDB source of the indicator-enriched time series
+MONGO_URI = "mongodb://localhost:27017/"
+DB_NAME = "crypto_data_db"
+COLLECTION_NAME = "crypto_time_series_with_technical_indicators"
+OUTPUT_DIR = Path("analysis_output")
+
 def analyze_predictive_power_enhanced(data: pd.DataFrame, 
                                     forward_periods: list = [1, 3, 5, 10],
                                     correlation_threshold: float = 0.1,
                                     pvalue_threshold: float = 0.05):
     """
     Enhanced analysis of indicators' predictive power over different time horizons.
+
+    The full indicator x horizon Pearson correlation and p-value matrix is
+    computed in one pass; each pair uses the rows where both are non-NaN.
+    Forward returns are read from the feature store's ``forward_return_<h>``
+    columns when ``data`` has them.
     """
     results = {}
     price_changes = {}
     
-    # Calculate price changes for different periods
+    # Price changes for different periods, unless the feature store already computed them
     for period in forward_periods:
-        price_changes[period] = data['close'].astype(float).pct_change(period).shift(-period)
+        stored = f'forward_return_{period}'
+        if stored in data.columns:
+            price_changes[period] = data[stored].to_numpy(dtype=float)
+        else:
+            price_changes[period] = forward_return(data['close'].to_numpy(dtype=float), period)
     
     # Get numeric columns only
-    numeric_columns = data.select_dtypes(include=[np.number]).columns
+    numeric_columns = [
+        column for column in data.select_dtypes(include=[np.number]).columns
+        if column not in ['date', 'symbol', 'close', 'open', 'high', 'low', 'volume']
+        and not column.startswith('forward_return_')
+    ]
+    if not numeric_columns or not forward_periods:
+        return results
     
-    # Analyze indicators
-    for column in numeric_columns:
-        if column in ['date', 'symbol', 'close', 'open', 'high', 'low', 'volume']:
-            continue
-            
-        # Ensure data is clean and numeric
-        indicator_data = pd.to_numeric(data[column], errors='coerce')
-        indicator_results = {}
-        
-        for period, changes in price_changes.items():
-            # Remove any NaN values
-            mask = ~(indicator_data.isna() | changes.isna())
-            if mask.sum() < 2:  # Need at least 2 points for correlation
-                continue
-                
-            try:
-                # Calculate correlation
-                correlation, p_value = pearsonr(
-                    indicator_data[mask].values,
-                    changes[mask].values
-                )
-                
-                # Store if significant
-                if abs(correlation) > correlation_threshold and p_value < pvalue_threshold:
-                    indicator_results[period] = {
-                        'correlation': correlation,
-                        'p_value': p_value
-                    }
-            except Exception as e:
-                logger.warning(f"Error calculating correlation for {column} at period {period}: {str(e)}")
-                continue
+    # Correlate every indicator with every horizon in one NaN-aware pass
+    indicators = data[numeric_columns].to_numpy(dtype=float, na_value=np.nan)
+    changes = np.column_stack([price_changes[period] for period in forward_periods])
+    correlations, p_values, _ = nan_pearson(indicators, changes)
+    
+    significant = (np.abs(correlations) > correlation_threshold) & (p_values < pvalue_threshold)
+    
+    for i, column in enumerate(numeric_columns):
+        indicator_results = {
+            period: {
+                'correlation': correlations[i, j],
+                'p_value': p_values[i, j]
+            }
+            for j, period in enumerate(forward_periods)
+            if significant[i, j]
+        }
         
         if indicator_results:
             results[column] = indicator_results
     
     return results
 
-def analyze_technical_indicators_enhanced(symbol: str = "BTC-USD"):
-    """Enhanced analysis of technical indicators for a specific symbol."""
+def analyze_technical_indicators_enhanced(symbol: str = "BTC-USD", use_cache: bool = True,
+                                          mongo_uri: str = MONGO_URI,
+                                          db_name: str = DB_NAME,
+                                          collection_name: str = COLLECTION_NAME,
+                                          output_dir: Path = OUTPUT_DIR):
+    """
+    Enhanced analysis of technical indicators for a specific symbol.
+
+    With ``use_cache`` the symbol's history is served from the local columnar
+    cache and only rows newer than the cached watermark are read from MongoDB.
+    """
     try:
         # Initialize MongoDB connection
-        mongo_uri = "mongodb://localhost:27017/"
-        db_name = "crypto_data_db"
-        collection_name = "crypto_time_series_with_technical_indicators"
-        
         db_manager = MongoDBManager(mongo_uri, db_name)
         
         # Fetch data for the symbol
-        data = db_manager.get_dataframe(
-            collection_name,
-            query={"symbol": symbol},
-            sort_by=[("date", 1)]
-        )
+        if use_cache:
+            data = MarketDataCache(db_manager.db, collection_name).load(symbol)
+        else:
+            data = db_manager.get_dataframe(
+                collection_name,
+                query={"symbol": symbol},
+                sort_by=[("date", 1)]
+            )
         
         # Convert price columns to float
         price_columns = ['close', 'open', 'high', 'low']
@@ -144,14 +165,19 @@ def analyze_technical_indicators_enhanced(symbol: str = "BTC-USD"):
                               f"p-value={metrics['p_value']:.4f}")
         
         # Calculate correlation matrix for top indicators
+        artifacts = []
         top_indicator_names = list(top_indicators.keys())
         if top_indicator_names:
             correlation_matrix = data[top_indicator_names].corr()
             
             # Create output directory if it doesn't exist
-            output_dir = Path("analysis_output")
+            output_dir = Path(output_dir)
             output_dir.mkdir(exist_ok=True)
             
+            # Plotting libraries are only needed for this artifact
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
             # Save correlation matrix plot
             plt.figure(figsize=(12, 8))
             sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0)
@@ -159,27 +185,27 @@ def analyze_technical_indicators_enhanced(symbol: str = "BTC-USD"):
             plt.tight_layout()
             plt.savefig(output_dir / f"{symbol}_correlation_matrix.png")
             plt.close()
+            artifacts.append(output_dir / f"{symbol}_correlation_matrix.png")
             
             # Identify highly correlated pairs
             logger.info("\nHighly Correlated Indicator Pairs:")
-            for i in range(len(top_indicator_names)):
-                for j in range(i+1, len(top_indicator_names)):
-                    correlation = correlation_matrix.iloc[i, j]
-                    if abs(correlation) > 0.7:  # Threshold for high correlation
-                        logger.info(f"{top_indicator_names[i]} & {top_indicator_names[j]}: "
-                                  f"{correlation:.4f}")
+            for first, second, correlation in correlated_pairs(
+                    correlation_matrix.to_numpy(), top_indicator_names, RISK_PARAMS['max_correlation']):
+                logger.info(f"{first} & {second}: {correlation:.4f}")
             
             # Save indicator importance report
             report = pd.DataFrame(list(top_indicators.items()), 
                                 columns=['Indicator', 'Predictive Score'])
             report.to_csv(output_dir / f"{symbol}_indicator_importance.csv", index=False)
+            artifacts.append(output_dir / f"{symbol}_indicator_importance.csv")
             
             logger.info(f"\nAnalysis artifacts saved to {output_dir}")
         
         return {
             'top_indicators': top_indicators,
             'predictive_results': predictive_results,
-            'correlation_matrix': correlation_matrix if top_indicator_names else None
+            'correlation_matrix': correlation_matrix if top_indicator_names else None,
+            'artifacts': artifacts
         }
         
     except Exception as e:
@@ -187,9 +213,110 @@ def analyze_technical_indicators_enhanced(symbol: str = "BTC-USD"):
         logger.error("Error details:", exc_info=True)
         raise
 
+def _analyze_symbol_task(analyze_fn: Callable, symbol: str, kwargs: Dict) -> Dict:
+    """Process pool task: analyze one symbol, capturing timing and any failure."""
+    start = time.perf_counter()
+    try:
+        result, error = analyze_fn(symbol, **kwargs), None
+    except Exception:
+        result, error = None, traceback.format_exc()
+    return {
+        'symbol': symbol,
+        'result': result,
+        'error': error,
+        'seconds': time.perf_counter() - start
+    }
+
+def analyze_symbols_parallel(symbols: Optional[List[str]] = None,
+                             max_workers: Optional[int] = None,
+                             analyze_fn: Callable = analyze_technical_indicators_enhanced,
+                             mongo_uri: str = MONGO_URI,
+                             db_name: str = DB_NAME,
+                             collection_name: str = COLLECTION_NAME,
+                             **analyze_kwargs) -> Dict:
+    """
+    Analyze many symbols in parallel across a process pool.
+
+    Workers receive only the symbol name and load its data themselves, so no
+    large frames are pickled to the pool. A failing symbol is logged and
+    reported without stopping the rest of the batch.
+
+    Args:
+        symbols: Symbols to analyze; defaults to every distinct symbol in the collection
+        max_workers: Worker process count; defaults to the number of CPUs
+        analyze_fn: Picklable per-symbol analysis function
+        **analyze_kwargs: Extra keyword arguments for ``analyze_fn``
+
+    Returns:
+        Dictionary with per-symbol ``results``, ``timings``, ``failures`` and
+        ``artifacts``, plus a ``scores`` DataFrame (symbols x indicators) of
+        predictive scores
+    """
+    if symbols is None:
+        db_manager = MongoDBManager(mongo_uri, db_name)
+        symbols = sorted(db_manager.get_distinct_values(collection_name, "symbol"))
+    max_workers = max_workers or os.cpu_count()
+
+    analyze_kwargs = dict(analyze_kwargs, mongo_uri=mongo_uri, db_name=db_name,
+                          collection_name=collection_name)
+    results, timings, failures, artifacts = {}, {}, {}, {}
+    start = time.perf_counter()
+
+    logger.info(f"Analyzing {len(symbols)} symbols with {max_workers} workers")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_analyze_symbol_task, analyze_fn, symbol, analyze_kwargs): symbol
+            for symbol in symbols
+        }
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                outcome = future.result()
+            except Exception:
+                # The worker process itself died (e.g. out of memory)
+                outcome = {'symbol': symbol, 'result': None,
+                           'error': traceback.format_exc(), 'seconds': float('nan')}
+
+            timings[symbol] = outcome['seconds']
+            if outcome['error'] is not None:
+                failures[symbol] = outcome['error']
+                logger.error(f"{symbol} failed after {outcome['seconds']:.2f}s:\n{outcome['error']}")
+                continue
+
+            results[symbol] = outcome['result']
+            artifacts[symbol] = (outcome['result'] or {}).get('artifacts', [])
+            logger.info(f"{symbol} analyzed in {outcome['seconds']:.2f}s")
+
+    elapsed = time.perf_counter() - start
+    logger.info(f"Analyzed {len(results)}/{len(symbols)} symbols in {elapsed:.2f}s "
+                f"({len(failures)} failed)")
+
+    scores = pd.DataFrame({
+        symbol: result.get('top_indicators', {})
+        for symbol, result in results.items() if result
+    }).T
+
+    return {
+        'results': results,
+        'timings': timings,
+        'failures': failures,
+        'artifacts': artifacts,
+        'scores': scores,
+        'elapsed': elapsed
+    }
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Enhanced technical indicator analysis")
+    parser.add_argument("--symbols", nargs="*",
+                        help="Symbols to analyze (default: every symbol in the collection)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Read directly from MongoDB instead of the local cache")
+    args = parser.parse_args()
+
     # Create output directory
-    Path("analysis_output").mkdir(exist_ok=True)
+    OUTPUT_DIR.mkdir(exist_ok=True)
     
-    # Analyze BTC-USD
-    results = analyze_technical_indicators_enhanced("BTC-USD")
\ No newline at end of file
+    results = analyze_symbols_parallel(args.symbols or None, max_workers=args.workers,
+                                       use_cache=not args.no_cache)
\ No newline at end of file
@@ -0,0 +1,23 @@
+import mongomock
+import pytest
+from mongomock.collection import BulkOperationBuilder
+
+
+@pytest.fixture
+def mongomock_bulk_write(monkeypatch):
+    """
+    Let mongomock run ``bulk_write`` with pymongo >= 4.11 operations.
+
+    Newer pymongo passes a ``sort`` argument to ``add_update`` and
+    ``add_replace`` that mongomock 4.x does not accept; it is always None
+    for the operations used here.
+    """
+    for name in ('add_update', 'add_replace'):
+        monkeypatch.setattr(BulkOperationBuilder, name, _without_sort(getattr(BulkOperationBuilder, name)))
+    return mongomock
+
+
+def _without_sort(method):
+    def call(self, *args, sort=None, **kwargs):
+        return method(self, *args, **kwargs)
+    return call
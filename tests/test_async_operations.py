@@ -0,0 +1,117 @@
+import asyncio
+import sys
+from itertools import islice
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.database.async_operations import AsyncDatabaseManager
+from utils.mongodb_utils import cursor_to_dataframe
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+SYMBOLS = [f"SYM{i}-USD" for i in range(12)]
+START = datetime(2024, 1, 1)
+LATENCY = 0.05
+
+
+class AsyncMongomockClient:
+    """Async facade over mongomock whose first read per query waits LATENCY seconds."""
+
+    def __init__(self, client):
+        self.client = client
+        self.active = 0
+        self.max_active = 0
+        self.started = 0
+
+    def __getitem__(self, name):
+        return AsyncMongomockDatabase(self, self.client[name])
+
+
+class AsyncMongomockDatabase:
+    def __init__(self, owner, db):
+        self.owner = owner
+        self.db = db
+
+    def __getitem__(self, name):
+        return AsyncMongomockCollection(self.owner, self.db[name])
+
+
+class AsyncMongomockCollection:
+    def __init__(self, owner, collection):
+        self.owner = owner
+        self.collection = collection
+
+    def find(self, query=None, projection=None):
+        return AsyncMongomockCursor(self.owner, self.collection.find(query, projection))
+
+
+class AsyncMongomockCursor:
+    def __init__(self, owner, cursor):
+        self.owner = owner
+        self.cursor = cursor
+        self.started = False
+
+    def sort(self, keys):
+        self.cursor = self.cursor.sort(keys)
+        return self
+
+    def limit(self, n):
+        self.cursor = self.cursor.limit(n)
+        return self
+
+    async def to_list(self, length=None):
+        if not self.started:
+            self.started = True
+            self.owner.started += 1
+            self.owner.active += 1
+            self.owner.max_active = max(self.owner.max_active, self.owner.active)
+            await asyncio.sleep(LATENCY)
+            self.owner.active -= 1
+        return list(islice(self.cursor, length))
+
+
+@pytest.fixture
+def client():
+    mongo = mongomock.MongoClient()
+    mongo["crypto_data_db"][COLLECTION].insert_many([
+        {"symbol": symbol, "date": START + timedelta(days=i), "close": 100.0 + i + j}
+        for j, symbol in enumerate(SYMBOLS)
+        for i in range(30)
+    ])
+    return AsyncMongomockClient(mongo)
+
+
+def test_symbols_load_concurrently_within_bound(client):
+    manager = AsyncDatabaseManager("mongodb://unused", "crypto_data_db",
+                                   max_concurrency=4, client=client)
+
+    frames = asyncio.run(manager.get_symbols_dataframes(COLLECTION, SYMBOLS, batch_size=7))
+
+    # Queries overlap up to the bound and every symbol is queried once
+    assert client.max_active == 4
+    assert client.started == len(SYMBOLS)
+    assert list(frames) == SYMBOLS
+
+    expected = cursor_to_dataframe(
+        client.client["crypto_data_db"][COLLECTION].find({"symbol": "SYM3-USD"}).sort([("date", 1)])
+    )
+    pd.testing.assert_frame_equal(frames["SYM3-USD"], expected)
+
+
+def test_get_market_data_filters_like_sync_manager(client):
+    manager = AsyncDatabaseManager("mongodb://unused", "crypto_data_db", client=client)
+
+    rows = asyncio.run(manager.get_market_data(
+        COLLECTION, symbol="SYM0-USD", start_date=START + timedelta(days=10), limit=5
+    ))
+
+    assert len(rows) == 5
+    assert all(row["symbol"] == "SYM0-USD" and row["date"] >= START + timedelta(days=10) for row in rows)
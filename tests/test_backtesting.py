@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from backtesting.engine import BacktestEngine
+
+
+def frictionless(**kwargs) -> BacktestEngine:
+    params = dict(stop_loss=None, take_profit=None, max_position_size=1.0,
+                  fee_rate=0.0, slippage=0.0)
+    params.update(kwargs)
+    return BacktestEngine(**params)
+
+
+def test_long_position_compounds_asset_returns():
+    prices = np.array([100.0, 101.0, 99.0, 102.0])
+    signals = np.array([1, 1, 1, 0])
+
+    result = frictionless().run(signals, prices)
+
+    asset_returns = prices[1:] / prices[:-1] - 1
+    np.testing.assert_allclose(result["returns"][1:], asset_returns)
+    np.testing.assert_allclose(result["equity_curve"][-1], prices[-1] / prices[0])
+
+
+def test_stop_loss_exits_and_stays_flat_until_signal_changes():
+    prices = np.array([100.0, 99.0, 97.0, 90.0, 95.0, 96.0])
+    signals = np.array([1, 1, 1, 1, -1, -1])
+
+    result = frictionless(stop_loss=0.02).run(signals, prices)
+
+    # Entry at 100, stop hit at the 97 close, re-entered short at 95
+    assert result["positions"][:, 0].tolist() == [1, 1, 0, 0, -1, -1]
+    np.testing.assert_allclose(result["equity_curve"][-1], 0.97 * (1 - 1 / 95))
+
+
+def test_take_profit_closes_short():
+    prices = np.array([100.0, 97.0, 94.0, 90.0])
+    signals = -np.ones(4)
+
+    result = frictionless(take_profit=0.05).run(signals, prices)
+
+    assert result["positions"][:, 0].tolist() == [-1, -1, 0, 0]
+
+
+def test_costs_scale_with_turnover():
+    prices = np.full((3, 2), 100.0)
+    signals = np.array([[1, -1], [0, -1], [0, 0]])
+
+    result = BacktestEngine(stop_loss=None, take_profit=None, max_position_size=0.05,
+                            fee_rate=0.001, slippage=0.0005).run(signals, prices)
+
+    np.testing.assert_allclose(result["turnover"], [0.1, 0.05, 0.05])
+    np.testing.assert_allclose(result["returns"], -result["turnover"] * 0.0015)
+    assert result["trades"].tolist() == [2, 2]
+
+
+def test_gross_exposure_is_capped_and_frames_round_trip():
+    dates = pd.date_range("2024-01-01", periods=5)
+    symbols = [f"S{i}" for i in range(40)]
+    prices = pd.DataFrame(100.0, index=dates, columns=symbols)
+    signals = pd.DataFrame(1.0, index=dates, columns=symbols)
+
+    result = BacktestEngine().run(signals, prices)
+
+    assert isinstance(result["positions"], pd.DataFrame)
+    np.testing.assert_allclose(result["positions"].abs().sum(axis=1), 1.0)
+    assert result["equity_curve"].index.equals(dates)
+    assert "sharpe_ratio" in result["metrics"]
+
+
+def test_untradable_bars_hold_no_position():
+    prices = np.array([[np.nan, 100.0], [np.nan, 101.0], [50.0, 102.0]])
+    signals = np.ones_like(prices)
+
+    result = frictionless(max_position_size=0.5).run(signals, prices)
+
+    assert result["positions"][:, 0].tolist() == [0.0, 0.0, 0.5]
+    assert np.isfinite(result["equity_curve"]).all()
@@ -0,0 +1,68 @@
+import sys
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from benchmarks import suite
+from benchmarks.synthetic import generate_bars, generate_market_data
+from config.analysis_config import INDICATOR_COLUMNS
+
+
+def test_synthetic_data_is_deterministic_per_symbol():
+    data = generate_market_data(n_symbols=3, n_bars=80, seed=5)
+
+    pd.testing.assert_frame_equal(data, generate_market_data(n_symbols=3, n_bars=80, seed=5))
+    assert list(data.columns[7:]) == INDICATOR_COLUMNS
+    assert data.groupby('symbol').size().tolist() == [80, 80, 80]
+    assert (data['low'] <= data[['open', 'close']].min(axis=1)).all()
+    assert (data['high'] >= data[['open', 'close']].max(axis=1)).all()
+    # Indicators warm up per symbol, then are complete
+    assert data.groupby('symbol')['trend_sma_slow'].apply(lambda s: s.isna().sum()).eq(25).all()
+    assert data.groupby('symbol').tail(10)[INDICATOR_COLUMNS].notna().all().all()
+
+    # A symbol's bars do not depend on the number of symbols or on other seeds
+    fewer = generate_bars(n_symbols=2, n_bars=80, seed=5)
+    pd.testing.assert_frame_equal(fewer, data.loc[:159, fewer.columns])
+    assert not np.allclose(generate_bars(1, 80, seed=6)['close'], fewer['close'][:80])
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    config = {'symbols': 2, 'bars': 100, 'seed': 0}
+    baseline = {'config': config, 'results': {'a': {'seconds': 1.0}, 'b': {'seconds': 1.0},
+                                              'c': {'seconds': 1.0}, 'd': {'seconds': 1.0}}}
+    current = {'config': config, 'results': {'a': {'seconds': 1.2}, 'b': {'seconds': 1.3},
+                                             'c': {'seconds': 0.5}, 'e': {'seconds': 9.0}}}
+
+    comparison = suite.compare(current, baseline, tolerance=0.25)
+
+    assert {name: row['status'] for name, row in comparison.items()} == {
+        'a': 'ok', 'b': 'regression', 'c': 'improvement'
+    }
+    assert comparison['b']['ratio'] == pytest.approx(1.3)
+    with pytest.raises(ValueError):
+        suite.compare({**current, 'config': {**config, 'bars': 200}}, baseline)
+
+
+def test_suite_records_and_checks_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ['--symbols', '2', '--bars', '120', '--repeats', '1', '--baseline', str(baseline)]
+
+    assert suite.main(args + ['--update-baseline']) == 0
+    stored = json.loads(baseline.read_text())
+    assert set(stored['results']) == set(suite.CASES)
+    assert all(result['seconds'] > 0 for result in stored['results'].values())
+
+    # Any slowdown is a regression against a baseline that claims zero time
+    for result in stored['results'].values():
+        result['seconds'] = 1e-12
+    baseline.write_text(json.dumps(stored))
+    assert suite.main(args + ['--only', 'trading_metrics']) == 1
+    assert "Regressions: trading_metrics" in capsys.readouterr().out
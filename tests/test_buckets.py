@@ -0,0 +1,198 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDBManager
+from data.database import buckets
+from data.database.buckets import bucket_collection_name, migrate_to_buckets
+from data.database.operations import DatabaseManager
+from data.cache import MarketDataCache
+from data.database.models import MarketDataBatch
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db(monkeypatch, mongomock_bulk_write):
+    monkeypatch.setattr(mongodb_utils, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(mongodb_utils, "_clients", {})
+    database = mongodb_utils.get_client("mongodb://localhost:27017/")["crypto_data_db"]
+    database[COLLECTION].insert_many([
+        {
+            "symbol": symbol,
+            "date": START + timedelta(days=i),
+            "close": 100.0 + i + offset,
+            "volume": 1000.0 + i,
+            "momentum_rsi": 50.0 + (i % 7)
+        }
+        for symbol, offset in (("BTC-USD", 0), ("ETH-USD", 0.5))
+        for i in range(100)
+    ])
+    return database
+
+
+def test_migration_packs_symbols_into_monthly_buckets(db):
+    report = migrate_to_buckets(db, COLLECTION, batch_size=30)
+
+    buckets = db[bucket_collection_name(COLLECTION)]
+    assert report["rows"] == 200 and report["mismatched"] == [] and report["errors"] == 0
+    # 100 days from January 1st span January to April
+    assert buckets.count_documents({}) == 8
+    january = buckets.find_one({"_id": "BTC-USD:2024-01"})
+    assert january["count"] == 31 and january["start"] == START
+    assert january["fields"]["close"][:2] == [100.0, 101.0]
+
+    # Re-running replaces buckets instead of duplicating rows
+    migrate_to_buckets(db, COLLECTION)
+    assert sum(bucket["count"] for bucket in buckets.find()) == 200
+
+
+def test_bucketed_reads_match_document_layout(db):
+    migrate_to_buckets(db, COLLECTION)
+    documents = MongoDBManager("mongodb://localhost:27017/", "crypto_data_db")
+    bucketed = DatabaseManager("mongodb://localhost:27017/", "crypto_data_db",
+                               bucketed_collections=[COLLECTION])
+
+    queries = [
+        ({"symbol": "ETH-USD", "date": {"$gte": START + timedelta(days=20), "$lt": START + timedelta(days=70)}},
+         {"_id": 0, "date": 1, "close": 1}, [("date", 1)]),
+        ({"momentum_rsi": {"$gte": 53}, "date": {"$lte": START + timedelta(days=40)}},
+         {"_id": 0}, [("date", -1), ("symbol", 1)]),
+        ({}, {"_id": 0, "close": 0}, [("date", 1), ("symbol", -1)]),
+        ({"date": {"$gt": START + timedelta(days=50)}}, {"_id": 0, "symbol": 1, "close": 1}, [("close", -1)]),
+    ]
+    for query, projection, sort_by in queries:
+        expected = documents.get_dataframe(COLLECTION, query, projection, sort_by)
+        result = bucketed.get_dataframe(COLLECTION, query, projection, sort_by)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+    assert bucketed.get_date_range(COLLECTION, "BTC-USD") == (START, START + timedelta(days=99))
+    assert sorted(bucketed.get_distinct_values(COLLECTION, "symbol")) == ["BTC-USD", "ETH-USD"]
+    for field, query in (("date", {"symbol": "ETH-USD", "date": {"$gte": START + timedelta(days=45)}}),
+                         ("momentum_rsi", None),
+                         ("symbol", {"close": {"$gt": 199.0}})):
+        assert (sorted(bucketed.get_distinct_values(COLLECTION, field, query))
+                == sorted(documents.get_distinct_values(COLLECTION, field, query)))
+
+
+def test_database_manager_routes_bucketed_collections(db):
+    manager = DatabaseManager("mongodb://localhost:27017/", "crypto_data_db",
+                              bucketed_collections=[COLLECTION])
+    migrate_to_buckets(db, COLLECTION)
+
+    # Overlapping rows update bars in place; new dates extend the last bucket
+    update = pd.DataFrame({
+        "symbol": "BTC-USD",
+        "date": [START + timedelta(days=99), START + timedelta(days=100)],
+        "close": [1.0, 2.0]
+    })
+    result = manager.upsert_market_data(COLLECTION, update)
+    assert result["rows"] == 2 and result["buckets"] == 1 and result["errors"] == 0
+    # Compact float32 batches would round the stored indicators
+    with pytest.raises(ValueError, match="float64"):
+        manager.upsert_market_data(COLLECTION, MarketDataBatch.from_dataframe(
+            update.assign(volume=1.0, momentum_rsi=0.1), columns=["momentum_rsi"]))
+
+    rows = manager.get_market_data(COLLECTION, symbol="BTC-USD", start_date=START + timedelta(days=98))
+    assert [row["close"] for row in rows] == [198.0, 1.0, 2.0]
+    assert rows[1]["momentum_rsi"] == 50.0 + 99 % 7
+    assert pd.isna(rows[2]["momentum_rsi"])
+    assert len(manager.get_market_data(COLLECTION, symbol="BTC-USD", limit=5)) == 5
+
+    report = manager.ensure_indexes()
+    assert report[bucket_collection_name(COLLECTION)]["failed"] == {}
+    assert COLLECTION not in report
+
+
+def test_utility_readers_route_bucketed_collections(db, tmp_path):
+    documents = MongoDBManager("mongodb://localhost:27017/", "crypto_data_db")
+    query, sort_by = {"symbol": "ETH-USD"}, [("date", 1)]
+    expected = documents.get_dataframe(COLLECTION, query, {"_id": 0}, sort_by)
+    migrate_to_buckets(db, COLLECTION)
+    db.drop_collection(COLLECTION)  # only the buckets are left
+
+    manager = MongoDBManager("mongodb://localhost:27017/", "crypto_data_db", bucketed_collections=[COLLECTION])
+    result = manager.get_dataframe(COLLECTION, query, {"_id": 0}, sort_by)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+    assert sorted(manager.get_distinct_values(COLLECTION, "symbol")) == ["BTC-USD", "ETH-USD"]
+    assert manager.get_date_range(COLLECTION, query) == (START, START + timedelta(days=99))
+
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path, bucketed_collections=[COLLECTION])
+    cached = cache.load("ETH-USD")
+    pd.testing.assert_frame_equal(cached[expected.columns], expected, check_dtype=False)
+
+
+@pytest.fixture
+def unpacked(monkeypatch):
+    """Record the id of every bucket unpacked into rows."""
+    ids = []
+    buckets_to_frame = buckets._buckets_to_frame
+
+    def record(group):
+        ids.extend(bucket["_id"] for bucket in group)
+        return buckets_to_frame(group)
+
+    monkeypatch.setattr(buckets, "_buckets_to_frame", record)
+    return ids
+
+
+def test_bucketed_reads_only_unpack_the_buckets_they_need(db, unpacked):
+    migrate_to_buckets(db, COLLECTION)
+    manager = DatabaseManager("mongodb://localhost:27017/", "crypto_data_db",
+                              bucketed_collections=[COLLECTION])
+
+    assert manager.get_date_range(COLLECTION, "BTC-USD") == (START, START + timedelta(days=99))
+    assert unpacked == ["BTC-USD:2024-01", "BTC-USD:2024-04"]
+
+    unpacked.clear()
+    rows = manager.get_market_data(COLLECTION, symbol="ETH-USD", start_date=START + timedelta(days=40), limit=5)
+    assert [row["date"] for row in rows] == [START + timedelta(days=i) for i in range(40, 45)]
+    assert unpacked == ["ETH-USD:2024-02"]
+
+    # Across symbols, each end is read from the two buckets of its month
+    unpacked.clear()
+    assert manager.get_date_range(COLLECTION) == (START, START + timedelta(days=99))
+    assert sorted(unpacked) == ["BTC-USD:2024-01", "BTC-USD:2024-04", "ETH-USD:2024-01", "ETH-USD:2024-04"]
+
+    unpacked.clear()
+    assert sorted(manager.get_distinct_values(COLLECTION, "symbol")) == ["BTC-USD", "ETH-USD"]
+    assert unpacked == []
+
+
+def test_limits_on_other_sorts_read_every_bucket(db):
+    migrate_to_buckets(db, COLLECTION)
+    collection = buckets.read_collection(db, COLLECTION, bucketed_collections=[COLLECTION])
+
+    # The highest close is in April, not in the first bucket read
+    rows = list(collection.find({"symbol": "BTC-USD"}).sort([("close", -1)]).limit(2))
+    assert [row["close"] for row in rows] == [199.0, 198.0]
+    assert collection.find_one({"symbol": "BTC-USD"}, sort=[("close", -1)])["close"] == 199.0
+    assert collection.find_one({"symbol": "BTC-USD", "date": {"$gte": START}},
+                               sort=[("momentum_rsi", -1), ("date", -1)])["date"] == START + timedelta(days=97)
+
+def test_bucketed_chunks_stream_in_date_order(db, unpacked, monkeypatch):
+    monkeypatch.setattr(buckets, "FRAME_ROWS", 50)
+    migrate_to_buckets(db, COLLECTION)
+    manager = DatabaseManager("mongodb://localhost:27017/", "crypto_data_db",
+                              bucketed_collections=[COLLECTION])
+    expected = MongoDBManager("mongodb://localhost:27017/", "crypto_data_db").get_dataframe(
+        COLLECTION, None, {"_id": 0}, [("date", 1), ("symbol", 1)])
+
+    chunks = manager.get_dataframe(COLLECTION, None, {"_id": 0}, [("date", 1), ("symbol", 1)], chunksize=40)
+    first = next(chunks)
+    # January of both symbols is one group: the next buckets start after it ends
+    assert len(first) == 40 and unpacked == ["BTC-USD:2024-01", "ETH-USD:2024-01"]
+
+    result = pd.concat([first, *chunks], ignore_index=True)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
@@ -0,0 +1,101 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import pearsonr
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.correlation import correlated_pairs, nan_pearson
+from tests.analyze_indicators import analyze_predictive_power_enhanced
+
+
+def make_frame(n_rows: int = 400, n_indicators: int = 12, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+    returns = pd.Series(close).pct_change().shift(-1).fillna(0).to_numpy()
+    data = {"close": close, "volume": rng.uniform(1, 2, n_rows)}
+    for i in range(n_indicators):
+        values = (i / n_indicators) * returns + rng.normal(0, 0.02, n_rows)
+        values[rng.random(n_rows) < 0.1] = np.nan
+        data[f"indicator_{i}"] = values
+    data["constant"] = np.ones(n_rows)
+    return pd.DataFrame(data)
+
+
+def test_nan_pearson_matches_scipy():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=(300, 5))
+    y = 0.3 * x[:, :3] + rng.normal(size=(300, 3))
+    x[rng.random(x.shape) < 0.15] = np.nan
+    y[rng.random(y.shape) < 0.05] = np.nan
+
+    correlation, p_values, counts = nan_pearson(x, y)
+
+    for i in range(x.shape[1]):
+        for j in range(y.shape[1]):
+            mask = ~(np.isnan(x[:, i]) | np.isnan(y[:, j]))
+            expected_r, expected_p = pearsonr(x[mask, i], y[mask, j])
+            assert counts[i, j] == mask.sum()
+            np.testing.assert_allclose(correlation[i, j], expected_r, rtol=1e-10, atol=1e-12)
+            np.testing.assert_allclose(p_values[i, j], expected_p, rtol=1e-8, atol=1e-15)
+
+
+def test_nan_pearson_degenerate_pairs_are_nan():
+    x = np.array([[1.0, 5.0], [2.0, 5.0], [np.nan, 5.0]])
+    y = np.array([[1.0], [3.0], [2.0]])
+
+    correlation, p_values, counts = nan_pearson(x, y)
+
+    assert counts.tolist() == [[2], [3]]
+    assert correlation[0, 0] == 1.0 and p_values[0, 0] == 1.0
+    assert np.isnan(correlation[1, 0]) and np.isnan(p_values[1, 0])
+
+
+def test_predictive_power_matches_pearsonr_loop():
+    data = make_frame()
+    periods = [1, 3, 5, 10]
+
+    results = analyze_predictive_power_enhanced(data, forward_periods=periods,
+                                                correlation_threshold=0.05)
+
+    expected = {}
+    for column in [c for c in data.columns if c not in ("close", "volume")]:
+        for period in periods:
+            changes = data["close"].pct_change(period).shift(-period)
+            mask = ~(data[column].isna() | changes.isna())
+            r, p = pearsonr(data[column][mask], changes[mask])
+            if abs(r) > 0.05 and p < 0.05:
+                expected.setdefault(column, {})[period] = {"correlation": r, "p_value": p}
+
+    assert results.keys() == expected.keys()
+    for column, periods_found in expected.items():
+        assert results[column].keys() == periods_found.keys()
+        for period, metrics in periods_found.items():
+            np.testing.assert_allclose(results[column][period]["correlation"],
+                                       metrics["correlation"], rtol=1e-9)
+            np.testing.assert_allclose(results[column][period]["p_value"],
+                                       metrics["p_value"], rtol=1e-7)
+
+
+def test_correlated_pairs_matches_pair_loop():
+    rng = np.random.default_rng(1)
+    base = rng.standard_normal((200, 1))
+    values = base * np.linspace(-1, 1, 8) + 0.5 * rng.standard_normal((200, 8))
+    names = [f"indicator_{i}" for i in range(8)]
+    matrix = pd.DataFrame(values, columns=names).corr()
+
+    expected = [
+        (names[i], names[j], matrix.iloc[i, j])
+        for i in range(len(names)) for j in range(i + 1, len(names))
+        if abs(matrix.iloc[i, j]) > 0.5
+    ]
+    pairs = correlated_pairs(matrix.to_numpy(), names, 0.5)
+
+    assert sorted(pairs) == sorted(expected) and pairs
+    assert [abs(c) for _, _, c in pairs] == sorted((abs(c) for _, _, c in pairs), reverse=True)
+    assert all(c > 0.5 for _, _, c in correlated_pairs(matrix.to_numpy(), names, 0.5, absolute=False))
@@ -0,0 +1,98 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.indicator_analysis import IndicatorAnalyzer
+from data import feature_store
+from data.feature_store import FeatureStore, build_feature_tensor
+
+FEATURES = ["momentum_rsi", "trend_sma_fast", "volume_em"]
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(3)
+    frames = {}
+    for symbol, start, n_rows in (("ETH-USD", "2024-01-05", 60), ("BTC-USD", "2024-01-01", 80)):
+        frame = pd.DataFrame({
+            "date": pd.date_range(start, periods=n_rows, freq="D"),
+            "close": 100 * np.cumprod(1 + 0.01 * rng.standard_normal(n_rows)),
+            "volume": rng.uniform(1, 2, n_rows),
+            **{name: rng.standard_normal(n_rows) for name in FEATURES}
+        })
+        frame.loc[:2, "trend_sma_fast"] = np.nan
+        frames[symbol] = frame
+    return frames
+
+
+def test_tensor_aligns_symbols_and_matches_pandas_targets(frames):
+    tensor = build_feature_tensor(frames, FEATURES + ["volatility_atr"], horizons=(1, 5))
+
+    assert tensor.symbols == ["BTC-USD", "ETH-USD"]
+    assert tensor.feature_names == FEATURES
+    assert tensor.shape == (80, 2, 3) and tensor.features.dtype == np.float32
+    # ETH starts four days after BTC
+    assert not tensor.present[:4, 1].any() and tensor.present[4:64, 1].all()
+    assert not tensor.valid[4:7, 1].any() and tensor.valid[7:64, 1].all()
+
+    for symbol in tensor.symbols:
+        frame = frames[symbol]
+        result = tensor.symbol_frame(symbol)
+        for horizon in (1, 5):
+            expected = frame["close"].pct_change(horizon).shift(-horizon)
+            np.testing.assert_allclose(result[f"forward_return_{horizon}"], expected, rtol=1e-6)
+        np.testing.assert_allclose(result["momentum_rsi"], frame["momentum_rsi"], rtol=1e-6)
+    assert np.shares_memory(tensor.feature("volume_em"), tensor.features)
+
+
+def test_store_builds_once_per_data_version(frames, tmp_path, monkeypatch):
+    store = FeatureStore(tmp_path)
+    built = []
+    build = feature_store.build_feature_tensor
+    monkeypatch.setattr(feature_store, "build_feature_tensor",
+                        lambda *args, **kwargs: built.append(1) or build(*args, **kwargs))
+
+    first = store.get_or_build(frames, FEATURES)
+    again = store.get_or_build(frames, FEATURES)
+    assert len(built) == 1 and first.version == again.version
+    assert isinstance(again.features, np.memmap) and not again.features.flags.writeable
+    np.testing.assert_array_equal(again.dates, build_feature_tensor(frames, FEATURES).dates)
+
+    frames["BTC-USD"].loc[10, "close"] *= 1.01
+    changed = store.get_or_build(frames, FEATURES)
+    assert len(built) == 2 and changed.version != first.version
+    assert store.versions() == [first.version, changed.version]
+
+    # Pruning one symbol set leaves the tensors of others alone
+    single = store.get_or_build({"BTC-USD": frames["BTC-USD"]}, FEATURES)
+    store.prune(keep=1, symbols=changed.symbols)
+    assert store.versions() == [changed.version, single.version]
+    assert store.versions(symbols=["BTC-USD"]) == [single.version]
+
+    store.prune(keep=1)
+    assert store.versions() == [single.version]
+
+    # Backtests read prices as frames over the memory-mapped arrays
+    close, volume = changed.price_frame("close"), changed.price_frame("volume")
+    assert np.shares_memory(close.to_numpy(), changed.close) and list(close.columns) == changed.symbols
+    np.testing.assert_allclose(volume["ETH-USD"].dropna(), frames["ETH-USD"]["volume"])
+
+
+def test_analyzer_reuses_stored_targets(frames):
+    tensor = build_feature_tensor(frames, FEATURES)
+    frame = frames["BTC-USD"]
+
+    stored = IndicatorAnalyzer.from_feature_tensor(tensor, "BTC-USD").analyze_predictive_power(3)
+    direct = IndicatorAnalyzer(frame).analyze_predictive_power(3)
+
+    for group, features in direct.items():
+        for name, metrics in features.items():
+            assert stored[group][name]["correlation"] == pytest.approx(metrics["correlation"], abs=1e-9)
@@ -0,0 +1,97 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import mongomock
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+import main
+from utils import mongodb_utils
+
+# Libraries that only the code paths needing them may import
+HEAVY_MODULES = ('sklearn', 'scipy', 'matplotlib', 'seaborn', 'tensorflow', 'xgboost')
+# Modules a short job or cron check imports
+CORE_MODULES = (
+    'utils.logger', 'utils.metrics', 'data.database.operations',
+    'analysis.correlation', 'analysis.rolling_correlation', 'analysis.indicator_analysis',
+    'analysis.model_evaluation', 'analysis.walk_forward', 'analysis.sequence_model', 'data.sequences',
+    'backtesting.engine', 'backtesting.optimizer',
+    'strategy.portfolio.allocation', 'strategy.portfolio.risk', 'strategy.signals.generator',
+)
+# Wall-clock budgets in seconds, generous for slow CI machines
+CLI_BUDGET = 0.5
+CORE_IMPORT_BUDGET = 1.0
+
+
+def import_in_fresh_interpreter(modules):
+    """Import ``modules`` in a new interpreter; return the seconds taken and the top-level packages loaded."""
+    script = f"""
+import importlib, json, sys, time
+start = time.perf_counter()
+for name in {list(modules)!r}:
+    importlib.import_module(name)
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': sorted({{name.split('.')[0] for name in sys.modules}})}}))
+"""
+    completed = subprocess.run([sys.executable, '-c', script], cwd=project_root,
+                               capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def test_cli_starts_without_data_libraries():
+    result = import_in_fresh_interpreter(['main'])
+    assert not {'pandas', 'numpy', 'pymongo', *HEAVY_MODULES} & set(result['loaded'])
+    assert result['seconds'] < CLI_BUDGET
+
+    completed = subprocess.run([sys.executable, 'main.py', '--help'], cwd=project_root,
+                               capture_output=True, text=True, check=True)
+    assert 'backtest' in completed.stdout
+
+
+def test_core_modules_import_heavy_libraries_lazily():
+    result = import_in_fresh_interpreter(CORE_MODULES)
+    assert not set(HEAVY_MODULES) & set(result['loaded'])
+    assert result['seconds'] < CORE_IMPORT_BUDGET
+
+
+def test_cli_ingest_and_backtest(tmp_path, monkeypatch, mongomock_bulk_write, capsys):
+    monkeypatch.setattr(mongodb_utils, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(mongodb_utils, "_clients", {})
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2024-01-01", periods=60, freq="D")
+    frame = pd.concat([
+        pd.DataFrame({'symbol': symbol, 'date': dates,
+                      'close': 100 * np.exp(np.cumsum(rng.normal(0, 0.03, len(dates)))),
+                      'volume': rng.lognormal(10, 0.5, len(dates))})
+        for symbol in ('BTC-USD', 'ETH-USD')
+    ])
+    path = tmp_path / "prices.csv"
+    frame.to_csv(path, index=False)
+    common = ['--database', 'cli_test']
+    store = ['--feature-store', str(tmp_path / "features")]
+
+    assert main.main([*common, 'ingest', str(path), '--collection', 'prices']) == 0
+    assert "120 rows -> prices" in capsys.readouterr().out
+
+    assert main.main([*common, 'backtest', '--collection', 'prices', '--symbols', 'BTC-USD', 'ETH-USD', *store]) == 0
+    out = capsys.readouterr().out
+    assert out.startswith("60 bars x 2 symbols") and "sharpe_ratio" in out
+    # Prices come from a feature tensor built in the store
+    assert len(list((tmp_path / "features").iterdir())) == 1
+
+    # A new bar replaces the stored tensor of these symbols rather than adding one
+    next_day = frame[frame['date'] == dates[-1]].assign(date=dates[-1] + pd.Timedelta(days=1))
+    next_day.to_csv(path, index=False)
+    assert main.main([*common, 'ingest', str(path), '--collection', 'prices']) == 0
+    assert main.main([*common, 'backtest', '--collection', 'prices', '--symbols', 'BTC-USD', 'ETH-USD', *store]) == 0
+    assert "\n61 bars x 2 symbols" in capsys.readouterr().out
+    assert len(list((tmp_path / "features").iterdir())) == 1
+
+    assert main.main([*common, 'backtest', '--collection', 'prices', '--symbols', 'DOGE-USD', *store]) == 1
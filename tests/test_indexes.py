@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.database.indexes import INDEX_SPECS, ensure_indexes, summarize_plan
+from utils.mongodb_utils import get_date_range
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    database = mongomock.MongoClient()["crypto_data_db"]
+    database[COLLECTION].insert_many([
+        {"symbol": symbol, "date": START + timedelta(days=i + offset), "close": 1.0}
+        for symbol, offset in (("BTC-USD", 0), ("ETH-USD", 5))
+        for i in range(20)
+    ])
+    return database
+
+
+def test_ensure_indexes_is_idempotent(db):
+    first = ensure_indexes(db)[COLLECTION]
+    assert sorted(first['created']) == sorted(spec['name'] for spec in INDEX_SPECS[COLLECTION])
+
+    second = ensure_indexes(db)[COLLECTION]
+    assert second['created'] == [] and second['failed'] == {}
+    assert sorted(second['existing']) == sorted(first['created'])
+    assert db[COLLECTION].index_information()['symbol_date']['unique']
+
+
+def test_ensure_indexes_reports_duplicate_keys(db):
+    db[COLLECTION].insert_one({"symbol": "BTC-USD", "date": START, "close": 2.0})
+
+    report = ensure_indexes(db)[COLLECTION]
+
+    assert 'symbol_date' in report['failed']
+    assert report['created'] == ['date']
+
+
+def test_get_date_range_per_symbol_and_collection(db):
+    assert get_date_range(db[COLLECTION], {"symbol": "ETH-USD"}) == (
+        START + timedelta(days=5), START + timedelta(days=24)
+    )
+    assert get_date_range(db[COLLECTION]) == (START, START + timedelta(days=24))
+    assert get_date_range(db[COLLECTION], {"symbol": "XRP-USD"}) == (None, None)
+
+
+def test_summarize_plan_flags_collection_scans():
+    index_plan = {
+        "queryPlanner": {"winningPlan": {"queryPlan": {
+            "stage": "FETCH",
+            "inputStage": {"stage": "IXSCAN", "indexName": "symbol_date"}
+        }}},
+        "executionStats": {"totalKeysExamined": 20, "totalDocsExamined": 20}
+    }
+    scan_plan = {"queryPlanner": {"winningPlan": {
+        "stage": "SORT", "inputStage": {"stage": "COLLSCAN"}
+    }}}
+
+    summary = summarize_plan(index_plan)
+    assert summary['stages'] == ["FETCH", "IXSCAN"]
+    assert summary['indexes'] == ["symbol_date"]
+    assert not summary['collscan'] and summary['docs_examined'] == 20
+    assert summarize_plan(scan_plan)['collscan']
@@ -0,0 +1,92 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import spearmanr
+from sklearn import feature_selection
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.indicator_analysis import IndicatorAnalyzer
+
+
+@pytest.fixture
+def frame() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    n_rows = 300
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_rows)))
+    data = pd.DataFrame({
+        "close": close,
+        "trend_sma_fast": pd.Series(close).rolling(5).mean(),
+        "momentum_rsi": rng.uniform(0, 100, n_rows),
+        "volatility_bbm": pd.Series(close).rolling(20).mean(),
+        "volume_em": rng.normal(size=n_rows)
+    })
+    data.loc[::17, "momentum_rsi"] = np.nan
+    return data
+
+
+def test_predictive_power_matches_scipy_spearman(frame):
+    analyzer = IndicatorAnalyzer(frame)
+
+    results = analyzer.analyze_predictive_power(forward_returns=3)
+
+    forward = frame["close"].pct_change(3).shift(-3).fillna(0)
+    for group_results in results.values():
+        for feature, metrics in group_results.items():
+            expected_r, expected_p = spearmanr(frame[feature].fillna(0), forward)
+            np.testing.assert_allclose(metrics["correlation"], expected_r, rtol=1e-9)
+            np.testing.assert_allclose(metrics["p_value"], expected_p, rtol=1e-7)
+
+
+def test_report_does_not_mutate_caller_frame(frame):
+    columns = list(frame.columns)
+
+    IndicatorAnalyzer(frame).generate_analysis_report()
+
+    assert list(frame.columns) == columns
+
+
+def test_report_reuses_cached_results(frame, monkeypatch):
+    calls = []
+    original = feature_selection.mutual_info_regression
+
+    def counting_mutual_info(X, y):
+        calls.append(X.shape)
+        return original(X, y, random_state=0)
+
+    # Imported where it is used, so patch it at its source
+    monkeypatch.setattr(feature_selection, "mutual_info_regression", counting_mutual_info)
+    analyzer = IndicatorAnalyzer(frame)
+
+    report = analyzer.generate_analysis_report()
+
+    assert len(calls) == 1
+    assert report["top_indicators"] == analyzer.get_top_indicators()
+
+    analyzer.df = frame.iloc[50:]
+    analyzer.calculate_feature_importance()
+    assert len(calls) == 2
+
+
+def test_fast_importance_ranks_like_exact():
+    rng = np.random.default_rng(5)
+    target = rng.standard_normal(3000)
+    frame = pd.DataFrame({"close": target})
+    features = ["trend_sma_fast", "momentum_rsi", "volatility_bbm", "volume_em", "momentum_wr"]
+    for strength, name in zip([0.0, 0.2, 0.4, 0.6, 0.8], features):
+        frame[name] = strength * np.abs(target) + (1 - strength) * rng.standard_normal(len(target))
+
+    exact = IndicatorAnalyzer(frame).calculate_feature_importance()
+    analyzer = IndicatorAnalyzer(frame, importance_method="fast", n_jobs=2)
+    fast = analyzer.calculate_feature_importance()
+
+    assert list(fast) == list(exact) == features[::-1]
+    assert fast["trend_sma_fast"] < 0.01
+    # Both methods are cached separately
+    assert analyzer.calculate_feature_importance("exact") == pytest.approx(exact, abs=0.02)
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import bson
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.database.ingestion import MarketDataIngestor
+from data.database.models import MarketData, MarketDataBatch
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+START = datetime(2024, 1, 1)
+
+
+def make_frame(start: int, stop: int, symbol: str = "BTC-USD", close_offset: float = 0.0):
+    return pd.DataFrame({
+        "symbol": symbol,
+        "date": [START + timedelta(days=i) for i in range(start, stop)],
+        "close": [100.0 + i + close_offset for i in range(start, stop)],
+        "volume": [10.0 + i for i in range(start, stop)]
+    })
+
+
+@pytest.fixture
+def db(mongomock_bulk_write):
+    return mongomock.MongoClient()["crypto_data_db"]
+
+
+@pytest.fixture
+def bulk_writes(monkeypatch):
+    """Encode every operation like the real driver does, and record the batch sizes written."""
+    sizes = []
+    bulk_write = mongomock.collection.Collection.bulk_write
+
+    def encoding_bulk_write(self, requests, *args, **kwargs):
+        sizes.append(len(requests))
+        for request in requests:
+            bson.encode(request._doc)
+        return bulk_write(self, requests, *args, **kwargs)
+
+    monkeypatch.setattr(mongomock.collection.Collection, "bulk_write", encoding_bulk_write)
+    return sizes
+
+
+def test_upserts_are_keyed_on_symbol_and_date(db, bulk_writes):
+    ingestor = MarketDataIngestor(db, COLLECTION, batch_size=7, max_in_flight=3)
+
+    first = ingestor.ingest(make_frame(0, 50))
+    assert (first['inserted'], first['updated'], first['errors']) == (50, 0, 0)
+    assert first['batches'] == 8 and sorted(bulk_writes) == [1] + [7] * 7
+
+    # Overlapping backfill with revised closes for days 40-49
+    second = ingestor.ingest(make_frame(40, 60, close_offset=1.0))
+    assert (second['inserted'], second['updated'], second['modified']) == (10, 10, 10)
+
+    assert db[COLLECTION].count_documents({}) == 60
+    assert db[COLLECTION].find_one({"date": START + timedelta(days=45)})["close"] == 146.0
+
+
+def test_ingests_market_data_objects_and_counts_errors(db):
+    db[COLLECTION].create_index("metadata.source_id", unique=True)
+    documents = [
+        MarketData("ETH-USD", START + timedelta(days=i), 10.0 + i, 1.0,
+                   {"momentum_rsi": 50.0}, {"source_id": i % 4})
+        for i in range(6)
+    ]
+    documents.append({"symbol": "ETH-USD", "close": 1.0})
+
+    result = MarketDataIngestor(db, COLLECTION, batch_size=3).ingest(documents)
+
+    # Days 4 and 5 reuse source ids 0 and 1; the last document has no date
+    assert result['inserted'] == 4
+    assert result['errors'] == 3
+    assert len(result['error_details']) == 3
+    stored = db[COLLECTION].find_one({"date": START})
+    assert stored["technical_indicators"] == {"momentum_rsi": 50.0}
+
+
+def test_unencodable_documents_are_reported_without_aborting(db, bulk_writes):
+    documents = make_frame(0, 6).to_dict("records")
+    documents[2]["volume"] = np.int64(12)
+    documents[4]["tags"] = {"spot", "perp"}
+
+    result = MarketDataIngestor(db, COLLECTION, batch_size=3).ingest(documents)
+
+    # Each batch is sent whole, then split in halves until the bad document is alone
+    assert sorted(bulk_writes) == [1, 1, 1, 1, 1, 1, 2, 2, 3, 3]
+    assert (result['inserted'], result['errors'], result['batches']) == (4, 2, 2)
+    assert [detail['document']['date'] for detail in result['error_details']] == [
+        START + timedelta(days=2), START + timedelta(days=4)]
+    assert "cannot encode object" in result['error_details'][0]['errmsg']
+    assert db[COLLECTION].count_documents({}) == 4
+
+
+def test_compact_batches_are_rejected_instead_of_rounding_stored_values(db):
+    frame = make_frame(0, 5).assign(momentum_rsi=0.1)
+    ingestor = MarketDataIngestor(db, COLLECTION)
+
+    with pytest.raises(ValueError, match="float64"):
+        ingestor.ingest(MarketDataBatch.from_dataframe(frame, columns=["momentum_rsi"]))
+    assert db[COLLECTION].count_documents({}) == 0
+
+    exact = MarketDataBatch.from_dataframe(frame, columns=["momentum_rsi"], indicator_dtype=np.float64)
+    assert ingestor.ingest(exact)['inserted'] == 5
+    assert db[COLLECTION].find_one({"date": START})["momentum_rsi"] == 0.1
@@ -0,0 +1,114 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.cache import MarketDataCache
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+START = datetime(2024, 1, 1)
+
+
+def make_documents(start: int, stop: int, symbol: str = "BTC-USD", **extra):
+    return [
+        {
+            "symbol": symbol,
+            "date": START + timedelta(days=i),
+            "close": 100.0 + i,
+            "volume": 10 + i,
+            "momentum_rsi": float(i % 13),
+            **extra
+        }
+        for i in range(start, stop)
+    ]
+
+
+@pytest.fixture
+def db():
+    database = mongomock.MongoClient()["crypto_data_db"]
+    database[COLLECTION].insert_many(make_documents(0, 100))
+    database[COLLECTION].insert_many(make_documents(0, 10, symbol="ETH-USD"))
+    return database
+
+
+def expected_frame(db, symbol="BTC-USD"):
+    cursor = db[COLLECTION].find({"symbol": symbol}, {"_id": 0}).sort([("date", 1)])
+    return pd.DataFrame(list(cursor))
+
+
+def test_initial_load_matches_mongo(db, tmp_path):
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path)
+
+    result = cache.load("BTC-USD")
+
+    pd.testing.assert_frame_equal(result, expected_frame(db), check_dtype=False)
+    assert cache.watermark("BTC-USD") == START + timedelta(days=99)
+
+
+def test_incremental_refresh_fetches_only_new_rows(db, tmp_path):
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path)
+    cache.load("BTC-USD")
+
+    assert cache.refresh("BTC-USD") == 0
+
+    db[COLLECTION].insert_many(make_documents(100, 120))
+    assert cache.refresh("BTC-USD") == 20
+
+    result = cache.load("BTC-USD")
+    pd.testing.assert_frame_equal(result, expected_frame(db), check_dtype=False)
+    assert isinstance(cache.load_arrays("BTC-USD")["close"], np.ndarray)
+
+
+def test_new_indicator_column_invalidates_cache(db, tmp_path):
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path)
+    cache.load("BTC-USD")
+
+    db[COLLECTION].update_many({"symbol": "BTC-USD"}, {"$set": {"trend_adx": 25.0}})
+
+    result = cache.load("BTC-USD")
+    assert "trend_adx" in result.columns
+    assert len(result) == 100
+
+
+def test_partitions_are_compacted(db, tmp_path):
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path, max_partitions=2)
+    cache.load("BTC-USD")
+    for start in (100, 105, 110):
+        db[COLLECTION].insert_many(make_documents(start, start + 5))
+        cache.refresh("BTC-USD")
+
+    symbol_dir = tmp_path / COLLECTION / "BTC-USD"
+    assert len([p for p in symbol_dir.iterdir() if p.is_dir()]) <= 2
+    pd.testing.assert_frame_equal(cache.load("BTC-USD"), expected_frame(db), check_dtype=False)
+
+
+def test_column_types_stay_consistent_across_partitions(db, tmp_path):
+    db[COLLECTION].update_many({"symbol": "BTC-USD"},
+                               {"$set": {"trend_adx": None, "exchange": "coinbase", "note": {"source": "backfill"}}})
+    cache = MarketDataCache(db, COLLECTION, cache_dir=tmp_path)
+    cache.load("BTC-USD")
+
+    # The indicator leaves its warm-up and the exchange is unknown for the new rows
+    db[COLLECTION].insert_many(make_documents(100, 103, trend_adx=55.5, exchange=None, note={}))
+    cache.refresh("BTC-USD")
+    result = cache.load("BTC-USD")
+    assert len(cache._read_meta("BTC-USD")["partitions"]) == 2
+    assert result["trend_adx"].iloc[:100].isna().all() and result["trend_adx"].iloc[100:].tolist() == [55.5] * 3
+    assert (result["exchange"].iloc[:100] == "coinbase").all() and result["exchange"].iloc[100:].isna().all()
+
+    # A column skipped so far arrives as text: rebuild instead of mixing partitions
+    db[COLLECTION].insert_many(make_documents(103, 105, trend_adx=60.0, exchange="kraken", note="manual"))
+    cache.refresh("BTC-USD")
+    result = cache.load("BTC-USD")
+    assert len(cache._read_meta("BTC-USD")["partitions"]) == 1
+    assert "note" not in result and len(result) == 105
+    assert result["trend_adx"].iloc[-2:].tolist() == [60.0, 60.0]
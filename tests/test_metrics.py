@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils.metrics import (
+    calculate_max_drawdown, calculate_rolling_metrics, calculate_trading_metrics, rolling_max_drawdown
+)
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(11)
+    return rng.normal(0.0005, 0.02, size=(300, 4))
+
+
+def test_rolling_metrics_match_full_sample_function(returns):
+    window = 60
+    rolling = calculate_rolling_metrics(returns, window=window, risk_free_rate=0.02)
+
+    assert np.isnan(rolling['sharpe_ratio'][:window - 1]).all()
+    for end in (window - 1, 150, len(returns) - 1):
+        for column in range(returns.shape[1]):
+            expected = calculate_trading_metrics(
+                returns[end - window + 1:end + 1, column], risk_free_rate=0.02
+            )
+            for name, value in expected.items():
+                assert rolling[name][end, column] == pytest.approx(value, rel=1e-9, abs=1e-12), name
+
+
+def test_rolling_metrics_skip_gaps_and_late_listings(returns):
+    window = 60
+    returns = returns.copy()
+    returns[10, 0] = np.nan      # gap
+    returns[:100, 1] = np.nan    # late listing
+    returns[:, 2] = np.nan       # never listed
+    rolling = calculate_rolling_metrics(returns, window=window, min_periods=20)
+
+    for end in (window - 1, 69, 118, 150, len(returns) - 1):
+        for column in (0, 1):
+            values = returns[end - window + 1:end + 1, column]
+            values = values[~np.isnan(values)]
+            if len(values) < 20:
+                assert np.isnan(rolling['sharpe_ratio'][end, column])
+                continue
+            for name, value in calculate_trading_metrics(values).items():
+                assert rolling[name][end, column] == pytest.approx(value, rel=1e-9, abs=1e-12), (name, end)
+    assert np.isnan(rolling['max_drawdown'][:, 2]).all()
+    np.testing.assert_array_equal(np.isnan(rolling['sharpe_ratio'][:, 3]), np.arange(len(returns)) < window - 1)
+
+
+def test_rolling_max_drawdown_matches_naive_windows(returns):
+    for window in (1, 7, 64, len(returns)):
+        drawdowns = rolling_max_drawdown(returns, window)
+        expected = np.array([
+            [calculate_max_drawdown(returns[start:start + window, column])
+             for column in range(returns.shape[1])]
+            for start in range(len(returns) - window + 1)
+        ])
+        np.testing.assert_allclose(drawdowns, expected, rtol=1e-10, atol=1e-14)
+
+    # Missing bars are skipped, not treated as flat
+    gapped = returns.copy()
+    gapped[[5, 40, 41, 130], 0] = np.nan
+    drawdowns = rolling_max_drawdown(gapped, 30)
+    for start in range(len(gapped) - 30 + 1):
+        values = gapped[start:start + 30, 0]
+        assert drawdowns[start, 0] == pytest.approx(calculate_max_drawdown(values[~np.isnan(values)]), rel=1e-10)
+
+
+def test_rolling_metrics_accepts_1d_input(returns):
+    rolling = calculate_rolling_metrics(returns[:, 0], window=20)
+    assert rolling['annual_volatility'].shape == (len(returns),)
+
+    with pytest.raises(ValueError):
+        calculate_rolling_metrics(returns[:10, 0], window=20)
@@ -0,0 +1,84 @@
+import sys
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import INDICATOR_COLUMNS
+from data.database.models import MarketData, MarketDataBatch
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(5)
+    n_rows = 200
+    data = pd.DataFrame({
+        "symbol": "BTC-USD",
+        "date": [START + timedelta(days=i) for i in range(n_rows)],
+        "close": rng.uniform(100, 200, n_rows),
+        "volume": rng.uniform(1e3, 1e4, n_rows)
+    })
+    indicators = pd.DataFrame(rng.standard_normal((n_rows, len(INDICATOR_COLUMNS))),
+                              columns=INDICATOR_COLUMNS)
+    indicators.iloc[:20, 0] = np.nan
+    return pd.concat([data, indicators], axis=1)
+
+
+def test_dataframe_and_document_round_trips(frame):
+    batch = MarketDataBatch.from_dataframe(frame, indicator_dtype=np.float64)
+    assert batch.symbol == "BTC-USD" and len(batch) == len(frame)
+
+    result = batch.to_dataframe()
+    pd.testing.assert_frame_equal(result, frame, check_dtype=False)
+
+    compact = MarketDataBatch.from_dataframe(frame)
+    assert compact.indicators.dtype == np.float32
+    pd.testing.assert_frame_equal(compact.to_dataframe(), frame, check_dtype=False, rtol=1e-6)
+
+    for nested in (False, True):
+        documents = batch.to_documents(nested=nested)
+        rebuilt = MarketDataBatch.from_documents(documents, indicator_dtype=np.float64)
+        np.testing.assert_array_equal(rebuilt.indicators, batch.indicators)
+        np.testing.assert_array_equal(rebuilt.dates, batch.dates)
+
+    assert documents[3] == MarketData.from_dict(documents[3]).to_dict()
+
+
+def test_row_views_match_market_data(frame):
+    batch = MarketDataBatch.from_dataframe(frame, indicator_dtype=np.float64)
+    row = batch[-1]
+
+    assert not hasattr(row, "__dict__")
+    assert row.date == frame["date"].iloc[-1]
+    assert row["momentum_rsi"] == frame["momentum_rsi"].iloc[-1]
+    assert row.to_dict()["technical_indicators"] == dict(
+        zip(INDICATOR_COLUMNS, frame[INDICATOR_COLUMNS].iloc[-1].tolist())
+    )
+    assert len(batch[10:20]) == 10
+    np.testing.assert_array_equal(batch.indicator("volume_adi"), frame["volume_adi"].to_numpy())
+
+    with pytest.raises(ValueError):
+        MarketDataBatch.from_dataframe(frame.assign(symbol=["A", "B"] * 100))
+
+
+def test_batch_uses_an_order_of_magnitude_less_memory(frame):
+    source = MarketDataBatch.from_dataframe(frame)
+
+    # Records as decoded from MongoDB: each owns its dicts and float objects
+    tracemalloc.start()
+    records = [MarketData.from_dict(document) for document in source.to_documents(nested=True)]
+    object_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    batch = MarketDataBatch.from_market_data(records)
+    assert batch.nbytes * 10 <= object_bytes
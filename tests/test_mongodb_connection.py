@@ -48,21 +48,10 @@ def test_mongodb_connection():
         logger.info(f"\nFound {len(symbols)} distinct symbols:")
         logger.info(f"Symbols: {symbols[:10]}...")
         
-        # Get date range
-        pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "min_date": {"$min": "$date"},
-                    "max_date": {"$max": "$date"}
-                }
-            }
-        ]
-        
-        date_range = list(db_manager.db[collection_name].aggregate(pipeline))
-        if date_range:
-            date_info = date_range[0]
-            logger.info(f"\nDate range: {date_info['min_date']} to {date_info['max_date']}")
+        # Get date range from both ends of the date index
+        min_date, max_date = db_manager.get_date_range(collection_name)
+        if min_date is not None:
+            logger.info(f"\nDate range: {min_date} to {max_date}")
         
         # Get sample document structure
         sample_doc = db_manager.db[collection_name].find_one()
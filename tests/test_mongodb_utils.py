@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import mongomock
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils import mongodb_utils
+from utils.mongodb_utils import MongoDBManager, ColumnarFrameBuilder
+
+COLLECTION = "crypto_time_series_with_technical_indicators"
+
+
+@pytest.fixture
+def db_manager(monkeypatch):
+    """MongoDBManager backed by an in-process mongomock client."""
+    monkeypatch.setattr(mongodb_utils, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(mongodb_utils, "_clients", {})
+    manager = MongoDBManager("mongodb://localhost:27017/", "crypto_data_db")
+    start = datetime(2024, 1, 1)
+    documents = [
+        {
+            "symbol": "BTC-USD" if i % 2 else "ETH-USD",
+            "date": start + timedelta(days=i),
+            "close": 100.0 + i,
+            "volume": 1000 + i,
+            "momentum_rsi": 50.0 + (i % 7),
+        }
+        for i in range(250)
+    ]
+    manager.db[COLLECTION].insert_many(documents)
+    return manager
+
+
+def test_get_dataframe_matches_record_path(db_manager):
+    query = {"symbol": "BTC-USD"}
+    expected = pd.DataFrame(list(
+        db_manager.db[COLLECTION].find(query).sort([("date", 1)])
+    ))
+
+    result = db_manager.get_dataframe(COLLECTION, query=query,
+                                      sort_by=[("date", 1)], batch_size=16)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_get_dataframe_chunks_concatenate_to_full_frame(db_manager):
+    full = db_manager.get_dataframe(COLLECTION, sort_by=[("date", 1)])
+
+    chunks = list(db_manager.get_dataframe(COLLECTION, sort_by=[("date", 1)],
+                                           chunksize=64, batch_size=10))
+
+    assert [len(chunk) for chunk in chunks] == [64, 64, 64, 58]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), full)
+
+
+def test_get_dataframe_applies_projection(db_manager):
+    result = db_manager.get_dataframe(COLLECTION, projection={"_id": 0, "date": 1, "close": 1})
+
+    assert list(result.columns) == ["date", "close"]
+    assert result["close"].dtype == np.float64
+
+
+def test_builder_handles_missing_fields_and_type_drift():
+    builder = ColumnarFrameBuilder(capacity=2)
+    builder.append([{"a": 1, "b": True}, {"a": 2, "b": False}])
+    builder.append([{"a": 2.5}, {"a": 3, "c": "x"}])
+
+    frame = builder.to_dataframe()
+
+    assert frame["a"].tolist() == [1.0, 2.0, 2.5, 3.0]
+    assert frame["b"].tolist()[:2] == [True, False]
+    assert frame["b"].isna().tolist() == [False, False, True, True]
+    assert frame["c"].isna().tolist() == [True, True, True, False]
@@ -0,0 +1,110 @@
+import sys
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+from urllib.request import urlopen
+
+import mongomock
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils import mongodb_utils
+from utils.logger import setup_logger, shutdown_logger
+from monitoring.metrics import REGISTRY, MetricsRegistry, SIGNAL_COUNT
+from monitoring.server import MetricsServer
+from backtesting.engine import BacktestEngine
+from data.database.operations import DatabaseManager
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    rows = registry.counter("rows_loaded", "Rows loaded", ("collection",))
+    latency = registry.histogram("query_seconds", "Query latency", buckets=(0.1, 1.0))
+    positions = registry.gauge("open_positions", "Open positions")
+
+    rows.labels("prices").inc(3)
+    rows.labels(collection="prices").inc(2)
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+    positions.set(4)
+    positions.dec()
+
+    assert registry.counter("rows_loaded", "Rows loaded", ("collection",)) is rows
+    with pytest.raises(ValueError):
+        registry.gauge("rows_loaded", "Rows loaded")
+    assert latency.quantile(0.5) == 0.1 and latency.count == 4
+
+    lines = registry.render().splitlines()
+    assert "# TYPE rows_loaded_total counter" in lines
+    assert "# HELP rows_loaded_total Rows loaded" in lines
+    assert "# TYPE query_seconds histogram" in lines
+    assert 'rows_loaded_total{collection="prices"} 5' in lines
+    assert 'query_seconds_bucket{le="0.1"} 2' in lines
+    assert 'query_seconds_bucket{le="1.0"} 3' in lines
+    assert 'query_seconds_bucket{le="+Inf"} 4' in lines
+    assert "query_seconds_sum 2.65" in lines
+    assert "open_positions 3" in lines
+
+
+def test_metrics_server_serves_registry():
+    registry = MetricsRegistry()
+    registry.counter("scrapes_seen", "Test counter").inc()
+
+    with MetricsServer(registry, host="127.0.0.1", port=0) as server:
+        with urlopen(server.url, timeout=5) as response:
+            body = response.read().decode()
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        with urlopen(server.url.replace("/metrics", "/health"), timeout=5) as response:
+            assert response.read() == b"ok\n"
+
+    assert "scrapes_seen_total 1" in body.splitlines()
+
+
+def test_setup_logger_is_idempotent_and_non_blocking(tmp_path):
+    log_dir = tmp_path / "logs"
+    logger = setup_logger("monitoring_test", log_dir=log_dir)
+    handlers = list(logger.handlers)
+    assert setup_logger("monitoring_test", log_dir=log_dir) is logger
+    assert not log_dir.exists()
+    assert logger.handlers == handlers
+    assert [type(handler) for handler in handlers] == [logging.handlers.QueueHandler]
+
+    other = setup_logger("other_monitoring_test", log_dir=log_dir)
+    logger.info("queued message")
+    shutdown_logger("monitoring_test")
+
+    log_file, = log_dir.glob("monitoring_test_*.log")
+    assert "queued message" in log_file.read_text()
+    assert logger.handlers == []
+    # Loggers set up elsewhere keep their listener
+    assert len(other.handlers) == 1
+    shutdown_logger("other_monitoring_test")
+
+
+def test_data_and_backtest_layers_record_metrics(monkeypatch):
+    monkeypatch.setattr(mongodb_utils, "MongoClient", mongomock.MongoClient)
+    monkeypatch.setattr(mongodb_utils, "_clients", {})
+    manager = DatabaseManager("mongodb://localhost:27017/", "monitoring_test")
+    manager.db["prices"].insert_many([
+        {"symbol": "BTC-USD", "date": datetime(2024, 1, 1) + timedelta(days=i), "close": 100.0 + i}
+        for i in range(10)
+    ])
+    rows_before = REGISTRY.snapshot().get('db_rows_loaded_total{collection="prices"}', 0)
+    queries_before = REGISTRY.snapshot().get('db_query_seconds_count{collection="prices"}', 0)
+
+    manager.get_market_data("prices", symbol="BTC-USD")
+
+    snapshot = REGISTRY.snapshot()
+    assert snapshot['db_rows_loaded_total{collection="prices"}'] - rows_before == 10
+    assert snapshot['db_query_seconds_count{collection="prices"}'] - queries_before == 1
+
+    longs, shorts = SIGNAL_COUNT.labels("long").value, SIGNAL_COUNT.labels("short").value
+    signals = np.array([[1, 0], [1, -1], [0, -1], [1, 1]], dtype=float)
+    BacktestEngine(stop_loss=None, take_profit=None).run(signals, np.full((4, 2), 100.0))
+    assert SIGNAL_COUNT.labels("long").value - longs == 3
+    assert SIGNAL_COUNT.labels("short").value - shorts == 1
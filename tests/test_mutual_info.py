@@ -0,0 +1,43 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.mutual_info import binned_mutual_info, quantile_bins
+
+
+def test_quantile_bins_keep_ties_together():
+    values = np.array([0.0] * 6 + [1.0, 2.0, 3.0, 4.0])
+
+    codes = quantile_bins(values, 4)
+
+    assert len(set(codes[:6])) == 1
+    assert np.all(np.diff(codes) >= 0) and codes.max() < 4
+
+
+def test_binned_mutual_info_matches_gaussian_closed_form():
+    rng = np.random.default_rng(0)
+    n_rows = 50_000
+    y = rng.standard_normal(n_rows)
+    rhos = np.array([0.0, 0.3, 0.6, 0.9])
+    X = np.column_stack([rho * y + np.sqrt(1 - rho ** 2) * rng.standard_normal(n_rows) for rho in rhos])
+
+    estimate = binned_mutual_info(X, y)
+
+    # Bivariate normal: I = -log(1 - rho^2) / 2; binning loses a little at high rho
+    expected = -0.5 * np.log(1 - rhos ** 2)
+    assert estimate[0] < 0.002
+    np.testing.assert_allclose(estimate[1:], expected[1:], rtol=0.15)
+
+    threaded = binned_mutual_info(X, y, groups=[[0, 2], [1], [3]], n_jobs=3)
+    np.testing.assert_allclose(threaded, estimate)
+
+    sampled = binned_mutual_info(X, y, sample_size=10_000, random_state=1)
+    assert np.all(np.argsort(sampled) == np.argsort(estimate))
+    assert sampled[3] == pytest.approx(estimate[3], rel=0.1)
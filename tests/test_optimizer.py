@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.model_evaluation import calculate_trading_metrics
+from backtesting.optimizer import METRIC_COLUMNS, sweep_signal_params, sweep_thresholds
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(11)
+    returns = rng.normal(0, 0.02, (200, 3))
+    predictions = 0.5 * np.roll(returns, -1, axis=0) + rng.normal(0, 0.02, (200, 3))
+    return predictions, returns
+
+
+def test_threshold_sweep_matches_model_evaluation(panel):
+    predictions, returns = panel
+    thresholds = [0.0, 0.005, 0.01, 0.03]
+
+    table = sweep_thresholds(predictions, returns, thresholds,
+                             symbols=["BTC", "ETH", "SOL"], max_chunk_bytes=1)
+
+    assert len(table) == len(thresholds) * 3
+    for row in table.itertuples():
+        column = ["BTC", "ETH", "SOL"].index(row.symbol)
+        expected = calculate_trading_metrics(predictions[:, column], returns[:, column],
+                                             threshold=row.threshold)
+        for name in METRIC_COLUMNS:
+            np.testing.assert_allclose(getattr(row, name), expected[name], rtol=1e-10)
+
+
+def test_signal_param_sweep_matches_single_evaluation(panel):
+    predictions, returns = panel
+    rng = np.random.default_rng(5)
+    volume_ratio = rng.uniform(0.5, 3.0, returns.shape)
+    confidence = rng.uniform(0, 1, returns.shape)
+    grid = {"momentum_threshold": [0.0, 0.01], "volume_threshold": [1.0, 2.0],
+            "min_confidence": [0.3, 0.7]}
+
+    table = sweep_signal_params(predictions, volume_ratio, confidence, returns, grid)
+
+    assert len(table) == 8
+    row = table[(table.momentum_threshold == 0.01) & (table.volume_threshold == 1.0) &
+                (table.min_confidence == 0.3)].iloc[0]
+    active = (np.abs(predictions) > 0.01) & (volume_ratio > 1.0) & (confidence >= 0.3)
+    signals = np.where(active, np.sign(predictions), 0)
+    strategy = (signals[:-1] * returns[1:]).mean(axis=1)
+    np.testing.assert_allclose(row.total_return, np.prod(1 + strategy) - 1)
+    assert row.total_trades == np.count_nonzero(signals)
+
+
+def test_signal_param_sweep_rejects_unknown_parameters(panel):
+    predictions, returns = panel
+    with pytest.raises(ValueError):
+        sweep_signal_params(predictions, returns, returns, returns, {"lookback": [5]})
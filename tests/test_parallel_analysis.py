@@ -0,0 +1,35 @@
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from tests.analyze_indicators import analyze_symbols_parallel
+
+
+def fake_analysis(symbol: str, **kwargs) -> dict:
+    """Stand-in for the per-symbol analysis; runs inside the worker process."""
+    if symbol == "BAD-USD":
+        raise ValueError("no data")
+    return {
+        "top_indicators": {"momentum_rsi": len(symbol) / 10},
+        "artifacts": [f"{symbol}.csv"],
+        "collection": kwargs["collection_name"]
+    }
+
+
+def test_parallel_runner_collects_results_and_failures():
+    symbols = ["BTC-USD", "ETH-USD", "BAD-USD", "SOL-USD"]
+
+    summary = analyze_symbols_parallel(symbols, max_workers=2, analyze_fn=fake_analysis,
+                                       collection_name="prices")
+
+    assert sorted(summary["results"]) == ["BTC-USD", "ETH-USD", "SOL-USD"]
+    assert list(summary["failures"]) == ["BAD-USD"]
+    assert "no data" in summary["failures"]["BAD-USD"]
+    assert set(summary["timings"]) == set(symbols)
+    assert summary["artifacts"]["ETH-USD"] == ["ETH-USD.csv"]
+    assert summary["results"]["BTC-USD"]["collection"] == "prices"
+    assert summary["scores"].loc["SOL-USD", "momentum_rsi"] == 0.7
@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import minimize
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from strategy.portfolio.allocation import (
+    PortfolioOptimizer, cap_weights, mean_variance_weights, risk_parity_weights, shrinkage_covariance
+)
+
+
+def make_returns(n_bars: int = 120, n_assets: int = 40, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    volatility = np.linspace(0.01, 0.06, n_assets)
+    market = rng.normal(0, 0.02, (n_bars, 1))
+    values = 0.5 * market + rng.standard_normal((n_bars, n_assets)) * volatility
+    return pd.DataFrame(values, columns=[f"SYM{i}-USD" for i in range(n_assets)])
+
+
+def test_risk_parity_equalises_risk_contributions():
+    covariance = shrinkage_covariance(make_returns(n_assets=10))
+
+    weights = risk_parity_weights(covariance)
+
+    contributions = weights * (covariance @ weights)
+    np.testing.assert_allclose(contributions / contributions.sum(), 0.1, atol=1e-8)
+    assert weights.sum() == pytest.approx(1.0)
+
+
+def test_mean_variance_matches_generic_solver():
+    rng = np.random.default_rng(1)
+    returns = make_returns(n_assets=12)
+    covariance = shrinkage_covariance(returns)
+    mu = rng.normal(0.001, 0.002, 12)
+
+    weights = mean_variance_weights(covariance, mu, risk_aversion=5.0, max_weight=0.2, budget=0.75)
+
+    def negative_utility(w):
+        return -(mu @ w - 2.5 * w @ covariance @ w)
+
+    reference = minimize(negative_utility, np.full(12, 0.05), method="SLSQP", bounds=[(0, 0.2)] * 12,
+                         constraints=[{"type": "ineq", "fun": lambda w: 0.75 - w.sum()}],
+                         options={"ftol": 1e-15, "maxiter": 1000})
+    assert negative_utility(weights) <= reference.fun + 1e-10
+    assert weights.min() >= 0 and weights.max() <= 0.2 + 1e-12 and weights.sum() <= 0.75 + 1e-9
+
+
+def test_cap_weights_redistributes_excess():
+    weights = cap_weights(np.array([10.0, 1.0, 1.0, 0.0]), max_weight=0.4, budget=0.75)
+
+    np.testing.assert_allclose(weights, [0.4, 0.175, 0.175, 0.0])
+    # Not enough assets to reach the budget under the cap: the rest stays cash
+    np.testing.assert_allclose(cap_weights(np.array([3.0, 1.0]), 0.3, 0.75), [0.3, 0.3])
+
+
+@pytest.mark.parametrize("method", ["inverse_volatility", "risk_parity", "mean_variance"])
+def test_optimizer_respects_constraints_and_volatility_target(method):
+    returns = make_returns()
+    expected = pd.Series(np.linspace(0.002, -0.001, returns.shape[1]), index=returns.columns)
+    optimizer = PortfolioOptimizer(method, max_weight=0.05, budget=0.75, target_volatility=0.15)
+
+    weights = optimizer.rebalance(returns.iloc[:63], expected)
+
+    assert list(weights.index) == list(returns.columns)
+    assert weights.min() >= 0 and weights.max() <= 0.05 + 1e-12 and weights.sum() <= 0.75 + 1e-9
+    assert optimizer.summary(returns.iloc[:63])["volatility"] <= 0.15 + 1e-9
+    if method == "inverse_volatility":
+        # No asset reaches the cap, so weights stay proportional to inverse volatility
+        inverse_volatility = 1 / np.sqrt(np.diag(shrinkage_covariance(returns.iloc[:63])))
+        np.testing.assert_allclose(weights / inverse_volatility, weights.iloc[0] / inverse_volatility[0])
+
+
+def test_warm_start_follows_universe_changes():
+    returns = make_returns()
+    optimizer = PortfolioOptimizer("risk_parity", max_weight=1.0, budget=1.0, target_volatility=None)
+    optimizer.rebalance(returns.iloc[:63])
+
+    # One symbol delists and another has too little history to be sized
+    window = returns.iloc[1:64].copy()
+    window["SYM0-USD"] = np.nan
+    window["NEW-USD"] = np.r_[np.full(62, np.nan), 0.01]
+    weights = optimizer.rebalance(window)
+    cold = PortfolioOptimizer("risk_parity", max_weight=1.0, budget=1.0,
+                              target_volatility=None).rebalance(window)
+
+    assert weights["SYM0-USD"] == 0 and weights["NEW-USD"] == 0
+    pd.testing.assert_series_equal(weights, cold, atol=1e-8)
+    contributions = optimizer.risk_contributions(window)
+    np.testing.assert_allclose(contributions[weights > 0], 1 / (returns.shape[1] - 1), atol=1e-6)
@@ -0,0 +1,91 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import norm
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils.metrics import calculate_trading_metrics, historical_tail_risk, rolling_tail_risk
+from strategy.portfolio.risk import RiskEngine, sample_moments
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(5)
+    market = rng.normal(0, 0.02, (400, 1))
+    values = market * np.array([0.5, 1.0, 1.5, 0.8]) + rng.normal(0, 0.01, (400, 4))
+    return pd.DataFrame(values, columns=["BTC-USD", "ETH-USD", "SOL-USD", "ADA-USD"])
+
+
+def test_historical_tail_risk_matches_sorted_returns():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0, 0.02, (60, 3))
+    values[:20, 2] = np.nan
+
+    var, es = historical_tail_risk(values, 0.95)
+
+    # 5% of 60 returns is the worst 3; of the 40 returns in the last column, the worst 2
+    for column, k in ((0, 3), (1, 3), (2, 2)):
+        worst = np.sort(values[~np.isnan(values[:, column]), column])[:k]
+        assert var[column] == worst[-1]
+        assert es[column] == pytest.approx(worst.mean())
+    metrics = calculate_trading_metrics(values[:, 0])
+    assert (metrics["var_95"], metrics["expected_shortfall"]) == pytest.approx((var[0], es[0]))
+
+
+def test_rolling_tail_risk_ignores_gaps_like_historical_tail_risk():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 0.02, (200, 3))
+    values[30, 0] = np.nan       # gap
+    values[:120, 1] = np.nan     # late listing
+    window = 60
+
+    var, es = rolling_tail_risk(values, window, 0.95)
+
+    assert np.isnan(var[:120 - window + 1, 1]).all() and np.isnan(es[:120 - window + 1, 1]).all()
+    for start in (0, 10, 31, 100, 115, len(values) - window):
+        expected_var, expected_es = historical_tail_risk(values[start:start + window], 0.95)
+        np.testing.assert_array_equal(var[start], expected_var)
+        np.testing.assert_allclose(es[start], expected_es, rtol=1e-12)
+
+
+def test_risk_engine_covers_assets_and_portfolios(returns):
+    weights = pd.DataFrame({"BTC-USD": [0.5, 0.0], "ETH-USD": [0.5, 0.25]}, index=["core", "eth"])
+    engine = RiskEngine(confidence=0.99, n_simulations=200_000, seed=3)
+
+    risk = engine.compute(returns, weights)
+
+    assert list(risk.index) == list(returns.columns) + ["core", "eth"]
+    portfolio_returns = returns[["BTC-USD", "ETH-USD"]].to_numpy() @ np.array([[0.5, 0.0], [0.5, 0.25]])
+    var, es = historical_tail_risk(portfolio_returns, 0.99)
+    np.testing.assert_allclose(risk.loc[["core", "eth"], "historical_var"], var)
+    np.testing.assert_allclose(risk.loc[["core", "eth"], "historical_es"], es)
+
+    means, covariance = sample_moments(returns.to_numpy())
+    std = np.sqrt(np.diag(covariance))
+    np.testing.assert_allclose(risk["parametric_var"].iloc[:4], means + norm.ppf(0.01) * std)
+    # Gaussian scenarios converge to the closed form
+    np.testing.assert_allclose(risk["monte_carlo_var"], risk["parametric_var"], rtol=0.03)
+    np.testing.assert_allclose(risk["monte_carlo_es"], risk["parametric_es"], rtol=0.03)
+    assert (risk.filter(like="_es") <= risk.filter(like="_var").to_numpy()).all().all()
+
+
+def test_monte_carlo_is_reproducible_across_chunks_and_workers(returns):
+    weights = pd.Series(0.25, index=returns.columns, name="equal")
+    kwargs = dict(n_simulations=50_000, degrees_of_freedom=4, seed=11)
+    serial = RiskEngine(**kwargs, chunk_bytes=64_000).compute(returns, weights, ["monte_carlo"])
+    parallel = RiskEngine(**kwargs, chunk_bytes=64_000, n_jobs=2).compute(returns, weights, ["monte_carlo"])
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    # Fat tails: the Student-t shortfall is worse than the Gaussian one at the same volatility
+    gaussian = RiskEngine(confidence=0.99, seed=11).compute(returns, weights, ["parametric"])
+    student = RiskEngine(confidence=0.99, **kwargs).compute(returns, weights, ["monte_carlo"])
+    assert (student["monte_carlo_es"] < gaussian["parametric_es"]).all()
+    with pytest.raises(ValueError):
+        RiskEngine().compute(returns, weights, ["delta_gamma"])
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.rolling_correlation import RollingCorrelationEngine
+
+SYMBOLS = ["BTC-USD", "ETH-USD", "SOL-USD", "XRP-USD", "DOGE-USD"]
+
+
+@pytest.fixture
+def returns() -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    market = rng.normal(0, 0.02, (300, 1))
+    noise = rng.normal(0, 0.02, (300, len(SYMBOLS)))
+    # BTC/ETH/SOL follow the market closely, XRP and DOGE barely
+    values = market * np.array([1.0, 1.0, 0.9, 0.1, 0.0]) + noise * np.array([0.3, 0.3, 0.3, 1.0, 1.0])
+    frame = pd.DataFrame(values, columns=SYMBOLS)
+    frame.iloc[::13, 2] = np.nan  # SOL misses some bars
+    return frame
+
+
+def test_incremental_updates_match_pandas_rolling_window(returns):
+    window = 40
+    engine = RollingCorrelationEngine(SYMBOLS, window=window)
+
+    for t, row in enumerate(returns.to_numpy()):
+        engine.update(row)
+        if t in (window - 2, window + 5, 2 * window + 3, len(returns) - 1):
+            expected = returns.iloc[max(0, t + 1 - window):t + 1].corr(min_periods=window)
+            np.testing.assert_allclose(engine.correlation(), expected.to_numpy(), atol=1e-10)
+
+    # Dict input, with symbols missing for this bar
+    engine.update({"BTC-USD": 0.01, "ETH-USD": 0.012, "UNKNOWN": 1.0})
+    expected = pd.concat([returns, pd.DataFrame([{"BTC-USD": 0.01, "ETH-USD": 0.012}])]).iloc[-window:]
+    np.testing.assert_allclose(engine.correlation_frame(), expected.corr(min_periods=window), atol=1e-10)
+
+
+def test_pairs_clusters_and_position_queries(returns):
+    engine = RollingCorrelationEngine.from_returns(returns, window=120, min_periods=60)
+
+    pairs = engine.pairs_above(0.7)
+    assert {frozenset(pair[:2]) for pair in pairs} == {
+        frozenset(pair) for pair in [("BTC-USD", "ETH-USD"), ("BTC-USD", "SOL-USD"), ("ETH-USD", "SOL-USD")]
+    }
+
+    clusters = engine.clusters(0.7)
+    assert clusters["BTC-USD"] == clusters["ETH-USD"] == clusters["SOL-USD"]
+    assert len({clusters["BTC-USD"], clusters["XRP-USD"], clusters["DOGE-USD"]}) == 3
+
+    assert engine.max_correlation_with("ETH-USD", ["BTC-USD", "DOGE-USD"]) > 0.7
+    assert engine.max_correlation_with("DOGE-USD", ["XRP-USD"]) < 0.7
+    assert np.isnan(engine.max_correlation_with("DOGE-USD", []))
+
+
+def test_prices_feed_returns():
+    prices = pd.DataFrame({"A": [100.0, 110.0, np.nan, 99.0], "B": [10.0, 10.5, 11.0, 10.0]})
+    engine = RollingCorrelationEngine(["A", "B"], window=3, min_periods=2)
+
+    for row in prices.to_numpy():
+        engine.update_prices(row)
+
+    # A's missing bar carries its last price forward
+    expected = pd.DataFrame({"A": [0.1, np.nan, 99 / 110 - 1], "B": [0.05, 11 / 10.5 - 1, 10 / 11 - 1]})
+    np.testing.assert_allclose(engine.correlation(), expected.corr(min_periods=2).to_numpy(), atol=1e-12)
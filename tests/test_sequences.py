@@ -0,0 +1,116 @@
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.feature_store import FeatureStore, build_feature_tensor
+from data.sequences import SequenceDataset
+
+FEATURES = ["momentum_rsi", "trend_sma_fast", "volume_em", "volume_adi"]
+
+
+@pytest.fixture
+def tensor():
+    rng = np.random.default_rng(11)
+    frames = {}
+    for symbol, start, n_rows in (("BTC-USD", "2024-01-01", 300), ("ETH-USD", "2024-02-01", 269),
+                                  ("SOL-USD", "2024-01-01", 300)):
+        frame = pd.DataFrame({
+            "date": pd.date_range(start, periods=n_rows, freq="D"),
+            "close": 100 * np.cumprod(1 + 0.01 * rng.standard_normal(n_rows)),
+            **{name: rng.normal(10 * i, i + 1, n_rows) for i, name in enumerate(FEATURES)}
+        })
+        frame.loc[:4, "trend_sma_fast"] = np.nan
+        frames[symbol] = frame
+    frames["SOL-USD"].loc[150, "volume_em"] = np.inf
+    return build_feature_tensor(frames, FEATURES, horizons=(1, 3))
+
+
+def test_windows_are_views_and_samples_respect_gaps_and_split(tensor):
+    dataset = SequenceDataset(tensor, lookback=20, horizon=3, validation_split=0.2)
+
+    assert np.shares_memory(dataset.windows, tensor.features)
+    np.testing.assert_array_equal(dataset.windows[7, 2], tensor.features[7:27, 2])
+
+    starts, symbols = np.concatenate([dataset.samples("train"), dataset.samples("validation")], axis=1)
+    assert len(starts) == len(dataset)
+    for start, symbol in zip(starts, symbols):
+        window = tensor.features[start:start + 20, symbol]
+        assert tensor.present[start:start + 20, symbol].all() and np.isfinite(window).all()
+    # The bad bar of SOL-USD and ETH-USD's late listing leave no window behind
+    assert not ((symbols == 2) & (starts > 130) & (starts <= 150)).any()
+    assert starts[symbols == 1].min() == 31 + 5
+
+    train_ends = dataset.samples("train")[0] + 19
+    validation_ends = dataset.samples("validation")[0] + 19
+    assert dataset.split_date == 240
+    assert train_ends.max() + 3 < 240 <= validation_ends.min()
+
+
+def test_batches_stream_standardised_shuffled_samples(tensor):
+    dataset = SequenceDataset(tensor, lookback=16, features=["volume_em", "momentum_rsi"])
+    assert not np.shares_memory(dataset.features, tensor.features)
+
+    batches = list(dataset.batches("train", batch_size=32, seed=4))
+    X = np.concatenate([batch[0] for batch in batches])
+    y = np.concatenate([batch[1] for batch in batches])
+    assert X.shape == (dataset.size("train"), 16, 2) and X.dtype == np.float32
+    assert [len(batch[1]) for batch in batches[:-1]] == [32] * (len(batches) - 1)
+
+    # Shuffled order visits every sample once; gathered values match the tensor
+    starts, symbols = dataset.samples("train")
+    order = np.random.default_rng(4).permutation(len(starts))
+    raw = np.stack([dataset.features[s:s + 16, j] for s, j in zip(starts[order], symbols[order])])
+    np.testing.assert_allclose(X, (raw - dataset.mean) / dataset.std, rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(y, tensor.target(1)[starts[order] + 15, symbols[order]])
+    assert np.abs(X.reshape(-1, 2).mean(axis=0)).max() < 0.1
+
+    serial = list(dataset.batches("train", batch_size=32, seed=4, prefetch=0))
+    assert all(np.array_equal(a[0], b[0]) for a, b in zip(batches, serial))
+    validation = list(dataset.batches("validation", shuffle=False))
+    assert sum(len(batch[1]) for batch in validation) == dataset.size("validation")
+
+
+def test_memory_mapped_tensor_streams_in_small_footprint(tmp_path):
+    rng = np.random.default_rng(2)
+    frames = {
+        symbol: pd.DataFrame({
+            "date": pd.date_range("2020-01-01", periods=2_000, freq="D"),
+            "close": 100 * np.cumprod(1 + 0.01 * rng.standard_normal(2_000)),
+            **{name: rng.standard_normal(2_000) for name in FEATURES}
+        })
+        for symbol in ("BTC-USD", "ETH-USD", "SOL-USD")
+    }
+    store = FeatureStore(tmp_path)
+    store.save(build_feature_tensor(frames, FEATURES), "v1")
+    dataset = SequenceDataset(store.load("v1"), lookback=60)
+    stacked_bytes = len(dataset) * 60 * dataset.n_features * 4
+
+    tracemalloc.start()
+    n_samples = sum(len(y) for _, y in dataset.batches("train", batch_size=32))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert n_samples == dataset.size("train")
+    # Only the shuffled sample order and the batches in flight are allocated
+    assert peak < stacked_bytes / 15
+
+
+def test_lstm_trains_on_streamed_batches(tensor):
+    pytest.importorskip("tensorflow")
+    from analysis.sequence_model import train_lstm
+
+    dataset = SequenceDataset(tensor, lookback=10)
+    model, history = train_lstm(dataset, seed=0, epochs=2, layers=[8, 4], batch_size=64)
+
+    assert len(history["loss"]) == 2 and "val_loss" in history
+    assert model.predict(dataset.gather(*dataset.samples("validation"))[0], verbose=0).shape == (
+        dataset.size("validation"), 1)
@@ -0,0 +1,74 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from strategy.signals.generator import SignalEngine, signal_rule
+
+
+def make_panel(n_bars: int = 300, n_symbols: int = 6, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    symbols = [f"SYM{i}-USD" for i in range(n_symbols)]
+    index = pd.date_range("2024-01-01", periods=n_bars, freq="D")
+    close = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n_bars, n_symbols)), axis=0)),
+                         index=index, columns=symbols)
+    spikes = np.where(rng.random((n_bars, n_symbols)) < 0.1, 4.0, 1.0)
+    volume = pd.DataFrame(rng.lognormal(10, 0.3, (n_bars, n_symbols)) * spikes, index=index, columns=symbols)
+    confidence = pd.DataFrame(rng.random((n_bars, n_symbols)), index=index, columns=symbols)
+    # A symbol that lists late and one with a missing bar
+    close.iloc[:50, 0] = np.nan
+    close.iloc[120, 1] = np.nan
+    return close, volume, confidence
+
+
+def test_incremental_updates_reproduce_batch_signals():
+    close, volume, confidence = make_panel()
+    engine = SignalEngine(close.columns)
+
+    batch = engine.generate(close, volume, confidence)
+    live = [engine.update(close.iloc[t], volume.iloc[t], confidence.iloc[t]) for t in range(len(close))]
+
+    signals = batch["signals"].to_numpy()
+    assert signals.dtype == np.int8 and batch["confidence"].to_numpy().dtype == np.float32
+    np.testing.assert_array_equal(np.array([bar["signals"] for bar in live]), signals)
+    np.testing.assert_array_equal(np.array([bar["confidence"] for bar in live]), batch["confidence"].to_numpy())
+    assert (signals == 1).any() and (signals == -1).any()
+    assert not signals[:engine.lookback].any()
+    # A missing bar keeps the symbol flat until it leaves the window
+    assert not signals[120:120 + engine.lookback + 1, 1].any()
+    scores = batch["confidence"].to_numpy()
+    assert (scores[signals != 0] >= engine.params["min_confidence"]).all()
+    assert (scores[signals == 0] == 0).all()
+
+
+def test_signal_rule_filters():
+    momentum = np.array([0.05, -0.05, 0.05, 0.05, 0.01, np.nan])
+    volume_ratio = np.array([3.0, 3.0, 1.0, 3.0, 3.0, 3.0])
+    confidence = np.array([0.9, 0.9, 0.9, 0.5, 0.9, 0.9])
+    volatility_ratio = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+
+    signals = signal_rule(momentum, volume_ratio, confidence, 0.02, 2.0, 0.7, volatility_ratio, 1.5)
+    np.testing.assert_array_equal(signals, [1, -1, 0, 0, 0, 0])
+
+    # Volatility expansion beyond the threshold blocks entries
+    expanded = signal_rule(momentum, volume_ratio, confidence, 0.02, 2.0, 0.7, volatility_ratio * 2, 1.5)
+    assert not expanded.any()
+
+
+def test_rules_only_without_model_confidence():
+    close, volume, _ = make_panel(seed=3)
+    engine = SignalEngine(close.columns, {"min_confidence": 0.0, "lookback_periods": 10})
+
+    batch = engine.generate(close.to_numpy(), volume.to_numpy())
+
+    assert isinstance(batch["signals"], np.ndarray)
+    np.testing.assert_array_equal(batch["confidence"], (batch["signals"] != 0).astype(np.float32))
+    with pytest.raises(ValueError):
+        engine.update(np.ones(3), np.ones(3))
@@ -0,0 +1,83 @@
+import json
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from data.streaming_indicators import INDICATOR_COLUMNS, StreamingIndicators
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(3)
+    n_bars = 600
+    close = 30_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    return pd.DataFrame({
+        'open': close,
+        'high': close * (1 + np.abs(rng.normal(0, 0.01, n_bars))),
+        'low': close * (1 - np.abs(rng.normal(0, 0.01, n_bars))),
+        'close': close,
+        'volume': rng.uniform(1e3, 1e4, n_bars)
+    })
+
+
+def test_streaming_matches_ta_batch_output(bars):
+    ta = pytest.importorskip('ta')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        expected = ta.add_all_ta_features(bars.copy(), 'open', 'high', 'low', 'close', 'volume')
+
+    streamed = StreamingIndicators().run(bars)
+
+    # ta reports zeros rather than NaN while ADX warms up
+    warmup = streamed['trend_adx'].isna()
+    assert (expected.loc[warmup, 'trend_adx'] == 0).all()
+    expected.loc[warmup, 'trend_adx'] = np.nan
+
+    for column in INDICATOR_COLUMNS:
+        np.testing.assert_allclose(
+            streamed[column].to_numpy(), expected[column].to_numpy(dtype=np.float64),
+            rtol=1e-9, atol=1e-9, err_msg=column
+        )
+
+
+def test_snapshot_restore_resumes_stream(bars):
+    split = 250
+    full = StreamingIndicators().run(bars)
+
+    indicators = StreamingIndicators()
+    indicators.run(bars.iloc[:split])
+    snapshot = json.loads(json.dumps(indicators.snapshot(), allow_nan=False))
+
+    restored = StreamingIndicators.restore(snapshot)
+    resumed = restored.run(bars.iloc[split:])
+
+    pd.testing.assert_frame_equal(resumed, full.iloc[split:])
+
+
+def test_warmup_snapshot_is_strict_json(bars):
+    indicators = StreamingIndicators()
+    # Zero volume makes the ease of movement infinite; the windows are still warming up
+    for high, low, close in bars[['high', 'low', 'close']].to_numpy()[:5]:
+        indicators.update(high, low, close, 0.0)
+
+    encoded = json.dumps(indicators.snapshot(), allow_nan=False)
+    assert 'null' in encoded and '"inf"' in encoded
+
+    restored = StreamingIndicators.restore(json.loads(encoded))
+    next_bar = bars[['high', 'low', 'close', 'volume']].to_numpy()[5]
+    pd.testing.assert_series_equal(pd.Series(restored.update(*next_bar)), pd.Series(indicators.update(*next_bar)))
+def test_update_returns_feature_columns_in_order(bars):
+    indicators = StreamingIndicators({'sma_fast': 3})
+    values = [indicators.update(*row) for row in bars[['high', 'low', 'close', 'volume']].to_numpy()[:3]]
+
+    assert list(values[-1]) == INDICATOR_COLUMNS
+    assert np.isnan(values[1]['trend_sma_fast'])
+    assert values[2]['trend_sma_fast'] == pytest.approx(bars['close'].iloc[:3].mean())
@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from analysis.model_evaluation import evaluate_predictions
+from analysis.walk_forward import build_model, run_walk_forward, symbol_folds, walk_forward_windows
+from data.feature_store import FeatureStore
+
+FEATURES = ["momentum_rsi", "trend_sma_fast", "volume_em"]
+WINDOWS = {"training": 120, "validation": 20, "test": 20}
+FAST_FOREST = {"random_forest": {"n_estimators": 10}}
+
+
+def make_frames(n_rows: int = 240, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for symbol in ("BTC-USD", "ETH-USD"):
+        features = rng.standard_normal((n_rows, len(FEATURES)))
+        returns = 0.01 * features[:, 0] + 0.001 * rng.standard_normal(n_rows)
+        frame = pd.DataFrame(features, columns=FEATURES)
+        # Today's features drive tomorrow's return
+        frame["close"] = 100 * np.cumprod(1 + np.concatenate([[0.0], returns[:-1]]))
+        frame.loc[:4, "trend_sma_fast"] = np.nan  # indicator warm-up
+        frame.insert(0, "date", pd.date_range("2024-01-01", periods=n_rows, freq="D"))
+        frames[symbol] = frame
+    return frames
+
+
+def test_windows_tile_history_without_lookahead():
+    folds = walk_forward_windows(400, training=252, validation=63, test=21)
+
+    assert len(folds) == 4
+    assert folds[0] == {"fold": 0, "train": (0, 252), "validation": (252, 315), "test": (315, 336)}
+    assert folds[1]["test"] == (336, 357)
+    assert all(fold["train"][1] <= fold["validation"][0] < fold["test"][0] for fold in folds)
+
+    expanding = walk_forward_windows(400, 252, 63, 21, expanding=True)
+    assert [fold["train"] for fold in expanding[:2]] == [(0, 252), (0, 273)]
+    assert walk_forward_windows(300) == []
+
+    # Five-bar targets: five bars purged before validation and before test
+    purged = walk_forward_windows(400, 252, 63, 21, gap=5)
+    assert len(purged) == 3
+    assert purged[0] == {"fold": 0, "train": (0, 252), "validation": (257, 320), "test": (325, 346)}
+
+
+def test_folds_follow_each_symbols_listing(tmp_path):
+    frames = make_frames()
+    frames["ETH-USD"] = frames["ETH-USD"].iloc[60:]  # listed 60 bars later
+    tensor = FeatureStore(tmp_path).get_or_build(frames, FEATURES + ["missing_indicator"], horizons=[1])
+
+    assert isinstance(tensor.features, np.memmap) and tensor.feature_names == FEATURES
+    assert [fold["train"] for fold in symbol_folds(tensor, "BTC-USD", windows=WINDOWS)] == [
+        (0, 120), (20, 140), (40, 160), (60, 180)
+    ]
+    # ETH's windows start at its first bar, so its 180 bars fit one fold
+    assert symbol_folds(tensor, "ETH-USD", windows=WINDOWS) == [
+        {"fold": 0, "train": (60, 180), "validation": (181, 201), "test": (202, 222)}
+    ]
+
+def test_purge_counts_the_symbols_own_bars(tmp_path):
+    frames = make_frames()
+    # ETH misses every other date after the first 100 bars
+    frames["ETH-USD"] = frames["ETH-USD"].drop(index=range(101, 240, 2))
+    tensor = FeatureStore(tmp_path).get_or_build(frames, FEATURES, horizons=[5])
+
+    folds = symbol_folds(tensor, "ETH-USD", horizon=5, windows=WINDOWS)
+    # 170 bars fit one fold: 120 training bars, 5 purged, 20 validation, 5 purged, 20 test
+    assert folds == [{"fold": 0, "train": (0, 139), "validation": (150, 189), "test": (200, 239)}]
+    bars = np.flatnonzero(tensor.present[:, tensor.symbols.index("ETH-USD")])
+    last_train = np.searchsorted(bars, folds[0]["train"][1] - 1)
+    # The last training target ends before the first validation bar
+    assert bars[last_train + 5] < folds[0]["validation"][0]
+
+
+def test_parallel_folds_match_serial_training(tmp_path):
+    frames = make_frames()
+
+    summary = run_walk_forward(frames, features=FEATURES, windows=WINDOWS,
+                               model_params=FAST_FOREST, max_workers=2, store=FeatureStore(tmp_path))
+
+    assert summary["failures"] == {}
+    # One-bar targets purge one bar before each later window
+    assert [fold["test"] for fold in summary["folds"]["BTC-USD"]] == [(142, 162), (162, 182), (182, 202),
+                                                                        (202, 222)]
+    results = summary["results"]
+    assert len(results) == 2 * 4 * 2  # symbols x folds x windows
+    assert set(results.columns) >= {"mse", "r2", "directional_accuracy", "hit_rate"}
+    assert list(summary["by_fold"].index.get_level_values("fold").unique()) == [0, 1, 2, 3]
+    # Features predict next-bar returns, so test windows are mostly called correctly
+    assert results.loc[results["window"] == "test", "directional_accuracy"].mean() > 0.7
+
+    # Same fold trained in this process from the stored tensor, without the warm-up rows, gives the same scores
+    tensor = FeatureStore(tmp_path).load(FeatureStore(tmp_path).versions()[0])
+    j = tensor.symbols.index("BTC-USD")
+    X, y = tensor.features[:, j], tensor.target(1)[:, j]
+    model = build_model("random_forest", n_estimators=10).fit(X[5:120], y[5:120])
+    expected = evaluate_predictions(np.asarray(y[142:162]), model.predict(X[142:162]))
+    row = results[(results["symbol"] == "BTC-USD") & (results["fold"] == 0) & (results["window"] == "test")]
+    assert row["mse"].item() == pytest.approx(expected["mse"])
+    np.testing.assert_allclose(summary["predictions"][("BTC-USD", "random_forest", 0)],
+                               model.predict(X[142:162]))
@@ -1,38 +1,99 @@
+import atexit
 import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from datetime import datetime
+from typing import Dict
+
+# One background listener per configured logger; it owns the file and
+# console handlers, so logging calls only put the record on a queue
+_listeners: Dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+class _LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and file on the first record, not at setup."""
+
+    def __init__(self, filename: Path):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
 
 def setup_logger(name: str, log_dir: Path = Path("logs")) -> logging.Logger:
-    """Set up a logger with file and console handlers."""
-    # Create logs directory if it doesn't exist
-    log_dir.mkdir(exist_ok=True)
-    
-    # Create logger
+    """
+    Set up a logger with file and console handlers.
+
+    Records are handed to a ``QueueHandler`` and written by a
+    ``QueueListener`` thread, so a logging call never waits on disk or
+    console I/O. Calling this again for the same name returns the logger
+    as it is, without adding handlers. ``log_dir`` and the log file are
+    only created once something is logged.
+    """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    
-    # Create formatters
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(levelname)s - %(message)s'
-    )
-    
-    # File handler
-    file_handler = logging.FileHandler(
-        log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
-    )
-    file_handler.setFormatter(file_formatter)
-    file_handler.setLevel(logging.INFO)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(console_formatter)
-    console_handler.setLevel(logging.INFO)
-    
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+    with _listeners_lock:
+        if name in _listeners:
+            return logger
+
+        logger.setLevel(logging.INFO)
+
+        # Create formatters
+        file_formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        console_formatter = logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s'
+        )
+
+        # File handler
+        file_handler = _LazyFileHandler(
+            log_dir / f"{name}_{datetime.now().strftime('%Y%m%d')}.log"
+        )
+        file_handler.setFormatter(file_formatter)
+        file_handler.setLevel(logging.INFO)
+
+        # Console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(console_formatter)
+        console_handler.setLevel(logging.INFO)
+
+        # The logger only enqueues; the listener thread does the writing
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+        listener.start()
+        logger.addHandler(QueueHandler(records))
+        _listeners[name] = listener
+
     return logger
+
+
+def _stop_listener(name: str, listener: QueueListener):
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    logger = logging.getLogger(name)
+    for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+        logger.removeHandler(handler)
+
+
+def shutdown_logger(name: str):
+    """Flush and stop the listener of one logger set up by ``setup_logger``; others keep running."""
+    with _listeners_lock:
+        listener = _listeners.pop(name, None)
+        if listener is not None:
+            _stop_listener(name, listener)
+
+
+def shutdown_loggers():
+    """Flush queued records, stop the listener threads and close their handlers."""
+    with _listeners_lock:
+        for name, listener in _listeners.items():
+            _stop_listener(name, listener)
+        _listeners.clear()
+
+
+atexit.register(shutdown_loggers)
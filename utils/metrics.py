@@ -1,6 +1,21 @@
 import numpy as np
 import pandas as pd
 from typing import Tuple, Dict
+import sys
+from pathlib import Path
+
+# Add the project root directory to Python path
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from config.analysis_config import TIME_WINDOWS
+
+# Confidence level of the value at risk and expected shortfall in the trading metrics
+VAR_CONFIDENCE = 0.95
+
+# Windows sorted at once by the rolling tail risk metrics, to bound memory
+_TAIL_CHUNK_ELEMENTS = 4_000_000
 
 def calculate_trading_metrics(returns: np.ndarray, 
                             risk_free_rate: float = 0.0) -> Dict[str, float]:
@@ -39,6 +54,8 @@ def calculate_trading_metrics(returns: np.ndarray,
     
     # Risk-adjusted metrics
     calmar_ratio = annual_return / abs(max_drawdown)
+
+    var_95, expected_shortfall = historical_tail_risk(returns, VAR_CONFIDENCE)
     
     return {
         "total_return": total_return,
@@ -48,13 +65,249 @@ def calculate_trading_metrics(returns: np.ndarray,
         "sortino_ratio": sortino_ratio,
         "max_drawdown": max_drawdown,
         "calmar_ratio": calmar_ratio,
+        "var_95": var_95,
+        "expected_shortfall": expected_shortfall,
         "win_rate": (returns > 0).mean(),
         "profit_factor": abs(returns[returns > 0].sum() / returns[returns < 0].sum())
     }
 
+def tail_size(n_observations, confidence: float):
+    """Number of worst observations in the ``1 - confidence`` tail (at least one)."""
+    # Round first so that e.g. 0.05 * 60 does not become 3.0000000000000027 and then 4
+    return np.maximum(np.ceil(np.round((1 - confidence) * np.asarray(n_observations), 9)), 1).astype(np.int64)
+
+def historical_tail_risk(returns: np.ndarray, confidence: float = VAR_CONFIDENCE) -> Tuple:
+    """
+    Historical value at risk and expected shortfall of each column.
+
+    With ``k = ceil((1 - confidence) * n)``, the VaR is the k-th worst
+    return and the expected shortfall the mean of the k worst returns.
+    Both are returns, negative for a loss, like ``calculate_max_drawdown``.
+    NaNs are ignored per column.
+
+    Args:
+        returns: Array of returns, shape (time,) or (time, columns)
+        confidence: Confidence level, e.g. 0.95 or 0.99
+
+    Returns:
+        Tuple (var, expected_shortfall), floats or arrays of shape (columns,)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    squeeze = returns.ndim == 1
+    if squeeze:
+        returns = returns[:, None]
+
+    counts = (~np.isnan(returns)).sum(axis=0)
+    k = tail_size(counts, confidence)
+    # NaNs sort last, so the worst k of each column are its first k rows
+    ordered = np.sort(np.vstack([returns, np.full((1, returns.shape[1]), np.nan)]), axis=0)
+    cumulative = np.cumsum(np.nan_to_num(ordered), axis=0)
+    columns = np.arange(returns.shape[1])
+    var = np.where(counts > 0, ordered[k - 1, columns], np.nan)
+    es = np.where(counts > 0, cumulative[k - 1, columns] / k, np.nan)
+    if squeeze:
+        return float(var[0]), float(es[0])
+    return var, es
+
 def calculate_max_drawdown(returns: np.ndarray) -> float:
     """Calculate maximum drawdown from returns."""
     cum_returns = (1 + returns).cumprod()
     running_max = np.maximum.accumulate(cum_returns)
     drawdowns = cum_returns / running_max - 1
     return drawdowns.min()
+
+def calculate_rolling_metrics(returns: np.ndarray,
+                              window: int = TIME_WINDOWS["training"],
+                              risk_free_rate: float = 0.0,
+                              min_periods: int = 1) -> Dict[str, np.ndarray]:
+    """
+    Calculate trading metrics over every trailing window.
+
+    Window sums come from cumulative sums and the rolling maximum drawdown
+    from block-wise prefix/suffix scans, so their cost does not depend on
+    the window length; only the tail risk metrics partition each window.
+    The value at row t equals ``calculate_trading_metrics`` applied to
+    the non-NaN returns of ``returns[t - window + 1:t + 1]``, so a gap or
+    a late listing only affects the windows that contain it.
+
+    Args:
+        returns: Array of returns, shape (time,) or (time, symbols); NaN
+            where a symbol has no return
+        window: Window length in bars
+        risk_free_rate: Annual risk-free rate
+        min_periods: Valid returns a window needs; rows with fewer are NaN
+
+    Returns:
+        Dictionary of metric arrays shaped like ``returns``; rows before the
+        first full window are NaN
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    squeeze = returns.ndim == 1
+    if squeeze:
+        returns = returns[:, None]
+    n_bars = returns.shape[0]
+    if window < 1 or window > n_bars:
+        raise ValueError(f"window must be between 1 and {n_bars}, got {window}")
+
+    daily_rf = (1 + risk_free_rate) ** (1/252) - 1
+
+    # Missing returns add zero to every window sum and are left out of its count
+    valid = ~np.isnan(returns)
+    clean = np.where(valid, returns, 0.0)
+    count = _rolling_sum(valid.astype(np.float64), window)
+
+    # Centre on the column means so the sums of squares stay well conditioned
+    n_valid = valid.sum(axis=0)
+    column_mean = np.divide(clean.sum(axis=0), n_valid, out=np.zeros(returns.shape[1]), where=n_valid > 0)
+    centred = np.where(valid, returns - column_mean, 0.0)
+    downside = np.where(clean < 0, clean, 0.0)
+    upside = np.where(clean > 0, clean, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_centred = _rolling_sum(centred, window) / count
+        daily_mean = mean_centred + column_mean
+        daily_std = np.sqrt(np.maximum(
+            _rolling_sum(centred ** 2, window) / count - mean_centred ** 2, 0.0
+        ))
+
+    n_down = _rolling_sum((clean < 0).astype(np.float64), window)
+    down_sum = _rolling_sum(downside, window)
+    up_sum = _rolling_sum(upside, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        down_mean = down_sum / n_down
+        down_std = np.sqrt(np.maximum(
+            _rolling_sum(downside ** 2, window) / n_down - down_mean ** 2, 0.0
+        ))
+        down_std = np.where(n_down > 0, down_std, np.nan)
+
+        annual_return = (1 + daily_mean) ** 252 - 1
+        max_drawdown = rolling_max_drawdown(returns, window)
+        var_95, expected_shortfall = rolling_tail_risk(returns, window, VAR_CONFIDENCE)
+        metrics = {
+            "total_return": np.expm1(_rolling_sum(np.log1p(clean), window)),
+            "annual_return": annual_return,
+            "annual_volatility": daily_std * np.sqrt(252),
+            "sharpe_ratio": np.sqrt(252) * (daily_mean - daily_rf) / daily_std,
+            "sortino_ratio": np.sqrt(252) * (daily_mean - daily_rf) / down_std,
+            "max_drawdown": max_drawdown,
+            "calmar_ratio": annual_return / np.abs(max_drawdown),
+            "var_95": var_95,
+            "expected_shortfall": expected_shortfall,
+            "win_rate": _rolling_sum((clean > 0).astype(np.float64), window) / count,
+            "profit_factor": np.abs(up_sum / down_sum)
+        }
+
+    too_few = count < max(min_periods, 1)
+    result = {}
+    for name, values in metrics.items():
+        padded = np.full_like(returns, np.nan)
+        padded[window - 1:] = np.where(too_few, np.nan, values)
+        result[name] = padded[:, 0] if squeeze else padded
+    return result
+
+def rolling_max_drawdown(returns: np.ndarray, window: int) -> np.ndarray:
+    """
+    Maximum drawdown of every trailing window, in O(n) per column.
+
+    Uses the van Herk/Gil-Werman decomposition on log wealth: the series is
+    split into blocks of ``window`` bars, and each window is covered by the
+    suffix of one block plus the prefix of the next. Running max/min and
+    worst drop are accumulated over those prefixes and suffixes for all
+    columns at once. A bar with a NaN return is neither a peak nor a
+    trough, so a window's drawdown is that of its non-NaN returns.
+
+    Args:
+        returns: Array of returns, shape (time, symbols)
+        window: Window length in bars
+
+    Returns:
+        Array of shape (time - window + 1, symbols); row i is the drawdown of
+        ``returns[i:i + window]`` as defined by ``calculate_max_drawdown``,
+        NaN when the window has no returns
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n_bars, n_cols = returns.shape
+    n_blocks = -(-n_bars // window)
+
+    valid = np.zeros((n_blocks * window, n_cols), dtype=bool)
+    valid[:n_bars] = ~np.isnan(returns)
+    log_wealth = np.zeros((n_blocks * window, n_cols))
+    log_wealth[:n_bars] = np.cumsum(np.log1p(np.nan_to_num(returns)), axis=0)
+    # Missing bars can never be the peak (-inf) or the trough (+inf)
+    peaks = np.where(valid, log_wealth, -np.inf).reshape(n_blocks, window, n_cols)
+    troughs = np.where(valid, log_wealth, np.inf).reshape(n_blocks, window, n_cols)
+
+    # From each block start up to t: lowest point and worst peak-to-trough drop
+    prefix_max = np.maximum.accumulate(peaks, axis=1)
+    prefix_min = np.minimum.accumulate(troughs, axis=1)
+    prefix_drop = np.maximum.accumulate(prefix_max - troughs, axis=1)
+
+    # From t to each block end: highest point and worst drop
+    reverse_min = np.minimum.accumulate(troughs[:, ::-1], axis=1)
+    suffix_max = np.maximum.accumulate(peaks[:, ::-1], axis=1)[:, ::-1]
+    suffix_drop = np.maximum.accumulate(peaks[:, ::-1] - reverse_min, axis=1)[:, ::-1]
+
+    prefix_min = prefix_min.reshape(-1, n_cols)
+    prefix_drop = prefix_drop.reshape(-1, n_cols)
+    suffix_max = suffix_max.reshape(-1, n_cols)
+    suffix_drop = suffix_drop.reshape(-1, n_cols)
+
+    starts = np.arange(n_bars - window + 1)
+    ends = starts + window - 1
+    drop = np.maximum(suffix_drop[starts], prefix_drop[ends])
+    drop = np.maximum(drop, suffix_max[starts] - prefix_min[ends])
+    # Windows aligned to a block are exactly one block: the suffix alone covers them
+    aligned = starts % window == 0
+    drop[aligned] = suffix_drop[starts[aligned]]
+
+    counts = _rolling_sum(valid[:n_bars].astype(np.float64), window)
+    return np.where(counts > 0, np.expm1(-drop), np.nan)
+
+def rolling_tail_risk(returns: np.ndarray, window: int,
+                      confidence: float = VAR_CONFIDENCE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Historical VaR and expected shortfall of every trailing window.
+
+    Each window keeps only its worst ``k`` returns with ``np.partition``,
+    so the cost is O(n * window) rather than a sort per window; windows
+    are processed in chunks to bound memory. Like ``historical_tail_risk``,
+    NaNs are ignored: ``k`` comes from each window's count of valid
+    returns, and windows without any are NaN.
+
+    Args:
+        returns: Array of returns, shape (time, symbols)
+        window: Window length in bars
+        confidence: Confidence level
+
+    Returns:
+        Tuple of arrays of shape (time - window + 1, symbols); row i is
+        ``historical_tail_risk(returns[i:i + window])``
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(returns)
+    counts = _rolling_sum(valid.astype(np.float64), window).astype(np.int64)
+    # Missing returns sort after every real one
+    windows = np.lib.stride_tricks.sliding_window_view(np.where(valid, returns, np.inf), window, axis=0)
+    k_max = int(tail_size(window, confidence))
+    k = tail_size(counts, confidence)
+    var = np.empty(windows.shape[:2])
+    es = np.empty(windows.shape[:2])
+    step = max(1, _TAIL_CHUNK_ELEMENTS // max(window * returns.shape[1], 1))
+    for start in range(0, len(windows), step):
+        stop = start + step
+        # The worst k_max in order; a window with fewer valid returns uses its first k
+        tail = np.sort(np.partition(windows[start:stop], k_max - 1, axis=-1)[..., :k_max], axis=-1)
+        chunk_k = k[start:stop, :, None]
+        var[start:stop] = np.take_along_axis(tail, chunk_k - 1, axis=-1)[..., 0]
+        with np.errstate(invalid='ignore'):
+            es[start:stop] = np.take_along_axis(np.cumsum(tail, axis=-1), chunk_k - 1, axis=-1)[..., 0] / chunk_k[..., 0]
+    var[counts == 0] = np.nan
+    es[counts == 0] = np.nan
+    return var, es
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sums along axis 0 for rows window-1 onwards."""
+    cumulative = np.zeros((values.shape[0] + 1,) + values.shape[1:])
+    np.cumsum(values, axis=0, out=cumulative[1:])
+    return cumulative[window:] - cumulative[:-window]
@@ -1,18 +1,331 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+import os
+import threading
+import numpy as np
 import pandas as pd
 from pymongo import MongoClient, ASCENDING, DESCENDING
 from pymongo.errors import BulkWriteError
 import logging
 
+from config.settings import BUCKETED_COLLECTIONS
+from data.database.buckets import read_collection
+from monitoring.metrics import QUERY_LATENCY, ROWS_LOADED
+
 logger = logging.getLogger(__name__)
 
+# Number of documents pulled from a cursor per round trip by the streaming loader
+DEFAULT_BATCH_SIZE = 2_000
+
+# Process-wide pooled clients keyed by URI; MongoClient is thread-safe and
+# pools connections itself, so one client per server is shared by all managers
+_clients: Dict[str, MongoClient] = {}
+_clients_pid = os.getpid()
+_clients_lock = threading.Lock()
+
+# Column kinds understood by the columnar loader and their NumPy storage dtype
+_KIND_DTYPES = {
+    'int': np.int64,
+    'bool': np.bool_,
+    'float': np.float64,
+    'datetime': 'datetime64[us]',
+    'object': object
+}
+
+# Kind a column is widened to when a batch does not fit its current dtype
+_KIND_PROMOTIONS = {
+    'int': 'float',
+    'bool': 'object',
+    'float': 'object',
+    'datetime': 'object'
+}
+
+
+def _infer_kind(value) -> str:
+    """Map a BSON-decoded Python value to a column kind."""
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, datetime):
+        return 'datetime'
+    return 'object'
+
+
+class _ColumnBuffer:
+    """Typed NumPy storage for a single DataFrame column."""
+
+    __slots__ = ('kind', 'data')
+
+    def __init__(self, kind: str, capacity: int, filled: int = 0):
+        # A column that starts after row 0 needs a dtype that can hold missing values
+        if filled and kind in ('int', 'bool'):
+            kind = _KIND_PROMOTIONS[kind]
+        self.kind = kind
+        self.data = np.empty(capacity, dtype=_KIND_DTYPES[kind])
+        if filled:
+            self.data[:filled] = self.missing
+
+    @property
+    def missing(self):
+        """Placeholder used for documents that lack this field."""
+        return None if self.kind == 'datetime' else np.nan
+
+    def resize(self, size: int, capacity: int):
+        """Grow the buffer to ``capacity`` keeping the first ``size`` values."""
+        data = np.empty(capacity, dtype=self.data.dtype)
+        data[:size] = self.data[:size]
+        self.data = data
+
+    def write(self, start: int, values: Sequence):
+        """Store ``values`` at ``start``, widening the dtype if they do not fit."""
+        while True:
+            try:
+                converted = self._convert(values)
+                break
+            except (TypeError, ValueError, OverflowError):
+                self.kind = _KIND_PROMOTIONS[self.kind]
+                self.data = self.data.astype(_KIND_DTYPES[self.kind])
+        self.data[start:start + len(values)] = converted
+
+    def _convert(self, values: Sequence) -> np.ndarray:
+        if self.kind == 'int' and not all(type(v) is int for v in values):
+            raise TypeError("non-integer value in integer column")
+        if self.kind == 'bool' and not all(type(v) is bool for v in values):
+            raise TypeError("non-boolean value in boolean column")
+        if self.kind == 'object':
+            converted = np.empty(len(values), dtype=object)
+            try:
+                converted[:] = values
+            except ValueError:
+                # Sequence values confuse NumPy broadcasting; assign one by one
+                for i, value in enumerate(values):
+                    converted[i] = value
+            return converted
+        return np.asarray(values, dtype=self.data.dtype)
+
+
+class ColumnarFrameBuilder:
+    """
+    Assemble MongoDB documents into a DataFrame column by column.
+
+    Each batch of documents is scattered straight into preallocated typed
+    NumPy buffers (one per field), so the full result never exists as a list
+    of Python dicts. Fields are discovered as they appear and column dtypes
+    are widened (int -> float -> object) when a batch does not fit.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_BATCH_SIZE,
+                 schema: Optional[Dict[str, str]] = None):
+        self._capacity = max(int(capacity), 1)
+        self._size = 0
+        self._columns: Dict[str, _ColumnBuffer] = {
+            name: _ColumnBuffer(kind, self._capacity)
+            for name, kind in (schema or {}).items()
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def schema(self) -> Dict[str, str]:
+        """Column names mapped to their current kind, in insertion order."""
+        return {name: column.kind for name, column in self._columns.items()}
+
+    def append(self, documents: List[Dict]):
+        """Append a batch of documents to the column buffers."""
+        if not documents:
+            return
+
+        uniform = self._discover_columns(documents)
+
+        start = self._size
+        stop = start + len(documents)
+        if stop > self._capacity:
+            self._capacity = max(stop, 2 * self._capacity)
+            for column in self._columns.values():
+                column.resize(start, self._capacity)
+
+        if uniform and len(self._columns) > 1:
+            # Every document carries exactly the known fields: pull all values
+            # per document in one C-level call and transpose into columns
+            rows = list(map(itemgetter(*self._columns), documents))
+            for column, values in zip(self._columns.values(), zip(*rows)):
+                column.write(start, values)
+        else:
+            for name, column in self._columns.items():
+                missing = column.missing
+                column.write(start, [doc.get(name, missing) for doc in documents])
+
+        self._size = stop
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Build a DataFrame from the filled part of the column buffers."""
+        return pd.DataFrame({
+            name: column.data[:self._size]
+            for name, column in self._columns.items()
+        })
+
+    def _discover_columns(self, documents: List[Dict]) -> bool:
+        """Register unseen fields; return True if every document has all known fields."""
+        known = self._columns.keys()
+        for doc in documents:
+            if doc.keys() <= known:
+                continue
+            for name in doc:
+                if name in self._columns:
+                    continue
+                sample = next((d[name] for d in documents if d.get(name) is not None), None)
+                kind = 'object' if sample is None else _infer_kind(sample)
+                self._columns[name] = _ColumnBuffer(kind, self._capacity, filled=self._size)
+
+        n_known = len(known)
+        return all(len(doc) == n_known for doc in documents)
+
+
+def _iter_batches(cursor, batch_size: int) -> Iterator[List[Dict]]:
+    """Yield lists of at most ``batch_size`` documents from a cursor."""
+    cursor.batch_size(batch_size)
+    documents = iter(cursor)
+    while True:
+        batch = list(islice(documents, batch_size))
+        if not batch:
+            return
+        yield batch
+        # Drop our reference before the next batch is decoded
+        del batch
+
+
+def cursor_to_dataframe(cursor, batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """Load a whole cursor into a DataFrame through typed column buffers."""
+    if hasattr(cursor, 'to_dataframe'):
+        # Cursors over column-wise storage (bucketed collections) build their own frame
+        return cursor.to_dataframe()
+    builder = ColumnarFrameBuilder(batch_size)
+    for batch in _iter_batches(cursor, batch_size):
+        builder.append(batch)
+        del batch
+    return builder.to_dataframe()
+
+
+def iter_dataframes(cursor, chunksize: int,
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream a cursor as DataFrames of at most ``chunksize`` rows.
+
+    Column buffers are allocated once per chunk at exactly ``chunksize`` rows
+    and the schema discovered so far is carried over, so consecutive chunks
+    share the same columns.
+    """
+    builder = ColumnarFrameBuilder(chunksize)
+    for batch in _iter_batches(cursor, min(batch_size, chunksize)):
+        offset = 0
+        while offset < len(batch):
+            take = min(chunksize - len(builder), len(batch) - offset)
+            builder.append(batch[offset:offset + take])
+            offset += take
+            if len(builder) == chunksize:
+                yield builder.to_dataframe()
+                builder = ColumnarFrameBuilder(chunksize, schema=builder.schema)
+        del batch
+
+    if len(builder):
+        yield builder.to_dataframe()
+
+
+def get_client(uri: str) -> MongoClient:
+    """
+    Return the shared ``MongoClient`` for ``uri``, creating it on first use.
+
+    Clients are not carried across ``fork``: a child process (e.g. a
+    process pool worker) starts with an empty registry.
+    """
+    global _clients_pid
+    with _clients_lock:
+        if _clients_pid != os.getpid():
+            _clients.clear()
+            _clients_pid = os.getpid()
+        if uri not in _clients:
+            _clients[uri] = MongoClient(uri)
+        return _clients[uri]
+
+
+def close_clients():
+    """Close every shared client, e.g. at process shutdown."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+def get_date_range(collection, query: Dict = None, field: str = 'date') -> Tuple:
+    """
+    First and last value of ``field`` among documents matching ``query``.
+
+    Uses two sorted ``find_one`` calls instead of a ``$group`` aggregation,
+    so with an index on ``field`` (or on the query fields followed by
+    ``field``) each bound is read from the end of an index range rather
+    than by scanning every document.
+
+    Returns:
+        Tuple of (first, last), or (None, None) when nothing matches
+    """
+    projection = {field: 1, '_id': 0}
+    first = collection.find_one(query or {}, projection, sort=[(field, ASCENDING)])
+    if first is None:
+        return None, None
+    last = collection.find_one(query or {}, projection, sort=[(field, DESCENDING)])
+    return first.get(field), last.get(field)
+
+
+def read_dataframe(collection, name: str, query: Dict = None, projection: Dict = None,
+                   sort_by: List = None, chunksize: Optional[int] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Query any collection with a pymongo-style ``find`` into DataFrames.
+
+    Backs ``MongoDBManager.get_dataframe`` and ``DatabaseManager.get_dataframe``;
+    ``name`` labels the load metrics. See ``MongoDBManager.get_dataframe``
+    for the other arguments.
+    """
+    cursor = collection.find(query or {}, projection)
+    if sort_by:
+        cursor = cursor.sort(sort_by)
+
+    if chunksize:
+        return _count_rows(iter_dataframes(cursor, chunksize, batch_size), name)
+
+    with QUERY_LATENCY.labels(name).time():
+        df = cursor_to_dataframe(cursor, batch_size)
+    ROWS_LOADED.labels(name).inc(len(df))
+    return df
+
+
+def _count_rows(frames: Iterator[pd.DataFrame], collection: str) -> Iterator[pd.DataFrame]:
+    """Pass chunks through, counting their rows as loaded."""
+    rows = ROWS_LOADED.labels(collection)
+    for frame in frames:
+        rows.inc(len(frame))
+        yield frame
+
+
 class MongoDBManager:
-    """Utility class for MongoDB operations with enhanced functionality."""
+    """
+    Utility class for MongoDB operations with enhanced functionality.
+
+    Reads of collections named in ``bucketed_collections`` are served from
+    their monthly buckets (see ``data.database.buckets``).
+    """
     
-    def __init__(self, uri: str, database: str):
-        self.client = MongoClient(uri)
+    def __init__(self, uri: str, database: str,
+                 bucketed_collections: Sequence[str] = BUCKETED_COLLECTIONS):
+        self.client = get_client(uri)
         self.db = self.client[database]
+        self.bucketed_collections = frozenset(bucketed_collections)
         
     def bulk_insert(self, collection: str, documents: List[Dict], 
                    ordered: bool = True) -> int:
@@ -22,29 +335,47 @@ class MongoDBManager:
             return len(result.inserted_ids)
         except BulkWriteError as bwe:
             logger.error(f"Bulk write error: {bwe.details}")
-            return len(bwe.details['nInserted'])
+            return bwe.details['nInserted']
             
     def get_dataframe(self, collection: str, query: Dict = None, 
-                     projection: Dict = None, sort_by: List = None) -> pd.DataFrame:
-        """Retrieve data as pandas DataFrame."""
-        cursor = self.db[collection].find(
-            filter=query or {},
-            projection=projection
-        )
-        
-        if sort_by:
-            cursor = cursor.sort(sort_by)
-            
-        return pd.DataFrame(list(cursor))
+                     projection: Dict = None, sort_by: List = None,
+                     chunksize: Optional[int] = None,
+                     batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Retrieve data as pandas DataFrame.
+
+        Documents are read from the cursor in ``batch_size`` batches and
+        written directly into typed column buffers. Pass ``projection`` to
+        limit the fields transferred from the server.
+
+        Args:
+            collection: Collection name
+            query: Filter document
+            projection: Fields to include or exclude
+            sort_by: List of (field, direction) pairs
+            chunksize: If given, return an iterator of DataFrames with at
+                most this many rows instead of a single DataFrame
+            batch_size: Documents fetched per cursor batch
+
+        Returns:
+            DataFrame, or iterator of DataFrames when ``chunksize`` is set
+        """
+        return read_dataframe(read_collection(self.db, collection, self.bucketed_collections), collection,
+                              query, projection, sort_by, chunksize, batch_size)
         
     def create_index(self, collection: str, keys: List[tuple], unique: bool = False):
         """Create index on collection."""
         self.db[collection].create_index(keys, unique=unique)
         
+    def get_date_range(self, collection: str, query: Dict = None,
+                       field: str = 'date') -> Tuple:
+        """Get the first and last ``field`` value of matching documents."""
+        return get_date_range(read_collection(self.db, collection, self.bucketed_collections), query, field)
+
     def get_distinct_values(self, collection: str, field: str, 
                           query: Dict = None) -> List:
         """Get distinct values for a field."""
-        return self.db[collection].distinct(field, query)
+        return read_collection(self.db, collection, self.bucketed_collections).distinct(field, query)
         
     def update_documents(self, collection: str, query: Dict, 
                         update: Dict, upsert: bool = False) -> int: